@@ -0,0 +1,240 @@
+"""
+Analítica pesada por conductora para Confianza al Volante
+Suavidad espectral del volante, correlación entre conductoras e informe de
+sesión. Se calcula por lotes sobre las ventanas recientes del procesador y
+el resultado se publica de forma asíncrona. Está desactivada por defecto;
+con ANALYTICS_MODE=process va fuera del event loop (ProcessPoolExecutor)
+sin retrasar el broadcast.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from spectral import DEFAULT_CUTOFF_HZ, DEFAULT_SAMPLE_RATE, spectral_smoothness
+
+logger = logging.getLogger(__name__)
+
+# Canales que se copian de cada historial para el lote de análisis
+ANALYSIS_CHANNELS = ("SteeringAngle", "Throttle", "Brake", "SpeedKmh")
+# Modos: "off" (por defecto), "inline" (en el event loop) o "process" (pool
+# de procesos, opt-in)
+ANALYTICS_MODES = ("process", "inline", "off")
+
+
+# === FUNCIONES DE ANÁLISIS (nivel de módulo para poder enviarse al pool) ===
+
+def _pearson(a: List[float], b: List[float]) -> Optional[float]:
+    n = min(len(a), len(b))
+    if n < 3:
+        return None
+    a, b = a[-n:], b[-n:]
+    mean_a, mean_b = sum(a) / n, sum(b) / n
+    cov = var_a = var_b = 0.0
+    for x, y in zip(a, b):
+        dx, dy = x - mean_a, y - mean_b
+        cov += dx * dy
+        var_a += dx * dx
+        var_b += dy * dy
+    if var_a == 0 or var_b == 0:
+        return None
+    return cov / math.sqrt(var_a * var_b)
+
+
+def analyze_drivers(windows: Dict[str, Dict[str, List[float]]], sample_rate: float = DEFAULT_SAMPLE_RATE,
+                    cutoff_hz: float = DEFAULT_CUTOFF_HZ) -> Dict[str, Dict]:
+    """
+    Informe por conductora sobre sus ventanas recientes
+
+    La suavidad del volante es la misma métrica que smoothness_index del
+    procesador (spectral.py), con su frecuencia de muestreo y su corte
+    """
+    report = {}
+    for sim_id, channels in windows.items():
+        steering = channels["SteeringAngle"]
+        throttle = channels["Throttle"]
+        brake = channels["Brake"]
+        speed = channels["SpeedKmh"]
+        n = len(steering)
+        report[sim_id] = {
+            "samples": n,
+            "steering_smoothness": spectral_smoothness(steering, sample_rate, cutoff_hz),
+            "throttle_avg": sum(throttle) / n if n else 0.0,
+            "braking_ratio": sum(1 for b in brake if b > 0.1) / n if n else 0.0,
+            "speed_avg": sum(speed) / n if n else 0.0,
+            "speed_max": max(speed) if n else 0.0
+        }
+    return report
+
+
+def correlate_drivers(steering: Dict[str, List[float]]) -> Dict:
+    """Correlación del volante entre cada par de conductoras"""
+    sim_ids = list(steering)
+    best: Dict[str, Dict] = {}
+    total = 0.0
+    pairs = 0
+    for i, sim_a in enumerate(sim_ids):
+        for sim_b in sim_ids[i + 1:]:
+            r = _pearson(steering[sim_a], steering[sim_b])
+            if r is None:
+                continue
+            total += r
+            pairs += 1
+            for me, other in ((sim_a, sim_b), (sim_b, sim_a)):
+                if me not in best or r > best[me]["correlation"]:
+                    best[me] = {"sim_id": other, "correlation": r}
+    return {
+        "synchrony": total / pairs if pairs else 0.0,
+        "pairs": pairs,
+        "most_similar": best
+    }
+
+
+def merge_results(driver_reports: List[Dict[str, Dict]], correlation: Dict) -> Dict:
+    """Une los informes parciales (uno por trozo del lote) y la correlación"""
+    drivers = {}
+    for report in driver_reports:
+        drivers.update(report)
+    for sim_id, similar in correlation["most_similar"].items():
+        if sim_id in drivers:
+            drivers[sim_id]["most_similar"] = similar
+    return {
+        "drivers": drivers,
+        "group": {"synchrony": correlation["synchrony"], "pairs": correlation["pairs"]}
+    }
+
+
+def analyze_batch(windows: Dict[str, Dict[str, List[float]]], sample_rate: float = DEFAULT_SAMPLE_RATE,
+                  cutoff_hz: float = DEFAULT_CUTOFF_HZ) -> Dict:
+    """Análisis completo de un lote en un solo proceso (modo inline)"""
+    steering = {sim_id: channels["SteeringAngle"] for sim_id, channels in windows.items()}
+    return merge_results([analyze_drivers(windows, sample_rate, cutoff_hz)], correlate_drivers(steering))
+
+
+class AnalyticsStage:
+    """
+    Etapa de analítica periódica desacoplada del bucle principal
+
+    Cada `interval` segundos copia las ventanas recientes del procesador,
+    las reparte en trozos entre los procesos del pool (más un trabajo de
+    correlación con el volante de todas) y, al terminar, publica el
+    resultado en `latest`. Solo hay un lote en vuelo: si el anterior no ha
+    terminado, el siguiente espera.
+    """
+
+    def __init__(self, processor, interval: float = 1.0, mode: str = "off", workers: int = 2):
+        if mode not in ANALYTICS_MODES:
+            raise ValueError(f"Modo de analítica desconocido: {mode}")
+        self.processor = processor
+        # Mismo espectro que el procesador (frecuencia real del tick y corte)
+        self.sample_rate = processor.sample_rate
+        self.cutoff_hz = processor.jitter_cutoff_hz
+        self.interval = interval
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.latest: Optional[Dict] = None
+        self.stats = {"runs": 0, "errors": 0, "last_duration_ms": None, "computed_at": None}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Arranca el pool (modo process) y la tarea periódica"""
+        if self.mode == "off":
+            return
+        if self.mode == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"🔬 Analítica iniciada (modo: {self.mode}, intervalo: {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Detiene la tarea y cierra el pool sin esperar lotes pendientes"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Error en la analítica: {e}")
+
+    async def run_once(self) -> Optional[Dict]:
+        """Analiza las ventanas actuales y publica el resultado"""
+        windows = self.processor.recent_windows(ANALYSIS_CHANNELS)
+        if not windows:
+            return None
+
+        started = time.perf_counter()
+        if self._pool is None:
+            result = analyze_batch(windows, self.sample_rate, self.cutoff_hz)
+        else:
+            result = await self._run_in_pool(windows)
+
+        self.latest = result
+        self.stats["runs"] += 1
+        self.stats["last_duration_ms"] = (time.perf_counter() - started) * 1000
+        self.stats["computed_at"] = time.time()
+        return result
+
+    async def _run_in_pool(self, windows: Dict[str, Dict[str, List[float]]]) -> Dict:
+        loop = asyncio.get_event_loop()
+        sim_ids = list(windows)
+        size = math.ceil(len(sim_ids) / self.workers)
+        chunks = [{sim_id: windows[sim_id] for sim_id in sim_ids[i:i + size]}
+                  for i in range(0, len(sim_ids), size)]
+        steering = {sim_id: channels["SteeringAngle"] for sim_id, channels in windows.items()}
+
+        jobs = [loop.run_in_executor(self._pool, analyze_drivers, chunk, self.sample_rate, self.cutoff_hz)
+                for chunk in chunks]
+        jobs.append(loop.run_in_executor(self._pool, correlate_drivers, steering))
+        *driver_reports, correlation = await asyncio.gather(*jobs)
+        return merge_results(driver_reports, correlation)
+
+    def get_results(self) -> Dict:
+        """Último resultado publicado y estadísticas de la etapa"""
+        return {
+            "mode": self.mode,
+            "interval": self.interval,
+            "stats": dict(self.stats),
+            "results": self.latest
+        }
+
+
+def test_analytics():
+    """Prueba rápida: volante suave frente a volante tembloroso"""
+    import random
+
+    print("🧪 Probando analítica...")
+    windows = {}
+    for i, noise in enumerate((0.0, 5.0, 30.0), 1):
+        steering = [20 * math.sin(t * 0.1) + random.gauss(0, noise) for t in range(50)]
+        windows[f"sim_{i}"] = {
+            "SteeringAngle": steering,
+            "Throttle": [0.6] * 50,
+            "Brake": [0.0] * 50,
+            "SpeedKmh": [120.0] * 50
+        }
+    result = analyze_batch(windows)
+    for sim_id, report in result["drivers"].items():
+        print(f"📊 {sim_id}: suavidad {report['steering_smoothness']:.1f}, "
+              f"más parecida {report['most_similar']['sim_id']} ({report['most_similar']['correlation']:.2f})")
+    print(f"📊 Sincronía del grupo: {result['group']['synchrony']:.2f}")
+
+
+if __name__ == "__main__":
+    test_analytics()
@@ -0,0 +1,307 @@
+"""
+Difusión WebSocket para Confianza al Volante
+Compartido por main.py y main_demo.py. Cada frame se serializa una sola vez
+y se deja en una cola acotada por cliente; una tarea escritora por cliente
+la vacía. Un navegador lento ya no retrasa al resto de pantallas ni el
+siguiente tick: si su cola se llena se descarta el frame más antiguo (los
+frames viejos no sirven para pintar) y se cuenta. Cada cliente elige al
+conectar el formato de los ticks (JSON o binario, ver wire_format.py) y
+el modo (completo o delta, ver delta_stream.py); cada variante en uso se
+codifica una vez por tick. Los clientes JSON completos pueden además
+suscribirse a temas (ver topics.py) y recibir solo las proyecciones que
+pintan, también serializadas una vez por tick.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional, Union
+
+from delta_stream import DEFAULT_KEYFRAME_EVERY, STREAM_MODES, DeltaEncoder, DeltaFrame, is_stream_message
+from topics import MAX_TOPICS, TopicCache, valid_topic
+from wire_format import WIRE_FORMATS, encode_frame
+
+logger = logging.getLogger(__name__)
+
+# Frames en cola por cliente (a 20 Hz, 4 frames = 200 ms de margen)
+DEFAULT_QUEUE_SIZE = 4
+
+Message = Union[str, bytes]
+
+# Codificador de cada formato de cable
+ENCODERS: Dict[str, Callable[[dict], Message]] = {"json": json.dumps, "binary": encode_frame}
+
+
+class ClientChannel:
+    """Cola acotada (descarta el más antiguo) y tarea escritora de un cliente"""
+
+    def __init__(self, websocket, queue_size: int = DEFAULT_QUEUE_SIZE, wire_format: str = "json",
+                 stream_mode: str = "full"):
+        self.websocket = websocket
+        self.wire_format = wire_format
+        self.stream_mode = stream_mode
+        # En modo delta el primer mensaje siempre es un keyframe
+        self.needs_keyframe = stream_mode == "delta"
+        self.queue_size = max(1, queue_size)
+        self.queue: deque = deque(maxlen=self.queue_size)
+        # Temas suscritos en orden; vacío = payload completo
+        self.topics: tuple = ()
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def can_subscribe(self) -> bool:
+        return self.wire_format == "json" and self.stream_mode == "full"
+
+    def set_topics(self, topics: Iterable[str]) -> None:
+        """Cambia la suscripción; la cola guarda `queue_size` ticks de todos los temas"""
+        self.topics = tuple(dict.fromkeys(topics))[:MAX_TOPICS]
+        maxlen = self.queue_size * max(1, len(self.topics))
+        if maxlen != self.queue.maxlen:
+            self.queue = deque(self.queue, maxlen=maxlen)
+
+    def full(self) -> bool:
+        return len(self.queue) == self.queue.maxlen
+
+    def push(self, message: Message) -> None:
+        """Encola sin esperar; con la cola llena se pierde el frame más antiguo"""
+        if self.full():
+            self.dropped += 1
+        self.queue.append(message)
+        self.ready.set()
+
+    async def run(self) -> None:
+        """Envía los frames encolados en orden hasta que el cliente falla"""
+        while True:
+            if not self.queue:
+                self.ready.clear()
+                await self.ready.wait()
+            message = self.queue.popleft()
+            if isinstance(message, bytes):
+                await self.websocket.send_bytes(message)
+            else:
+                await self.websocket.send_text(message)
+            self.sent += 1
+
+
+class ConnectionManager:
+    """Gestor de conexiones WebSocket activas"""
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        self.queue_size = queue_size
+        self.clients: Dict[object, ClientChannel] = {}
+        self.delta = DeltaEncoder(keyframe_every)
+        self.stats = {"broadcasts": 0, "dropped": 0, "disconnected": 0}
+
+    @property
+    def active_connections(self):
+        return self.clients.keys()
+
+    async def connect(self, websocket, greeting: Optional[Message] = None, wire_format: str = "json",
+                      stream_mode: str = "full"):
+        """
+        Acepta nueva conexión WebSocket
+
+        Args:
+            websocket: Conexión entrante
+            greeting: Mensaje inicial, enviado antes que cualquier broadcast
+            wire_format: Formato de los ticks para este cliente ("json" o "binary")
+            stream_mode: "full" (payload completo) o "delta" (solo JSON)
+        """
+        if wire_format not in WIRE_FORMATS:
+            raise ValueError(f"Formato de cable desconocido: {wire_format}")
+        if stream_mode not in STREAM_MODES or (stream_mode == "delta" and wire_format != "json"):
+            raise ValueError(f"Modo de flujo no soportado: {stream_mode} ({wire_format})")
+        await websocket.accept()
+        if greeting is not None:
+            if isinstance(greeting, bytes):
+                await websocket.send_bytes(greeting)
+            else:
+                await websocket.send_text(greeting)
+        client = ClientChannel(websocket, self.queue_size, wire_format, stream_mode)
+        client.task = asyncio.create_task(self._write(client))
+        self.clients[websocket] = client
+        logger.info(f"Nueva conexión WebSocket. Total: {len(self.clients)}")
+
+    def disconnect(self, websocket):
+        """Desconecta WebSocket y detiene su tarea escritora"""
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        self.stats["dropped"] += client.dropped
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+        logger.info(f"Conexión WebSocket cerrada. Total: {len(self.clients)}")
+
+    def request_keyframe(self, websocket):
+        """El cliente detectó un hueco en la secuencia: keyframe en el próximo tick"""
+        client = self.clients.get(websocket)
+        if client is not None and client.stream_mode == "delta":
+            client.needs_keyframe = True
+
+    def subscribe(self, websocket, topics: Iterable[str], remove: bool = False) -> None:
+        """
+        Añade (o quita, con remove=True) temas a la suscripción de un cliente
+        y le confirma la lista resultante, con los temas desconocidos en
+        "rejected". Solo aplica a clientes JSON completos; el binario y el
+        delta siguen recibiendo el payload entero.
+        """
+        client = self.clients.get(websocket)
+        if client is None:
+            return
+        topics = list(topics)
+        rejected = [topic for topic in topics if not valid_topic(topic)]
+        topics = [topic for topic in topics if valid_topic(topic)]
+        if client.can_subscribe:
+            if remove:
+                client.set_topics(topic for topic in client.topics if topic not in topics)
+            else:
+                client.set_topics(client.topics + tuple(topics))
+        # Por la cola: así no se adelanta ni se mezcla con un tick en envío
+        ack = {"type": "subscribed", "topics": list(client.topics), "full_payload": not client.topics}
+        if rejected:
+            ack["rejected"] = rejected
+            ack["error"] = "Temas desconocidos"
+        client.push(json.dumps(ack))
+
+    def handle_client_message(self, websocket, text: str) -> None:
+        """
+        Mensajes del cliente:
+            {"type": "resync"}
+            {"type": "subscribe", "topics": [...]}
+            {"type": "unsubscribe", "topics": [...]}
+        """
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        kind = message.get("type")
+        if kind == "resync":
+            self.request_keyframe(websocket)
+        elif kind in ("subscribe", "unsubscribe") and isinstance(message.get("topics"), list):
+            self.subscribe(websocket, message["topics"], remove=kind == "unsubscribe")
+
+    async def _write(self, client: ClientChannel):
+        try:
+            await client.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Error enviando datos a WebSocket: {e}")
+            self.stats["disconnected"] += 1
+            self.disconnect(client.websocket)
+
+    def broadcast(self, message: Message) -> None:
+        """Encola un mensaje ya serializado para todos los clientes (no espera)"""
+        self.stats["broadcasts"] += 1
+        for client in self.clients.values():
+            client.push(message)
+
+    async def broadcast_data(self, data: dict):
+        """Envía datos a todas las conexiones activas (una serialización por variante)"""
+        # La secuencia avanza en cada tick aunque no haya clientes delta
+        needs_delta = any(client.stream_mode == "delta" for client in self.clients.values())
+        frame = self.delta.encode(data, needed=needs_delta)
+        if not self.clients:
+            return
+        self.stats["broadcasts"] += 1
+        encoded: Dict[str, Message] = {}
+        projections = TopicCache(data)
+        for client in self.clients.values():
+            if client.stream_mode == "delta":
+                client.push(self._delta_message(client, frame))
+                continue
+            if client.topics:
+                for topic in client.topics:
+                    message = projections.get(topic)
+                    if message is not None:
+                        client.push(message)
+                continue
+            message = encoded.get(client.wire_format)
+            if message is None:
+                message = encoded[client.wire_format] = ENCODERS[client.wire_format](data)
+            client.push(message)
+
+    @staticmethod
+    def _delta_message(client: ClientChannel, frame: DeltaFrame) -> str:
+        """
+        Delta del tick o keyframe: en el keyframe periódico, si el cliente lo
+        pidió, o si su cola está llena (los deltas encolados ya no sirven sin
+        el que se descartaría, así que se sustituyen por un keyframe). Los
+        acks y demás mensajes de control encolados se conservan
+        """
+        if frame.is_keyframe or client.needs_keyframe or client.full():
+            if client.full():
+                control = [message for message in client.queue if not is_stream_message(message)]
+                client.dropped += len(client.queue) - len(control)
+                client.queue.clear()
+                client.queue.extend(control)
+            client.needs_keyframe = False
+            return frame.keyframe()
+        return frame.delta
+
+    def _topic_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for client in self.clients.values():
+            for topic in client.topics:
+                counts[topic] = counts.get(topic, 0) + 1
+        return counts
+
+    def get_stats(self) -> Dict:
+        """Clientes, frames descartados y profundidad de las colas"""
+        return {
+            "clients": len(self.clients),
+            "formats": {wire_format: sum(1 for client in self.clients.values() if client.wire_format == wire_format)
+                        for wire_format in WIRE_FORMATS},
+            "delta_clients": sum(1 for client in self.clients.values() if client.stream_mode == "delta"),
+            "topics": self._topic_counts(),
+            "delta_seq": self.delta.seq,
+            **self.delta.stats,
+            "queue_size": self.queue_size,
+            "broadcasts": self.stats["broadcasts"],
+            "dropped": self.stats["dropped"] + sum(client.dropped for client in self.clients.values()),
+            "disconnected": self.stats["disconnected"],
+            "max_queue_depth": max((len(client.queue) for client in self.clients.values()), default=0)
+        }
+
+
+def test_broadcast():
+    """Prueba rápida: un cliente lento no frena a uno rápido"""
+
+    class FakeWebSocket:
+        def __init__(self, delay: float):
+            self.delay = delay
+            self.received = []
+
+        async def accept(self):
+            pass
+
+        async def send_text(self, message: str):
+            await asyncio.sleep(self.delay)
+            self.received.append(message)
+
+    async def run():
+        manager = ConnectionManager(queue_size=2)
+        fast, slow = FakeWebSocket(0.0), FakeWebSocket(0.05)
+        await manager.connect(fast, greeting="hola")
+        await manager.connect(slow)
+        for tick in range(20):
+            await manager.broadcast_data({"tick": tick})
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.2)
+        print(f"📡 Rápido: {len(fast.received)} mensajes, lento: {len(slow.received)} mensajes")
+        print(f"📡 Estadísticas: {manager.get_stats()}")
+        manager.disconnect(fast)
+        manager.disconnect(slow)
+
+    print("🧪 Probando ConnectionManager...")
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_broadcast()
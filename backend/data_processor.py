@@ -6,56 +6,182 @@ pruebas tangibles de fortaleza interior.
 """
 
 import math
-import statistics
-from collections import deque
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 import logging
 import colorsys
 
+from streaming_metrics import (
+    DEFAULT_EVENT_COOLDOWN, DEFAULT_EVENT_DEBOUNCE, NORMAL_EVENT, ExtremeEventDetector,
+    GroupSummary, RollingCalm, RollingControl, strongest_event,
+)
+from telemetry_buffer import TelemetryRingBuffer
+from rolling_windows import MultiResolutionWindows
+from session_stats import SessionStats
+from spectral import DEFAULT_CUTOFF_HZ, DEFAULT_SAMPLE_RATE, MIN_SAMPLES as SPECTRAL_MIN_SAMPLES
+from spectral import HAS_NUMPY as HAS_SPECTRAL_FFT, spectral_smoothness_batch
+from numpy_engine import create_engine
+
 logger = logging.getLogger(__name__)
 
+
+class MetricsSnapshot(NamedTuple):
+    """
+    Foto de las métricas de un tick, compartida por todos los lectores
+    (bucle de difusión, endpoints REST...). Es de solo lectura: nadie debe
+    modificar `metrics`, `summary` ni los diccionarios que contienen.
+    """
+    version: int                  # Se incrementa con cada foto nueva
+    timestamp: float              # time.time() al calcularla
+    metrics: Dict[str, Dict]      # {sim_id: métricas}
+    summary: Dict                 # Estadísticas de grupo
+
 class DriverPerformanceProcessor:
     """
     Procesador que mantiene historial y calcula métricas de rendimiento 
     emocional para cada conductor.
     """
     
-    def __init__(self, history_size: int = 50):
+    def __init__(self, history_size: int = 50, backend: str = "python",
+                 event_debounce: int = DEFAULT_EVENT_DEBOUNCE,
+                 event_cooldown: int = DEFAULT_EVENT_COOLDOWN,
+                 sample_rate: float = DEFAULT_SAMPLE_RATE,
+                 jitter_cutoff_hz: float = DEFAULT_CUTOFF_HZ,
+                 spectral_every: int = 10):
         """
         Args:
             history_size: Número de registros a mantener en el historial
+            backend: "python" (métricas por simulador en cada frame) o "numpy"
+                (todas las conductoras en una pasada vectorizada por tick;
+                si NumPy no está instalado se usa "python")
+            event_debounce: Frames seguidos que debe durar un evento extremo
+                antes de notificarse
+            event_cooldown: Frames sin volver a notificar el mismo tipo de evento
+            sample_rate: Frames por segundo de cada simulador (para el espectro)
+            jitter_cutoff_hz: Frecuencia por encima de la cual el volante tiembla
+            spectral_every: Cada cuántas fotos se recalcula la suavidad espectral
         """
         self.history_size = history_size
-        # Historial por simulador {sim_id: deque of data}
-        self.data_history: Dict[str, deque] = {}
+        self.sample_rate = sample_rate
+        self.jitter_cutoff_hz = jitter_cutoff_hz
+        self.spectral_every = max(1, spectral_every)
+        self.event_debounce = event_debounce
+        self.event_cooldown = event_cooldown
+        # Motor vectorizado (backend "numpy"); None = backend Python
+        self.engine = (create_engine(history_size, event_debounce, event_cooldown)
+                       if backend == "numpy" else None)
+        self.backend = "numpy" if self.engine is not None else "python"
+        # Historial columnar por simulador {sim_id: TelemetryRingBuffer}
+        self.data_history: Dict[str, TelemetryRingBuffer] = {}
         # Métricas actuales por simulador
         self.current_metrics: Dict[str, Dict] = {}
+        # Motores incrementales del índice de calma {sim_id: RollingCalm}
+        self.calm_engines: Dict[str, RollingCalm] = {}
+        # Contadores incrementales del índice de control {sim_id: RollingControl}
+        self.control_engines: Dict[str, RollingControl] = {}
+        # Detectores de eventos extremos en streaming {sim_id: ExtremeEventDetector}
+        self.event_detectors: Dict[str, ExtremeEventDetector] = {}
+        # Eventos notificados desde la última foto {sim_id: [eventos]}: en un
+        # tick puede haber varios (un pico de freno y otro de volante). Los
+        # consume snapshot()
+        self.pending_events: Dict[str, List[Dict]] = {}
+        # Tendencias a 10 s, 1 minuto y sesión {sim_id: MultiResolutionWindows}
+        self.windows: Dict[str, MultiResolutionWindows] = {}
+        # Estadísticas de toda la sesión en memoria constante {sim_id: SessionStats}
+        self.session: Dict[str, SessionStats] = {}
+        # Estadísticas de grupo incrementales (backend Python)
+        self.group = GroupSummary()
+        # Suavidad espectral del volante {sim_id: 0-100}, a menor cadencia.
+        # Sin NumPy la DFT en Python puro (O(n²) por conductora) no cabe en el
+        # tick: se omite y smoothness_index queda en el valor neutro (50)
+        self.smoothness: Dict[str, float] = {}
+        if not HAS_SPECTRAL_FFT:
+            logger.warning("⚠️ NumPy no instalado: suavidad espectral desactivada (smoothness_index = 50)")
+        # Simuladores con datos nuevos desde la última foto
+        self.dirty: Set[str] = set()
+        # Última foto de métricas (None = hay que calcularla)
+        self._snapshot: Optional[MetricsSnapshot] = None
+        self._snapshot_version = 0
         
     def update_data(self, sim_id: str, raw_data: Dict) -> None:
         """
         Añade nuevos datos de telemetría al historial del simulador
         
+        Solo actualiza el historial y los motores incrementales y marca el
+        simulador como pendiente: las métricas se calculan una vez por tick,
+        al pedir la foto (snapshot), y solo para los simuladores con datos
+        nuevos.
+        
         Args:
             sim_id: Identificador del simulador
             raw_data: Datos de telemetría recién obtenidos
         """
+        # Tendencias multi-resolución y estadísticas de sesión (ambos
+        # backends). Los frames stale no aportan datos nuevos y los
+        # desconectados (default_sim_frame) son ceros de relleno
+        if raw_data.get("connected") and "stale_ms" not in raw_data:
+            if sim_id not in self.windows:
+                self.windows[sim_id] = MultiResolutionWindows()
+            self.windows[sim_id].push(
+                raw_data.get("timestamp") or time.time(),
+                raw_data.get("SteeringAngle") or 0.0,
+                raw_data.get("Throttle") or 0.0,
+                raw_data.get("Brake") or 0.0
+            )
+            if sim_id not in self.session:
+                self.session[sim_id] = SessionStats()
+            self.session[sim_id].add_frame(raw_data)
+        elif sim_id in self.windows:
+            # Hueco en la telemetría: el siguiente frame no es continuo
+            self.windows[sim_id].mark_gap()
+            
+        # Backend NumPy: solo se guarda la muestra; las métricas se calculan
+        # para todas las conductoras a la vez al pedir la foto
+        if self.engine is not None:
+            if sim_id not in self.current_metrics:
+                self.current_metrics[sim_id] = self._get_default_metrics()
+                self.dirty.add(sim_id)
+            if "stale_ms" not in raw_data:
+                self.engine.push(sim_id, raw_data)
+                self.dirty.add(sim_id)
+            return
+            
         # Inicializar historial si es la primera vez
         if sim_id not in self.data_history:
-            self.data_history[sim_id] = deque(maxlen=self.history_size)
+            self.data_history[sim_id] = TelemetryRingBuffer(self.history_size)
             self.current_metrics[sim_id] = self._get_default_metrics()
+            self.calm_engines[sim_id] = RollingCalm(self.history_size)
+            self.control_engines[sim_id] = RollingControl(self.history_size)
+            self.event_detectors[sim_id] = ExtremeEventDetector(self.event_debounce, self.event_cooldown)
+            self.dirty.add(sim_id)
+            
+        # Frame repetido desde el cache del conector (stale): no aporta datos
+        # nuevos, así que no entra al historial ni recalcula métricas
+        if "stale_ms" in raw_data:
+            return
             
         # Añadir datos al historial
         self.data_history[sim_id].append(raw_data)
+        self.calm_engines[sim_id].push(raw_data.get("SteeringAngle", 0.0))
+        self.control_engines[sim_id].push(raw_data.get("Throttle", 0.0), raw_data.get("Brake", 0.0))
+        self.event_detectors[sim_id].push(
+            raw_data.get("SteeringAngle", 0.0), raw_data.get("SpeedKmh", 0.0), raw_data.get("Brake", 0.0)
+        )
+        self.dirty.add(sim_id)
         
-        # Calcular nuevas métricas si tenemos suficientes datos
+        # Los eventos sí se evalúan en cada frame (el filtro cuenta frames y
+        # así no se pierde uno que ocurra entre dos fotos)
         if len(self.data_history[sim_id]) >= 10:  # Mínimo para cálculos
-            self._calculate_all_metrics(sim_id)
+            event = self.detect_extreme_events(sim_id)
+            if event is not NORMAL_EVENT:
+                self.pending_events.setdefault(sim_id, []).append(event)
             
     def _get_default_metrics(self) -> Dict:
         """Métricas por defecto para inicialización"""
         return {
             "calm_index": 50.0,
             "control_index": 50.0,
+            "smoothness_index": 50.0,
             "art_parameters": {
                 "position": 0.5,
                 "color": [180, 50, 50],  # HSL: Azul medio
@@ -65,16 +191,17 @@ class DriverPerformanceProcessor:
             }
         }
     
-    def _calculate_all_metrics(self, sim_id: str) -> None:
+    def _calculate_all_metrics(self, sim_id: str, events: Optional[List[Dict]] = None) -> None:
         """Calcula todas las métricas para un simulador"""
         try:
             calm = self.calculate_calm_index(sim_id)
             control = self.calculate_control_index(sim_id)
-            art = self.get_art_parameters(sim_id)
+            art = self.get_art_parameters(sim_id, events)
             
             self.current_metrics[sim_id] = {
                 "calm_index": calm,
                 "control_index": control,
+                "smoothness_index": self.smoothness.get(sim_id, 50.0),
                 "art_parameters": art
             }
             
@@ -98,34 +225,9 @@ class DriverPerformanceProcessor:
             return 50.0  # Valor neutral por defecto
             
         try:
-            # Obtener últimos ángulos del volante
-            steering_angles = [
-                data.get("SteeringAngle", 0.0) 
-                for data in list(self.data_history[sim_id])[-self.history_size:]
-            ]
-            
-            if len(steering_angles) < 2:
-                return 50.0
-                
-            # Calcular derivada (cambios entre puntos consecutivos)
-            derivatives = []
-            for i in range(1, len(steering_angles)):
-                derivative = abs(steering_angles[i] - steering_angles[i-1])
-                derivatives.append(derivative)
-                
-            # Calcular desviación estándar de la derivada
-            if len(derivatives) < 2:
-                return 50.0
-                
-            std_dev = statistics.stdev(derivatives)
-            
-            # Normalizar a escala 0-100
-            # Valores típicos de std_dev para volante: 0-20 grados
-            # std_dev bajo = alta calma
-            max_std_expected = 15.0  # Ajustable según experiencia
-            calm_index = max(0, 100 - (std_dev / max_std_expected * 100))
-            
-            return min(100.0, max(0.0, calm_index))
+            # Media y varianza de la derivada del volante se mantienen de forma
+            # incremental (RollingCalm): coste constante por frame
+            return self.calm_engines[sim_id].calm_index()
             
         except Exception as e:
             logger.error(f"Error en calculate_calm_index para {sim_id}: {e}")
@@ -148,54 +250,26 @@ class DriverPerformanceProcessor:
             return 50.0
             
         try:
-            recent_data = list(self.data_history[sim_id])[-self.history_size:]
-            
-            throttle_values = [data.get("Throttle", 0.0) for data in recent_data]
-            brake_values = [data.get("Brake", 0.0) for data in recent_data]
-            
-            # Detectar inputs erráticos
-            jerky_inputs = 0
-            total_inputs = len(recent_data)
-            
-            for i, data in enumerate(recent_data):
-                throttle = data.get("Throttle", 0.0)
-                brake = data.get("Brake", 0.0)
-                
-                # Penalizar uso simultáneo de acelerador y freno
-                if throttle > 0.1 and brake > 0.1:
-                    jerky_inputs += 1
-                    
-                # Penalizar cambios bruscos
-                if i > 0:
-                    prev_data = recent_data[i-1]
-                    throttle_change = abs(throttle - prev_data.get("Throttle", 0.0))
-                    brake_change = abs(brake - prev_data.get("Brake", 0.0))
-                    
-                    # Si hay cambios muy bruscos (> 0.3 en una lectura)
-                    if throttle_change > 0.3 or brake_change > 0.3:
-                        jerky_inputs += 1
-            
-            # Calcular porcentaje de inputs erráticos
-            jerky_percentage = jerky_inputs / total_inputs if total_inputs > 0 else 0
-            
-            # Convertir a índice de control (menos errático = más control)
-            control_index = max(0, 100 - (jerky_percentage * 100))
-            
-            return min(100.0, max(0.0, control_index))
+            # Uso simultáneo de pedales y cambios bruscos (> 0.3 en una lectura)
+            # se cuentan de forma incremental (RollingControl): coste constante
+            return self.control_engines[sim_id].control_index()
             
         except Exception as e:
             logger.error(f"Error en calculate_control_index para {sim_id}: {e}")
             return 50.0
     
-    def get_art_parameters(self, sim_id: str) -> Dict:
+    def get_art_parameters(self, sim_id: str, events: Optional[List[Dict]] = None) -> Dict:
         """
         Genera parámetros para la visualización artística.
         
         Cada conductor contribuye a la obra de arte colectiva con su 
         estilo único de conducción traducido a elementos visuales.
         
+        No modifica el estado: los eventos del tick los consume snapshot().
+        
         Args:
             sim_id: Identificador del simulador
+            events: Eventos extremos detectados desde la última foto
             
         Returns:
             Diccionario con parámetros artísticos
@@ -204,16 +278,16 @@ class DriverPerformanceProcessor:
             return self._get_default_metrics()["art_parameters"]
             
         try:
-            latest_data = list(self.data_history[sim_id])[-1]
+            history = self.data_history[sim_id]
             
             # POSICIÓN: Basada en ángulo del volante (-1 a 1 normalizado a 0-1)
-            steering_angle = latest_data.get("SteeringAngle", 0.0)
+            steering_angle = history.value("SteeringAngle")
             # Asumir rango típico de -45 a +45 grados
             position = (steering_angle + 45) / 90
             position = max(0.0, min(1.0, position))
             
             # COLOR: Basado en velocidad (HSL)
-            speed = latest_data.get("SpeedKmh", 0.0)
+            speed = history.value("SpeedKmh")
             # Mapear velocidad a matiz (hue): 0 km/h = azul (240°), 200 km/h = rojo (0°)
             max_speed = 200.0
             hue = 240 - (min(speed, max_speed) / max_speed * 240)
@@ -228,16 +302,18 @@ class DriverPerformanceProcessor:
             color = [hue, saturation, lightness]
             
             # GROSOR: Basado en RPMs
-            rpms = latest_data.get("Rpms", 0.0)
+            rpms = history.value("Rpms")
             max_rpms = 8000.0
             thickness = 1.0 + (min(rpms, max_rpms) / max_rpms * 8.0)  # 1-9 píxeles
             
             # OPACIDAD: Basada en acelerador
-            throttle = latest_data.get("Throttle", 0.0)
+            throttle = history.value("Throttle")
             opacity = 0.2 + (throttle * 0.8)  # 0.2-1.0 opacidad
             
-            # === DETECTAR EVENTOS EXTREMOS ===
-            extreme_events = self.detect_extreme_events(sim_id)
+            # === EVENTOS EXTREMOS (detectados frame a frame en update_data) ===
+            # Se pinta uno por tick, el de mayor prioridad (orden de
+            # EVENT_TYPES); la sesión cuenta todos
+            extreme_events = strongest_event(events)
             
             return {
                 "position": position,
@@ -255,95 +331,100 @@ class DriverPerformanceProcessor:
         """
         Detecta eventos extremos de conducción que requieren efectos especiales
         
+        Usa el detector en streaming del simulador (sin recorrer el historial)
+        con debounce y cooldown, así que cada evento se notifica una sola vez;
+        avanza su estado, por lo que se llama una vez por frame.
+        
         Args:
             sim_id: Identificador del simulador
             
         Returns:
             Diccionario con tipos de eventos extremos detectados
         """
-        if sim_id not in self.data_history or len(self.data_history[sim_id]) < 3:
+        detector = self.event_detectors.get(sim_id)
+        if detector is None:
             return {"type": "normal", "intensity": 0.0}
             
         try:
-            history = list(self.data_history[sim_id])
-            current = history[-1]
-            previous = history[-2] if len(history) > 1 else current
-            
-            # Extraer métricas actuales y anteriores
-            current_speed = current.get("SpeedKmh", 0.0)
-            current_steering = current.get("SteeringAngle", 0.0)
-            current_brake = current.get("Brake", 0.0)
-            
-            prev_speed = previous.get("SpeedKmh", 0.0)
-            prev_steering = previous.get("SteeringAngle", 0.0)
-            
-            # === DETECCIÓN DE SPIN/TROMPO ===
-            steering_change = abs(current_steering - prev_steering)
-            if abs(current_steering) > 90 and current_speed > 50 and steering_change > 30:
-                intensity = min(1.0, (abs(current_steering) / 180) + (steering_change / 90))
-                return {
-                    "type": "spin", 
-                    "intensity": intensity,
-                    "direction": "left" if current_steering < 0 else "right",
-                    "speed": current_speed
-                }
-            
-            # === DETECCIÓN DE CRASH/CHOQUE ===
-            speed_drop = prev_speed - current_speed
-            if prev_speed > 80 and speed_drop > 60 and current_brake > 0.8:
-                intensity = min(1.0, speed_drop / 120)
-                return {
-                    "type": "crash", 
-                    "intensity": intensity,
-                    "impact_speed": prev_speed,
-                    "brake_force": current_brake
-                }
-            
-            # === DETECCIÓN DE FRENADA DE EMERGENCIA ===
-            if current_brake > 0.9 and current_speed > 40:
-                intensity = current_brake * (current_speed / 100)
-                return {
-                    "type": "emergency_brake", 
-                    "intensity": intensity,
-                    "speed": current_speed
-                }
-            
-            # === DETECCIÓN DE CONTRAVOLANTE/CORRECCIÓN VIOLENTA ===
-            if len(history) >= 3:
-                steering_3ago = history[-3].get("SteeringAngle", 0.0)
-                # Cambio de signo en steering (izq-der-izq o der-izq-der)
-                sign_changes = 0
-                if (prev_steering * current_steering < 0) or (steering_3ago * prev_steering < 0):
-                    sign_changes += 1
-                
-                total_steering_change = abs(current_steering - steering_3ago)
-                if sign_changes > 0 and total_steering_change > 60 and current_speed > 30:
-                    intensity = min(1.0, total_steering_change / 120)
-                    return {
-                        "type": "correction", 
-                        "intensity": intensity,
-                        "severity": "violent" if total_steering_change > 90 else "sharp"
-                    }
-            
-            # === DETECCIÓN DE MOVIMIENTO ERRÁTICO ===
-            if len(history) >= 5:
-                recent_steering = [h.get("SteeringAngle", 0.0) for h in history[-5:]]
-                steering_std = statistics.stdev(recent_steering) if len(recent_steering) > 1 else 0
-                if steering_std > 25 and current_speed > 20:
-                    intensity = min(1.0, steering_std / 50)
-                    return {
-                        "type": "erratic", 
-                        "intensity": intensity,
-                        "chaos_level": steering_std
-                    }
-            
-            # === EVENTO NORMAL ===
-            return {"type": "normal", "intensity": 0.0}
+            return detector.detect()
             
         except Exception as e:
             logger.error(f"Error detectando eventos extremos para {sim_id}: {e}")
             return {"type": "normal", "intensity": 0.0}
     
+    def snapshot(self) -> MetricsSnapshot:
+        """
+        Foto de las métricas actuales, compartida por todos los lectores
+        
+        Si ningún simulador ha recibido datos desde la última foto devuelve
+        la misma; si no, recalcula solo los simuladores pendientes y el
+        resumen de grupo una vez.
+        
+        Returns:
+            MetricsSnapshot de solo lectura
+        """
+        if self._snapshot is not None and not self.dirty:
+            return self._snapshot
+            
+        # La suavidad espectral va a menor cadencia que el tick
+        if self._snapshot_version % self.spectral_every == 0:
+            self._update_smoothness()
+            
+        # Ambos backends sustituyen el dict de métricas al recalcular: así se
+        # distingue un cálculo nuevo de una conductora sin datos suficientes
+        previous = {sim_id: self.current_metrics.get(sim_id) for sim_id in self.dirty}
+        # Eventos detectados desde la última foto (el backend NumPy los
+        # detecta en compute()): se pinta el de mayor prioridad y la sesión
+        # los cuenta todos
+        events, self.pending_events = self.pending_events, {}
+        
+        if self.engine is not None:
+            events = self.engine.compute(self.current_metrics, self.smoothness)
+        else:
+            for sim_id in self.dirty:
+                history = self.data_history[sim_id]
+                if len(history) >= 10:  # Mínimo para cálculos
+                    self._calculate_all_metrics(sim_id, events.get(sim_id))
+                metrics = self.current_metrics[sim_id]
+                self.group.update(sim_id, bool(history) and history.connected,
+                                  metrics.get("calm_index", 50), metrics.get("control_index", 50))
+        self.dirty.clear()
+        
+        for sim_id, old_metrics in previous.items():
+            metrics = self.current_metrics.get(sim_id)
+            if metrics is not old_metrics and sim_id in self.session:
+                self.session[sim_id].add_metrics(metrics, events.get(sim_id))
+        
+        self._snapshot_version += 1
+        self._snapshot = MetricsSnapshot(
+            version=self._snapshot_version,
+            timestamp=time.time(),
+            metrics=dict(self.current_metrics),
+            summary=self._compute_summary_stats()
+        )
+        return self._snapshot
+    
+    def _update_smoothness(self) -> None:
+        """
+        Suavidad espectral de todas las conductoras con la ventana llena, en
+        una sola pasada por lotes con la FFT vectorizada (requiere NumPy)
+        """
+        if not HAS_SPECTRAL_FFT or self.history_size < SPECTRAL_MIN_SAMPLES:
+            return
+        try:
+            if self.engine is not None:
+                sim_ids, steering = self.engine.window_matrix("SteeringAngle")
+            else:
+                sim_ids = [sim_id for sim_id, history in self.data_history.items()
+                           if len(history) == self.history_size]
+                steering = [self.data_history[sim_id].window("SteeringAngle") for sim_id in sim_ids]
+            if sim_ids:
+                values = spectral_smoothness_batch(steering, self.sample_rate, self.jitter_cutoff_hz)
+                self.smoothness.update(zip(sim_ids, values))
+                
+        except Exception as e:
+            logger.error(f"Error calculando la suavidad espectral: {e}")
+    
     def get_metrics(self, sim_id: str) -> Optional[Dict]:
         """
         Obtiene las métricas actuales de un simulador
@@ -352,56 +433,112 @@ class DriverPerformanceProcessor:
             sim_id: Identificador del simulador
             
         Returns:
-            Diccionario con las métricas o None si no existe
+            Diccionario con las métricas (de solo lectura) o None si no existe
         """
-        return self.current_metrics.get(sim_id)
+        return self.snapshot().metrics.get(sim_id)
     
     def get_all_metrics(self) -> Dict[str, Dict]:
         """
         Obtiene las métricas de todos los simuladores
         
         Returns:
-            Diccionario con todas las métricas por simulador
+            Diccionario con todas las métricas por simulador (el de la foto
+            actual, compartido: no modificar)
         """
-        return self.current_metrics.copy()
+        return self.snapshot().metrics
     
     def get_summary_stats(self) -> Dict:
         """
         Genera estadísticas resumidas del grupo
         
         Returns:
-            Estadísticas colectivas para la obra de arte grupal
+            Estadísticas colectivas para la obra de arte grupal (las de la
+            foto actual, compartidas: no modificar)
+        """
+        return self.snapshot().summary
+    
+    def recent_windows(self, channels: Tuple[str, ...], min_samples: int = 10) -> Dict[str, Dict[str, List[float]]]:
+        """
+        Copia de las ventanas recientes de cada simulador (para la analítica)
+        
+        Args:
+            channels: Canales a copiar
+            min_samples: Muestras mínimas para incluir un simulador
+            
+        Returns:
+            {sim_id: {canal: [valores, del más antiguo al más reciente]}}
+        """
+        if self.engine is not None:
+            return self.engine.windows(channels, min_samples)
+        return {
+            sim_id: {channel: history.window(channel).tolist() for channel in channels}
+            for sim_id, history in self.data_history.items()
+            if len(history) >= min_samples
+        }
+    
+    def get_window_metrics(self, sim_id: Optional[str] = None) -> Dict[str, Dict]:
         """
+        Calma y control por nivel de agregación: "raw" (historial reciente,
+        las métricas de la foto), "1s" (último segundo completo), "10s",
+        "60s" y "session"
+        
+        Args:
+            sim_id: Simulador concreto (None = todos)
+            
+        Returns:
+            {sim_id: {nivel: {"calm_index", "control_index", ...}}}
+        """
+        snapshot = self.snapshot()
+        sim_ids = [sim_id] if sim_id is not None else list(snapshot.metrics)
+        result = {}
+        for current_id in sim_ids:
+            metrics = snapshot.metrics.get(current_id)
+            if metrics is None:
+                continue
+            if self.engine is not None:
+                samples = self.engine.samples(current_id)
+            else:
+                samples = len(self.data_history[current_id])
+            tiers = {"raw": {
+                "calm_index": metrics["calm_index"],
+                "control_index": metrics["control_index"],
+                "samples": samples
+            }}
+            windows = self.windows.get(current_id)
+            tiers.update(windows.metrics() if windows else MultiResolutionWindows().metrics())
+            result[current_id] = tiers
+        return result
+    
+    def get_session_stats(self, sim_id: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Estadísticas de toda la sesión: histogramas de velocidad, volante y
+        acelerador, cuantiles de calma y control y conteo de eventos
+        
+        Args:
+            sim_id: Simulador concreto (None = todos)
+            
+        Returns:
+            {sim_id: estadísticas de sesión}
+        """
+        self.snapshot()  # Incorporar las últimas métricas calculadas
+        sim_ids = [sim_id] if sim_id is not None else list(self.session)
+        return {current_id: self.session[current_id].to_dict()
+                for current_id in sim_ids if current_id in self.session}
+    
+    def _compute_summary_stats(self) -> Dict:
+        """Calcula las estadísticas de grupo (una vez por foto)"""
         try:
-            all_calm = []
-            all_control = []
-            connected_count = 0
-            
-            for sim_id, metrics in self.current_metrics.items():
-                if sim_id in self.data_history and self.data_history[sim_id]:
-                    latest_data = list(self.data_history[sim_id])[-1]
-                    if latest_data.get("connected", False):
-                        connected_count += 1
-                        all_calm.append(metrics.get("calm_index", 50))
-                        all_control.append(metrics.get("control_index", 50))
+            if self.engine is not None:
+                return self.engine.summary()
             
-            return {
-                "connected_drivers": connected_count,
-                "total_drivers": 5,
-                "group_calm_avg": statistics.mean(all_calm) if all_calm else 50,
-                "group_control_avg": statistics.mean(all_control) if all_control else 50,
-                "group_calm_harmony": 100 - statistics.stdev(all_calm) if len(all_calm) > 1 else 50,
-                "collective_strength": statistics.mean([
-                    statistics.mean(all_calm) if all_calm else 50,
-                    statistics.mean(all_control) if all_control else 50
-                ])
-            }
+            # Agregador incremental: ya está al día con los simuladores pendientes
+            return self.group.summary()
             
         except Exception as e:
             logger.error(f"Error en get_summary_stats: {e}")
             return {
                 "connected_drivers": 0,
-                "total_drivers": 5,
+                "total_drivers": len(self.current_metrics),
                 "group_calm_avg": 50,
                 "group_control_avg": 50,
                 "group_calm_harmony": 50,
@@ -0,0 +1,164 @@
+"""
+Flujo delta del WebSocket para Confianza al Volante
+Entre dos ticks de 50 ms casi nada de cada conductora cambia (pilot_name,
+marcha, connected, la mayor parte del resumen...). En modo delta
+(/ws?mode=delta) se envía un keyframe completo al conectar, cada
+`keyframe_every` ticks y cuando el cliente lo pide, y en el resto de ticks
+solo un parche con los campos que han cambiado (JSON Merge Patch, RFC 7386:
+un valor null borra la clave). Cada mensaje lleva un número de secuencia
+para que el cliente detecte huecos y pida un resync.
+
+Como null significa "borrar", un valor None del payload no puede viajar en
+un parche: en modo delta las claves con None se tratan como ausentes, también
+en el keyframe (drop_nulls). El cliente debe leer una clave ausente como null.
+Los None dentro de listas se conservan (las listas van enteras).
+
+Mensajes:
+    {"type": "keyframe", "seq": n, "data": payload completo}
+    {"type": "delta", "seq": n, "patch": cambios respecto al tick n - 1}
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+STREAM_MODES = ("full", "delta")
+# Keyframe periódico por defecto (a 20 Hz, 100 ticks = 5 s)
+DEFAULT_KEYFRAME_EVERY = 100
+# Comienzo de los mensajes del flujo (json.dumps respeta el orden de claves)
+STREAM_PREFIXES = ('{"type": "keyframe"', '{"type": "delta"')
+
+
+def is_stream_message(message) -> bool:
+    """True si el mensaje es un keyframe o un delta (no un ack ni otro control)"""
+    return isinstance(message, str) and message.startswith(STREAM_PREFIXES)
+
+
+def drop_nulls(payload: Dict) -> Dict:
+    """Copia del payload sin las claves con None (en todos los niveles de dicts)"""
+    return {key: drop_nulls(value) if isinstance(value, dict) else value
+            for key, value in payload.items() if value is not None}
+
+
+def diff_payload(old: Dict, new: Dict) -> Dict:
+    """
+    Parche merge-patch que lleva `old` a `new`, tratando los None como
+    claves ausentes (ver drop_nulls)
+
+    Los payloads no se modifican después de enviarse, así que un mismo
+    objeto en ambos ticks (las métricas de una conductora sin datos nuevos)
+    se descarta por identidad sin recorrerlo.
+    """
+    patch = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if value is None:
+            if previous is not None:
+                patch[key] = None
+            continue
+        if previous is None:
+            # Un dict nuevo lleva sus None dentro: al aplicarlo se descartan
+            patch[key] = value
+            continue
+        if previous is value:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_payload(previous, value)
+            if nested:
+                patch[key] = nested
+        elif value != previous:
+            patch[key] = value
+    for key, previous in old.items():
+        if key not in new and previous is not None:
+            patch[key] = None
+    return patch
+
+
+def apply_patch(target: Any, patch: Dict) -> Dict:
+    """Aplica un parche merge-patch sin modificar `target` (copia lo que cambia)"""
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict):
+            result[key] = apply_patch(result.get(key), value)
+        else:
+            result[key] = value
+    return result
+
+
+class DeltaFrame:
+    """Mensajes de un tick: el delta y, solo si alguien lo necesita, el keyframe"""
+
+    __slots__ = ("seq", "payload", "delta", "is_keyframe", "_keyframe")
+
+    def __init__(self, seq: int, payload: Dict, patch: Optional[Dict], is_keyframe: bool):
+        self.seq = seq
+        self.payload = payload
+        self.is_keyframe = is_keyframe or patch is None
+        self.delta = None if self.is_keyframe else json.dumps({"type": "delta", "seq": seq, "patch": patch})
+        self._keyframe: Optional[str] = None
+
+    def keyframe(self) -> str:
+        """Keyframe serializado (una vez por tick como mucho)"""
+        if self._keyframe is None:
+            self._keyframe = json.dumps({"type": "keyframe", "seq": self.seq, "data": drop_nulls(self.payload)})
+        return self._keyframe
+
+
+class DeltaEncoder:
+    """Numera los ticks y calcula el parche respecto al anterior"""
+
+    def __init__(self, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        self.keyframe_every = max(1, keyframe_every)
+        self.seq = 0
+        self.previous: Optional[Dict] = None
+        self.stats = {"keyframes": 0, "deltas": 0}
+
+    def encode(self, payload: Dict, needed: bool = True) -> Optional[DeltaFrame]:
+        """
+        Avanza un tick
+
+        Args:
+            payload: Payload completo del tick
+            needed: False si no hay clientes delta (solo se avanza la secuencia)
+
+        Returns:
+            DeltaFrame del tick, o None si no se necesita
+        """
+        self.seq += 1
+        previous, self.previous = self.previous, payload
+        if not needed:
+            return None
+        is_keyframe = previous is None or self.seq % self.keyframe_every == 0
+        patch = None if is_keyframe else diff_payload(previous, payload)
+        self.stats["keyframes" if is_keyframe else "deltas"] += 1
+        return DeltaFrame(self.seq, payload, patch, is_keyframe)
+
+
+def test_delta_stream():
+    """Prueba rápida: reconstruir los ticks aplicando los parches"""
+    import random
+
+    print("🧪 Probando flujo delta...")
+    encoder = DeltaEncoder(keyframe_every=10)
+    state = None
+    full_bytes = delta_bytes = mismatches = 0
+    for tick in range(30):
+        payload = {
+            "timestamp": tick * 0.05,
+            "simulators": {f"sim_{i}": {"raw_data": {"connected": True, "Gear": 3, "SpeedKmh": random.uniform(0, 200)},
+                                        "pilot_name": f"Piloto {i}"} for i in range(1, 6)},
+            "summary": {"total_drivers": 5, "group_calm_avg": 70.0}
+        }
+        frame = encoder.encode(payload)
+        message = json.loads(frame.keyframe() if frame.is_keyframe else frame.delta)
+        state = message["data"] if message["type"] == "keyframe" else apply_patch(state, message["patch"])
+        mismatches += state != payload
+        full_bytes += len(json.dumps(payload))
+        delta_bytes += len(frame.keyframe() if frame.is_keyframe else frame.delta)
+    print(f"📉 Completo: {full_bytes} bytes, delta: {delta_bytes} bytes ({delta_bytes / full_bytes:.0%})")
+    print(f"{'✅' if mismatches == 0 else '❌'} Ticks reconstruidos distintos del original: {mismatches}")
+
+
+if __name__ == "__main__":
+    test_delta_stream()
@@ -6,7 +6,11 @@ para que el arte se vea IGUAL que en el demo
 
 import logging
 
+from telemetry_logging import RateLimitedLogger
+
 logger = logging.getLogger(__name__)
+# La detección y la normalización corren en cada frame de cada simulador
+hot_log = RateLimitedLogger(logger)
 
 class UniversalGameNormalizer:
     """
@@ -70,17 +74,19 @@ class UniversalGameNormalizer:
             # F1: RPMs muy altos (>12000) o velocidades extremas (>300)
             if self.max_values_seen["rpms"] > 12000 or self.max_values_seen["speed"] > 300:
                 self.detected_game = "f1"
-                logger.info(f"🏎️ Juego detectado: F1 (Speed max: {self.max_values_seen['speed']:.0f}, RPMs max: {self.max_values_seen['rpms']:.0f})")
+                hot_log.info("detect:f1", "🏎️ Juego detectado: F1 (Speed max: %.0f, RPMs max: %.0f)",
+                             self.max_values_seen["speed"], self.max_values_seen["rpms"])
             
             # Assetto Corsa: Steering muy alto (>600°) o RPMs moderados
             elif self.max_values_seen["steering"] > 600 or (8000 < self.max_values_seen["rpms"] < 11000):
                 self.detected_game = "assetto_corsa"
-                logger.info(f"🏁 Juego detectado: Assetto Corsa (Steering max: {self.max_values_seen['steering']:.0f}°)")
+                hot_log.info("detect:assetto_corsa", "🏁 Juego detectado: Assetto Corsa (Steering max: %.0f°)",
+                             self.max_values_seen["steering"])
             
             # Genérico para otros
             else:
                 self.detected_game = "generic"
-                logger.info(f"🎮 Juego genérico detectado")
+                hot_log.info("detect:generic", "🎮 Juego genérico detectado")
     
     def normalize_telemetry(self, raw_data: dict) -> dict:
         """
@@ -162,13 +168,11 @@ class UniversalGameNormalizer:
             "_original_steering": steering_raw,
         }
         
-        # Log ocasional para debugging (cada 100 frames aprox)
-        import random
-        if random.random() < 0.01:
-            logger.info(f"🎨 NORMALIZACIÓN {self.detected_game.upper()}→Demo: "
-                       f"Speed {speed_raw:.0f}→{speed_normalized:.0f}, "
-                       f"RPMs {rpms_raw:.0f}→{rpms_normalized:.0f}, "
-                       f"Steering {steering_raw:.1f}→{steering_normalized:.1f}")
+        # Log ocasional para debugging (limitado por juego)
+        hot_log.info(("normalize", self.detected_game),
+                     "🎨 NORMALIZACIÓN %s→Demo: Speed %.0f→%.0f, RPMs %.0f→%.0f, Steering %.1f→%.1f",
+                     self.detected_game.upper(), speed_raw, speed_normalized,
+                     rpms_raw, rpms_normalized, steering_raw, steering_normalized)
         
         return normalized_data
     
@@ -7,46 +7,139 @@ a través de WebSockets para crear una experiencia inmersiva de empoderamiento.
 import asyncio
 import json
 import logging
-from typing import Dict, Set
+from typing import Dict, Optional
 import os
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import uvicorn
 
 from simhub_connector import SimHubConnector, DEFAULT_SIM_URLS
+from udp_telemetry import UdpTelemetrySource, parse_udp_sources
 from data_processor import DriverPerformanceProcessor
+from analytics import AnalyticsStage
+from broadcast import ConnectionManager
+from delta_stream import STREAM_MODES
+from wire_format import WIRE_FORMATS, schema as wire_schema
+from telemetry_logging import RateLimitedLogger, setup_queue_logging
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configurar logging: la escritura a consola corre en un hilo aparte
+setup_queue_logging(logging.INFO)
 logger = logging.getLogger(__name__)
+hot_log = RateLimitedLogger(logger)
 
 # CONFIGURACIÓN DE PRODUCCIÓN
 PRODUCTION_MODE = True  # Sistema listo para simuladores reales
 
+def load_sim_urls() -> Dict[str, str]:
+    """
+    Construye el conjunto de simuladores a partir de variables de entorno
+    
+    - SIM_COUNT: número de simuladores (5 por defecto)
+    - SIM_{n}_URL: URL explícita del simulador n
+    - SIM_URL_TEMPLATE: plantilla para los simuladores sin URL explícita, con
+      {n} (número de simulador) y {port} (SIM_BASE_PORT + n - 1), ej.
+      "http://10.0.0.{n}:8888/api/getgamedata"
+    
+    Returns:
+        Diccionario {sim_id: url}
+    """
+    count = int(os.getenv("SIM_COUNT", "5"))
+    template = os.getenv("SIM_URL_TEMPLATE")
+    base_port = int(os.getenv("SIM_BASE_PORT", "8888"))
+    
+    sim_urls = {}
+    for n in range(1, count + 1):
+        sim_id = f"sim_{n}"
+        url = os.getenv(f"SIM_{n}_URL")
+        if not url and template:
+            url = template.format(n=n, port=base_port + n - 1)
+        if not url:
+            url = DEFAULT_SIM_URLS.get(sim_id)
+        if url:
+            sim_urls[sim_id] = url
+        else:
+            logger.warning(f"⚠️ {sim_id} sin URL (define SIM_{n}_URL o SIM_URL_TEMPLATE)")
+    return sim_urls
+
 # Configuración de la aplicación
 class ConfianzaConfig:
     """Configuración centralizada de la aplicación"""
     
     # URLs de SimHub (se pueden personalizar via variables de entorno)
-    SIM_URLS = {
-        "sim_1": os.getenv("SIM_1_URL", "http://192.168.1.4:8888/api/getgamedata"),
-        "sim_2": os.getenv("SIM_2_URL", "http://192.168.1.101:8888/api/getgamedata"),
-        "sim_3": os.getenv("SIM_3_URL", "http://192.168.1.102:8888/api/getgamedata"),
-        "sim_4": os.getenv("SIM_4_URL", "http://192.168.1.103:8888/api/getgamedata"),
-        "sim_5": os.getenv("SIM_5_URL", "http://192.168.1.104:8888/api/getgamedata")
-    }
+    SIM_URLS = load_sim_urls()
     
     # Intervalo de actualización en segundos
     UPDATE_INTERVAL = float(os.getenv("UPDATE_INTERVAL", "0.05"))  # 50ms por defecto - actualización rápida para pintura fluida
     
+    # Modo de captura: "poller" (una tarea por simulador), "gather" (todas a la vez
+    # por tick) o "udp" (telemetría nativa de F1 2024 / Assetto Corsa sin SimHub)
+    FETCH_MODE = os.getenv("FETCH_MODE", "poller")
+    
+    # Fuentes UDP (solo FETCH_MODE=udp), ej: "sim_1=f1:20777,sim_2=ac:192.168.1.101:9996"
+    UDP_SOURCES = parse_udp_sources(os.getenv("UDP_SOURCES", ""))
+    UDP_TIMEOUT = float(os.getenv("UDP_TIMEOUT", "2.0"))  # segundos sin paquetes = desconectado
+    
+    # Circuit breaker para simuladores inalcanzables
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+    BREAKER_BASE_BACKOFF = float(os.getenv("BREAKER_BASE_BACKOFF", "0.5"))  # segundos
+    BREAKER_MAX_BACKOFF = float(os.getenv("BREAKER_MAX_BACKOFF", "5.0"))    # máximo entre pruebas
+    
+    # Motor de métricas: "python" (por simulador) o "numpy" (vectorizado,
+    # recomendado con decenas o cientos de simuladores; requiere numpy)
+    METRICS_BACKEND = os.getenv("METRICS_BACKEND", "python")
+    
+    # Eventos extremos: frames seguidos para notificar y frames de silencio
+    # tras notificar (a 20 Hz, 10 frames = 0.5 s)
+    EVENT_DEBOUNCE_FRAMES = int(os.getenv("EVENT_DEBOUNCE_FRAMES", "1"))
+    EVENT_COOLDOWN_FRAMES = int(os.getenv("EVENT_COOLDOWN_FRAMES", "10"))
+    
+    # Suavidad espectral del volante: energía por encima del corte (Hz),
+    # recalculada cada SPECTRAL_EVERY ticks para todas las conductoras
+    # (requiere NumPy; sin él smoothness_index queda en 50)
+    JITTER_CUTOFF_HZ = float(os.getenv("JITTER_CUTOFF_HZ", "3.0"))
+    SPECTRAL_EVERY = int(os.getenv("SPECTRAL_EVERY", "10"))
+    
+    # Analítica pesada (suavidad espectral, correlación, informe de sesión):
+    # "off" (por defecto), "inline" = en el event loop, "process" = pool de
+    # procesos (opt-in: cada proceso vuelve a importar main en Windows/macOS)
+    ANALYTICS_MODE = os.getenv("ANALYTICS_MODE", "off")
+    ANALYTICS_INTERVAL = float(os.getenv("ANALYTICS_INTERVAL", "1.0"))  # segundos
+    ANALYTICS_WORKERS = int(os.getenv("ANALYTICS_WORKERS", "2"))
+    
+    # Frames en cola por cliente WebSocket; si un navegador lento la llena
+    # se descarta el más antiguo en lugar de frenar el broadcast
+    CLIENT_QUEUE_SIZE = int(os.getenv("CLIENT_QUEUE_SIZE", "4"))
+    
+    # Modo delta (/ws?mode=delta): keyframe completo cada N ticks además de
+    # al conectar y en cada resync (a 20 Hz, 100 ticks = 5 s)
+    DELTA_KEYFRAME_EVERY = int(os.getenv("DELTA_KEYFRAME_EVERY", "100"))
+    
+    # Peticiones a SimHub en vuelo como máximo (acota la carga con cientos de rigs)
+    MAX_CONCURRENT_FETCHES = int(os.getenv("MAX_CONCURRENT_FETCHES", "16"))
+    
+    # Segundos que se sirve el último frame válido tras un error antes de
+    # reportar el simulador como desconectado
+    STALE_TTL = float(os.getenv("STALE_TTL", "1.0"))
+    
+    # Pool de conexiones HTTP hacia SimHub
+    POOL_LIMIT = int(os.getenv("POOL_LIMIT", "100"))
+    POOL_LIMIT_PER_HOST = int(os.getenv("POOL_LIMIT_PER_HOST", "4"))
+    KEEPALIVE_TIMEOUT = float(os.getenv("KEEPALIVE_TIMEOUT", "30"))  # 0 = sin keep-alive
+    DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", "300"))
+    CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "1.0"))  # establecer conexión TCP
+    READ_TIMEOUT = float(os.getenv("READ_TIMEOUT", "2.0"))        # esperar respuesta
+    
     # Configuración del puerto frontend
     FRONTEND_PATH = Path(__file__).parent.parent / "frontend"
+    
+    def get_sim_ids(self) -> list:
+        """Simuladores activos según el modo de captura"""
+        if self.FETCH_MODE == "udp":
+            return list(self.UDP_SOURCES.keys())
+        return list(self.SIM_URLS.keys())
 
 config = ConfianzaConfig()
 
@@ -57,47 +150,20 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Gestión de conexiones WebSocket
-class ConnectionManager:
-    """Gestor de conexiones WebSocket activas"""
-    
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-    
-    async def connect(self, websocket: WebSocket):
-        """Acepta nueva conexión WebSocket"""
-        await websocket.accept()
-        self.active_connections.add(websocket)
-        logger.info(f"Nueva conexión WebSocket. Total: {len(self.active_connections)}")
-    
-    def disconnect(self, websocket: WebSocket):
-        """Desconecta WebSocket"""
-        self.active_connections.discard(websocket)
-        logger.info(f"Conexión WebSocket cerrada. Total: {len(self.active_connections)}")
-    
-    async def broadcast_data(self, data: dict):
-        """Envía datos a todas las conexiones activas"""
-        if not self.active_connections:
-            return
-            
-        message = json.dumps(data)
-        disconnected = set()
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.warning(f"Error enviando datos a WebSocket: {e}")
-                disconnected.add(connection)
-        
-        # Limpiar conexiones muertas
-        for connection in disconnected:
-            self.active_connections.discard(connection)
-
 # Instancias globales
-manager = ConnectionManager()
-processor = DriverPerformanceProcessor()
+manager = ConnectionManager(queue_size=config.CLIENT_QUEUE_SIZE, keyframe_every=config.DELTA_KEYFRAME_EVERY)
+processor = DriverPerformanceProcessor(
+    backend=config.METRICS_BACKEND,
+    event_debounce=config.EVENT_DEBOUNCE_FRAMES,
+    event_cooldown=config.EVENT_COOLDOWN_FRAMES,
+    sample_rate=1.0 / config.UPDATE_INTERVAL,
+    jitter_cutoff_hz=config.JITTER_CUTOFF_HZ,
+    spectral_every=config.SPECTRAL_EVERY
+)
+analytics = AnalyticsStage(processor, interval=config.ANALYTICS_INTERVAL,
+                           mode=config.ANALYTICS_MODE, workers=config.ANALYTICS_WORKERS)
 connector = None
+udp_source = None
 
 # Estado de la aplicación
 app_state = {
@@ -112,17 +178,40 @@ app_state = {
 @app.on_event("startup")
 async def startup_event():
     """Inicialización al arrancar la aplicación"""
-    global connector
+    global connector, udp_source
     
     logger.info("🚀 Iniciando Confianza al Volante...")
     
     # Inicializar conector SimHub
-    connector = SimHubConnector()
+    connector = SimHubConnector(
+        breaker_failure_threshold=config.BREAKER_FAILURE_THRESHOLD,
+        breaker_base_backoff=config.BREAKER_BASE_BACKOFF,
+        breaker_max_backoff=config.BREAKER_MAX_BACKOFF,
+        connect_timeout=config.CONNECT_TIMEOUT,
+        read_timeout=config.READ_TIMEOUT,
+        pool_limit=config.POOL_LIMIT,
+        pool_limit_per_host=config.POOL_LIMIT_PER_HOST,
+        keepalive_timeout=config.KEEPALIVE_TIMEOUT,
+        dns_cache_ttl=config.DNS_CACHE_TTL,
+        max_concurrency=config.MAX_CONCURRENT_FETCHES,
+        stale_ttl=config.STALE_TTL
+    )
     await connector.__aenter__()
     
+    # En modo poller cada simulador tiene su propia tarea de captura
+    if config.FETCH_MODE == "poller":
+        connector.start_polling(config.SIM_URLS, config.UPDATE_INTERVAL)
+    elif config.FETCH_MODE == "udp":
+        # Telemetría push directa del juego
+        udp_source = UdpTelemetrySource(timeout=config.UDP_TIMEOUT)
+        await udp_source.start(config.UDP_SOURCES)
+    
     # Iniciar bucle principal de datos
     asyncio.create_task(main_data_loop())
     
+    # Analítica pesada fuera del event loop
+    await analytics.start()
+    
     logger.info("✅ Sistema iniciado correctamente")
 
 @app.on_event("shutdown")
@@ -134,6 +223,11 @@ async def shutdown_event():
     
     app_state["running"] = False
     
+    await analytics.stop()
+    
+    if udp_source:
+        await udp_source.stop()
+    
     if connector:
         await connector.__aexit__(None, None, None)
     
@@ -144,20 +238,36 @@ async def main_data_loop():
     Bucle principal que captura datos de SimHub, los procesa y los distribuye
     """
     app_state["running"] = True
-    logger.info(f"🔄 Iniciando bucle de datos (intervalo: {config.UPDATE_INTERVAL}s)")
+    logger.info(f"🔄 Iniciando bucle de datos (intervalo: {config.UPDATE_INTERVAL}s, modo: {config.FETCH_MODE})")
+    
+    loop = asyncio.get_event_loop()
+    next_tick = loop.time()
+    # Último frame procesado por simulador (modo poller) para no duplicar historial
+    last_frames: Dict[str, Dict] = {}
     
     while app_state["running"]:
         try:
             # Capturar datos de todos los simuladores
-            sim_data = await connector.fetch_all_sim_data(config.SIM_URLS)
+            if config.FETCH_MODE == "poller":
+                # Leer los slots sin esperar a ningún simulador
+                sim_data = connector.get_latest_data()
+            elif config.FETCH_MODE == "udp":
+                sim_data = udp_source.get_latest_data()
+            else:
+                sim_data = await connector.fetch_all_sim_data(config.SIM_URLS)
             
-            # Procesar datos y calcular métricas
+            # Procesar datos y calcular métricas (solo frames nuevos)
             for sim_id, data in sim_data.items():
+                if data is last_frames.get(sim_id):
+                    continue
+                last_frames[sim_id] = data
                 processor.update_data(sim_id, data)
             
-            # Obtener métricas procesadas
-            all_metrics = processor.get_all_metrics()
-            summary_stats = processor.get_summary_stats()
+            # Foto de métricas del tick (se calcula una vez y la comparten
+            # el broadcast y los endpoints REST)
+            snapshot = processor.snapshot()
+            all_metrics = snapshot.metrics
+            summary_stats = snapshot.summary
             
             # Preparar payload para frontend
             payload = {
@@ -167,14 +277,14 @@ async def main_data_loop():
             }
             
             # Añadir datos de cada simulador
-            for sim_id in config.SIM_URLS.keys():
+            for sim_id in config.get_sim_ids():
                 sim_raw_data = sim_data.get(sim_id, {})
                 sim_metrics = all_metrics.get(sim_id, {})
                 
                 payload["simulators"][sim_id] = {
                     "raw_data": sim_raw_data,
                     "metrics": sim_metrics,
-                    "pilot_name": f"Piloto {sim_id.split('_')[1]}"  # "Piloto 1", etc.
+                    "pilot_name": f"Piloto {sim_id.split('_')[-1]}"  # "Piloto 1", etc.
                 }
             
             # Enviar a todos los clientes conectados
@@ -188,36 +298,58 @@ async def main_data_loop():
                 if data.get("connected", False)
             )
             
-            # Esperar antes del siguiente ciclo
-            await asyncio.sleep(config.UPDATE_INTERVAL)
+            # Esperar hasta el siguiente tick del reloj fijo
+            next_tick += config.UPDATE_INTERVAL
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Vamos atrasados: re-sincronizar en lugar de acumular ticks
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
             
         except Exception as e:
-            logger.error(f"Error en bucle principal de datos: {e}")
+            hot_log.error("main_loop", "Error en bucle principal de datos: %s", e)
             await asyncio.sleep(1)  # Espera más tiempo en caso de error
+            next_tick = loop.time()
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(websocket: WebSocket, wire_format: str = Query("json", alias="format"),
+                             stream_mode: str = Query("full", alias="mode")):
     """
     Endpoint WebSocket para comunicación en tiempo real con el frontend
+    
+    Con ?format=binary los ticks llegan en el formato binario compacto
+    (wire_format.py); el saludo siempre es JSON e incluye el esquema.
+    Con ?mode=delta (solo JSON) llegan keyframes y parches (delta_stream.py);
+    el cliente puede pedir un keyframe enviando {"type": "resync"}.
+    Los clientes JSON completos pueden enviar {"type": "subscribe", "topics":
+    ["dashboard"]} (o "art", "summary", "sim_N") para recibir solo esas
+    proyecciones (topics.py).
     """
-    await manager.connect(websocket)
+    if wire_format not in WIRE_FORMATS:
+        wire_format = "json"
+    if stream_mode not in STREAM_MODES or wire_format != "json":
+        stream_mode = "full"
+    # Estado inicial (se envía antes que cualquier broadcast)
+    initial_payload = {
+        "type": "connection_established",
+        "message": "Conectado a Confianza al Volante",
+        "config": {
+            "update_interval": config.UPDATE_INTERVAL,
+            "simulators": config.get_sim_ids()
+        }
+    }
+    initial_payload["stream_mode"] = stream_mode
+    if wire_format == "binary":
+        initial_payload["wire_format"] = wire_schema()
+    await manager.connect(websocket, greeting=json.dumps(initial_payload), wire_format=wire_format,
+                          stream_mode=stream_mode)
     
     try:
-        # Enviar estado inicial
-        initial_payload = {
-            "type": "connection_established",
-            "message": "Conectado a Confianza al Volante",
-            "config": {
-                "update_interval": config.UPDATE_INTERVAL,
-                "simulators": list(config.SIM_URLS.keys())
-            }
-        }
-        await websocket.send_text(json.dumps(initial_payload))
-        
         # Mantener conexión viva
         while True:
-            # Esperar mensajes del cliente (si los hubiera)
-            await websocket.receive_text()
+            # Esperar mensajes del cliente (resync del modo delta, suscripciones a temas)
+            manager.handle_client_message(websocket, await websocket.receive_text())
             
     except WebSocketDisconnect:
         logger.info("Cliente WebSocket desconectado")
@@ -251,15 +383,34 @@ async def serve_artwork_js():
     """Servir JavaScript de obra de arte"""
     return FileResponse(config.FRONTEND_PATH / "artwork.js")
 
+@app.get("/wire_format.js")
+async def serve_wire_format_js():
+    """Servir el decodificador del formato binario"""
+    return FileResponse(config.FRONTEND_PATH / "wire_format.js")
+
 @app.get("/api/status")
 async def get_status():
     """Endpoint REST para obtener estado del sistema"""
     return {
         "status": "running" if app_state["running"] else "stopped",
         "stats": app_state["stats"],
+        "breakers": connector.get_breaker_states() if connector else {},
+        "connection_pool": connector.get_pool_stats() if connector else {},
+        "websocket": manager.get_stats(),
         "config": {
             "sim_urls": config.SIM_URLS,
             "update_interval": config.UPDATE_INTERVAL,
+            "fetch_mode": config.FETCH_MODE,
+            "max_concurrent_fetches": config.MAX_CONCURRENT_FETCHES,
+            "stale_ttl": config.STALE_TTL,
+            "metrics_backend": processor.backend,
+            "analytics_mode": config.ANALYTICS_MODE,
+            "client_queue_size": config.CLIENT_QUEUE_SIZE,
+            "delta_keyframe_every": config.DELTA_KEYFRAME_EVERY,
+            "udp_sources": {
+                sim_id: f"{game}:{host}:{port}"
+                for sim_id, (game, host, port) in config.UDP_SOURCES.items()
+            },
             "frontend_path": str(config.FRONTEND_PATH)
         }
     }
@@ -267,9 +418,35 @@ async def get_status():
 @app.get("/api/metrics")
 async def get_current_metrics():
     """Endpoint REST para obtener métricas actuales"""
+    snapshot = processor.snapshot()
+    return {
+        "metrics": snapshot.metrics,
+        "summary": snapshot.summary,
+        "version": snapshot.version,
+        "timestamp": asyncio.get_event_loop().time()
+    }
+
+@app.get("/api/windows")
+async def get_window_metrics(sim_id: Optional[str] = None):
+    """Endpoint REST con calma y control por ventana (raw, 1 s, 10 s, 1 min, sesión)"""
+    return {
+        "windows": processor.get_window_metrics(sim_id),
+        "timestamp": asyncio.get_event_loop().time()
+    }
+
+@app.get("/api/session")
+async def get_session_stats(sim_id: Optional[str] = None):
+    """Endpoint REST con las estadísticas de toda la sesión por conductora"""
+    return {
+        "session": processor.get_session_stats(sim_id),
+        "timestamp": asyncio.get_event_loop().time()
+    }
+
+@app.get("/api/analytics")
+async def get_analytics():
+    """Endpoint REST con el último resultado de la analítica pesada"""
     return {
-        "metrics": processor.get_all_metrics(),
-        "summary": processor.get_summary_stats(),
+        **analytics.get_results(),
         "timestamp": asyncio.get_event_loop().time()
     }
 
@@ -8,26 +8,28 @@ import json
 import logging
 import sys
 import os
-from typing import Dict, Set
+from typing import Dict, Optional
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import uvicorn
 
 # Importar nuestros módulos
 from data_processor import DriverPerformanceProcessor
+from analytics import AnalyticsStage
+from broadcast import ConnectionManager
+from delta_stream import STREAM_MODES
+from wire_format import WIRE_FORMATS, schema as wire_schema
+from telemetry_logging import setup_queue_logging
 
 # Importar el simulador de datos
 sys.path.append(str(Path(__file__).parent.parent))
 from demo_simulator import DemoSimulator
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configurar logging: la escritura a consola corre en un hilo aparte
+setup_queue_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Configuración de la aplicación
@@ -37,6 +39,17 @@ class DemoConfig:
     # Intervalo de actualización en segundos
     UPDATE_INTERVAL = 0.1  # 100ms
     
+    # Analítica pesada: "off" (por defecto), "inline" o "process" (igual que la versión real)
+    ANALYTICS_MODE = os.getenv("ANALYTICS_MODE", "off")
+    ANALYTICS_INTERVAL = float(os.getenv("ANALYTICS_INTERVAL", "1.0"))
+    ANALYTICS_WORKERS = int(os.getenv("ANALYTICS_WORKERS", "2"))
+    
+    # Frames en cola por cliente WebSocket (se descarta el más antiguo)
+    CLIENT_QUEUE_SIZE = int(os.getenv("CLIENT_QUEUE_SIZE", "4"))
+    
+    # Modo delta: keyframe completo cada N ticks (a 10 Hz, 50 ticks = 5 s)
+    DELTA_KEYFRAME_EVERY = int(os.getenv("DELTA_KEYFRAME_EVERY", "50"))
+    
     # Configuración del puerto frontend
     FRONTEND_PATH = Path(__file__).parent.parent / "frontend"
 
@@ -49,47 +62,12 @@ app = FastAPI(
     version="1.0.0-demo"
 )
 
-# Gestión de conexiones WebSocket (mismo código que la versión real)
-class ConnectionManager:
-    """Gestor de conexiones WebSocket activas"""
-    
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-    
-    async def connect(self, websocket: WebSocket):
-        """Acepta nueva conexión WebSocket"""
-        await websocket.accept()
-        self.active_connections.add(websocket)
-        logger.info(f"Nueva conexión WebSocket. Total: {len(self.active_connections)}")
-    
-    def disconnect(self, websocket: WebSocket):
-        """Desconecta WebSocket"""
-        self.active_connections.discard(websocket)
-        logger.info(f"Conexión WebSocket cerrada. Total: {len(self.active_connections)}")
-    
-    async def broadcast_data(self, data: dict):
-        """Envía datos a todas las conexiones activas"""
-        if not self.active_connections:
-            return
-            
-        message = json.dumps(data)
-        disconnected = set()
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.warning(f"Error enviando datos a WebSocket: {e}")
-                disconnected.add(connection)
-        
-        # Limpiar conexiones muertas
-        for connection in disconnected:
-            self.active_connections.discard(connection)
-
 # Instancias globales
-manager = ConnectionManager()
-processor = DriverPerformanceProcessor()
-demo_simulator = DemoSimulator()
+manager = ConnectionManager(queue_size=config.CLIENT_QUEUE_SIZE, keyframe_every=config.DELTA_KEYFRAME_EVERY)
+processor = DriverPerformanceProcessor(sample_rate=1.0 / config.UPDATE_INTERVAL)
+demo_simulator = DemoSimulator(int(os.getenv("SIM_COUNT", "5")))
+analytics = AnalyticsStage(processor, interval=config.ANALYTICS_INTERVAL,
+                           mode=config.ANALYTICS_MODE, workers=config.ANALYTICS_WORKERS)
 
 # Estado de la aplicación
 app_state = {
@@ -111,6 +89,9 @@ async def startup_event():
     # Iniciar bucle principal de datos
     asyncio.create_task(demo_data_loop())
     
+    # Analítica pesada fuera del event loop
+    await analytics.start()
+    
     logger.info("✅ Sistema DEMO iniciado correctamente")
 
 @app.on_event("shutdown")
@@ -118,6 +99,7 @@ async def shutdown_event():
     """Limpieza al cerrar la aplicación"""
     logger.info("🛑 Cerrando Confianza al Volante - DEMO")
     app_state["running"] = False
+    await analytics.stop()
     logger.info("✅ Sistema DEMO cerrado correctamente")
 
 async def demo_data_loop():
@@ -136,9 +118,11 @@ async def demo_data_loop():
             for sim_id, data in sim_data.items():
                 processor.update_data(sim_id, data)
             
-            # Obtener métricas procesadas
-            all_metrics = processor.get_all_metrics()
-            summary_stats = processor.get_summary_stats()
+            # Foto de métricas del tick (se calcula una vez y la comparten
+            # el broadcast y los endpoints REST)
+            snapshot = processor.snapshot()
+            all_metrics = snapshot.metrics
+            summary_stats = snapshot.summary
             
             # Preparar payload para frontend (mismo formato que versión real)
             payload = {
@@ -149,14 +133,14 @@ async def demo_data_loop():
             }
             
             # Añadir datos de cada simulador
-            for sim_id in ["sim_1", "sim_2", "sim_3", "sim_4", "sim_5"]:
+            for sim_id in demo_simulator.drivers:
                 sim_raw_data = sim_data.get(sim_id, {})
                 sim_metrics = all_metrics.get(sim_id, {})
                 
                 payload["simulators"][sim_id] = {
                     "raw_data": sim_raw_data,
                     "metrics": sim_metrics,
-                    "pilot_name": f"Piloto {sim_id.split('_')[1]} (DEMO)"
+                    "pilot_name": f"Piloto {sim_id.split('_')[-1]} (DEMO)"
                 }
             
             # Enviar a todos los clientes conectados
@@ -178,28 +162,43 @@ async def demo_data_loop():
             await asyncio.sleep(1)
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(websocket: WebSocket, wire_format: str = Query("json", alias="format"),
+                             stream_mode: str = Query("full", alias="mode")):
     """
     Endpoint WebSocket para comunicación en tiempo real con el frontend
+    
+    Con ?format=binary los ticks llegan en el formato binario compacto
+    (wire_format.py); el saludo siempre es JSON e incluye el esquema.
+    Con ?mode=delta (solo JSON) llegan keyframes y parches (delta_stream.py);
+    el cliente puede pedir un keyframe enviando {"type": "resync"}.
+    Los clientes JSON completos pueden enviar {"type": "subscribe", "topics":
+    ["dashboard"]} (o "art", "summary", "sim_N") para recibir solo esas
+    proyecciones (topics.py).
     """
-    await manager.connect(websocket)
+    if wire_format not in WIRE_FORMATS:
+        wire_format = "json"
+    if stream_mode not in STREAM_MODES or wire_format != "json":
+        stream_mode = "full"
+    # Estado inicial (se envía antes que cualquier broadcast)
+    initial_payload = {
+        "type": "connection_established",
+        "message": "Conectado a Confianza al Volante - MODO DEMO",
+        "demo_mode": True,
+        "config": {
+            "update_interval": config.UPDATE_INTERVAL,
+            "simulators": list(demo_simulator.drivers)
+        }
+    }
+    initial_payload["stream_mode"] = stream_mode
+    if wire_format == "binary":
+        initial_payload["wire_format"] = wire_schema()
+    await manager.connect(websocket, greeting=json.dumps(initial_payload), wire_format=wire_format,
+                          stream_mode=stream_mode)
     
     try:
-        # Enviar estado inicial
-        initial_payload = {
-            "type": "connection_established",
-            "message": "Conectado a Confianza al Volante - MODO DEMO",
-            "demo_mode": True,
-            "config": {
-                "update_interval": config.UPDATE_INTERVAL,
-                "simulators": ["sim_1", "sim_2", "sim_3", "sim_4", "sim_5"]
-            }
-        }
-        await websocket.send_text(json.dumps(initial_payload))
-        
         # Mantener conexión viva
         while True:
-            await websocket.receive_text()
+            manager.handle_client_message(websocket, await websocket.receive_text())
             
     except WebSocketDisconnect:
         logger.info("Cliente WebSocket desconectado")
@@ -233,6 +232,11 @@ async def serve_artwork_js():
     """Servir JavaScript de obra de arte"""
     return FileResponse(config.FRONTEND_PATH / "artwork.js")
 
+@app.get("/wire_format.js")
+async def serve_wire_format_js():
+    """Servir el decodificador del formato binario"""
+    return FileResponse(config.FRONTEND_PATH / "wire_format.js")
+
 @app.get("/api/status")
 async def get_status():
     """Endpoint REST para obtener estado del sistema DEMO"""
@@ -240,6 +244,7 @@ async def get_status():
         "status": "running" if app_state["running"] else "stopped",
         "mode": "DEMO - Datos Simulados",
         "stats": app_state["stats"],
+        "websocket": manager.get_stats(),
         "config": {
             "update_interval": config.UPDATE_INTERVAL,
             "frontend_path": str(config.FRONTEND_PATH),
@@ -250,9 +255,38 @@ async def get_status():
 @app.get("/api/metrics")
 async def get_current_metrics():
     """Endpoint REST para obtener métricas actuales DEMO"""
+    snapshot = processor.snapshot()
+    return {
+        "metrics": snapshot.metrics,
+        "summary": snapshot.summary,
+        "version": snapshot.version,
+        "timestamp": asyncio.get_event_loop().time(),
+        "demo_mode": True
+    }
+
+@app.get("/api/windows")
+async def get_window_metrics(sim_id: Optional[str] = None):
+    """Endpoint REST con calma y control por ventana (raw, 1 s, 10 s, 1 min, sesión) DEMO"""
+    return {
+        "windows": processor.get_window_metrics(sim_id),
+        "timestamp": asyncio.get_event_loop().time(),
+        "demo_mode": True
+    }
+
+@app.get("/api/session")
+async def get_session_stats(sim_id: Optional[str] = None):
+    """Endpoint REST con las estadísticas de toda la sesión por conductora DEMO"""
+    return {
+        "session": processor.get_session_stats(sim_id),
+        "timestamp": asyncio.get_event_loop().time(),
+        "demo_mode": True
+    }
+
+@app.get("/api/analytics")
+async def get_analytics():
+    """Endpoint REST con el último resultado de la analítica pesada DEMO"""
     return {
-        "metrics": processor.get_all_metrics(),
-        "summary": processor.get_summary_stats(),
+        **analytics.get_results(),
         "timestamp": asyncio.get_event_loop().time(),
         "demo_mode": True
     }
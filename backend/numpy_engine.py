@@ -0,0 +1,416 @@
+"""
+Motor vectorizado de métricas para Confianza al Volante
+Guarda el historial de todas las conductoras en un único array de NumPy
+(simuladores × canales × ventana) y calcula calma, control, parámetros
+artísticos, eventos extremos y estadísticas de grupo de todas a la vez.
+
+Es el backend "numpy" de DriverPerformanceProcessor; NumPy es opcional.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from streaming_metrics import DEFAULT_EVENT_COOLDOWN, DEFAULT_EVENT_DEBOUNCE, EVENT_TYPES, strongest_event
+
+logger = logging.getLogger(__name__)
+
+# NumPy es opcional: sin él el procesador usa el backend Python
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+    HAS_NUMPY = False
+
+# Canales guardados por muestra (índice en el eje 1 del array)
+CHANNELS = ("SteeringAngle", "Throttle", "Brake", "SpeedKmh", "Rpms")
+STEER, THROTTLE, BRAKE, SPEED, RPMS = range(len(CHANNELS))
+
+# Mismos umbrales que el backend Python (data_processor / streaming_metrics)
+MIN_SAMPLES = 10
+# Muestras que usan las reglas de eventos (desviación del volante en 5)
+EVENT_WINDOW = 5
+MAX_STD_EXPECTED = 15.0
+OVERLAP_THRESHOLD = 0.1
+JERK_THRESHOLD = 0.3
+
+
+class NumpyMetricsEngine:
+    """
+    Historial y métricas de todas las conductoras en arrays de NumPy
+
+    push() solo apunta la muestra (posición en el anillo de su fila incluida)
+    en listas de Python, que son mucho más baratas que escribir escalares en
+    NumPy. compute() vuelca todas las muestras pendientes con una única
+    asignación vectorizada y recalcula en una pasada las filas pendientes con
+    historial suficiente, igual que hace el backend Python en cada update_data.
+    Los eventos extremos se evalúan muestra a muestra, como el detector en
+    streaming: con varios frames por tick no se pierde ninguno.
+    """
+
+    def __init__(self, history_size: int = 50, initial_sims: int = 8,
+                 event_debounce: int = DEFAULT_EVENT_DEBOUNCE,
+                 event_cooldown: int = DEFAULT_EVENT_COOLDOWN):
+        if not HAS_NUMPY:
+            raise ImportError("NumPy no está instalado")
+        self.history_size = max(2, history_size)
+        # Mismo filtro de eventos que ExtremeEventDetector (cuenta muestras)
+        self.event_debounce = max(1, event_debounce)
+        self.event_cooldown = max(0, event_cooldown)
+        self.sim_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # Estado escalar por fila en listas de Python (push lo toca en cada frame)
+        self.heads: List[int] = []
+        self.counts: List[int] = []
+        self.connected: List[bool] = []
+        # Muestras recibidas en total y desde el último compute()
+        self.totals: List[int] = []
+        self.fresh: List[int] = []
+        # Muestras apuntadas por push() y aún no volcadas al array
+        self._pending_rows: List[int] = []
+        self._pending_slots: List[int] = []
+        self._pending_values: List[tuple] = []
+        self._allocate(initial_sims)
+
+    def _allocate(self, capacity: int) -> None:
+        """Reserva (o amplía, conservando las filas existentes) los arrays para `capacity` simuladores"""
+        def grow(name, shape, fill, dtype):
+            new = np.full(shape, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                new[:len(old)] = old
+            setattr(self, name, new)
+
+        # Anillo espejado: cada muestra se escribe en i y en i + ventana, así
+        # la ventana de cada fila es la rebanada contigua [head, head + ventana)
+        grow("data", (capacity, len(CHANNELS), 2 * self.history_size), 0.0, np.float64)
+        # Índices vigentes (50 = neutral hasta tener MIN_SAMPLES muestras)
+        grow("calm", capacity, 50.0, np.float64)
+        grow("control", capacity, 50.0, np.float64)
+        # Estado del filtro debounce/cooldown de eventos por fila
+        grow("event_frame", capacity, 0, np.int64)
+        grow("event_active", capacity, 0, np.int64)
+        grow("event_streak", capacity, 0, np.int64)
+        grow("event_ready_at", (capacity, len(EVENT_TYPES)), 0, np.int64)
+        self.capacity = capacity
+
+    @property
+    def num_sims(self) -> int:
+        return len(self.sim_ids)
+
+    def samples(self, sim_id: str) -> int:
+        """Muestras en el historial del simulador (0 si no existe)"""
+        row = self._rows.get(sim_id)
+        return self.counts[row] if row is not None else 0
+
+    def windows(self, channels, min_samples: int = MIN_SAMPLES) -> Dict[str, Dict[str, List[float]]]:
+        """Copia (listas) de las ventanas de `channels` de cada simulador con historial suficiente"""
+        self._flush()
+        indices = [CHANNELS.index(channel) for channel in channels]
+        window = self.history_size
+        result = {}
+        for row, sim_id in enumerate(self.sim_ids):
+            count = self.counts[row]
+            if count < min_samples:
+                continue
+            head = self.heads[row]
+            values = self.data[row, indices, head + window - count:head + window].tolist()
+            result[sim_id] = dict(zip(channels, values))
+        return result
+
+    def window_matrix(self, channel: str):
+        """
+        Ventanas llenas de un canal como matriz (simuladores × ventana), sin
+        pasar por listas de Python
+
+        Returns:
+            (sim_ids, matriz) con las filas en el mismo orden que sim_ids
+        """
+        self._flush()
+        index = CHANNELS.index(channel)
+        window = self.history_size
+        full = np.flatnonzero(np.array(self.counts) == window)
+        heads = np.array(self.heads)[full]
+        matrix = np.empty((len(full), window))
+        for head in np.unique(heads).tolist():
+            group = heads == head
+            matrix[group] = self.data[full[group], index, head:head + window]
+        return [self.sim_ids[row] for row in full.tolist()], matrix
+
+    def push(self, sim_id: str, frame: Dict) -> None:
+        """Escribe una muestra en el anillo del simulador"""
+        row = self._rows.get(sim_id)
+        if row is None:
+            row = len(self.sim_ids)
+            if row == self.capacity:
+                self._allocate(self.capacity * 2)
+            self._rows[sim_id] = row
+            self.sim_ids.append(sim_id)
+            self.heads.append(0)
+            self.counts.append(0)
+            self.connected.append(False)
+            self.totals.append(0)
+            self.fresh.append(0)
+
+        head = self.heads[row]
+        self._pending_rows.append(row)
+        self._pending_slots.append(head)
+        self._pending_values.append((
+            frame.get("SteeringAngle") or 0.0,
+            frame.get("Throttle") or 0.0,
+            frame.get("Brake") or 0.0,
+            frame.get("SpeedKmh") or 0.0,
+            frame.get("Rpms") or 0.0,
+        ))
+        self.heads[row] = head + 1 if head + 1 < self.history_size else 0
+        if self.counts[row] < self.history_size:
+            self.counts[row] += 1
+        self.connected[row] = bool(frame.get("connected", False))
+        self.totals[row] += 1
+        self.fresh[row] += 1
+
+    def _flush(self) -> None:
+        """Vuelca las muestras pendientes al array en una sola asignación"""
+        if not self._pending_rows:
+            return
+        rows = np.array(self._pending_rows)
+        slots = np.array(self._pending_slots)
+        values = np.array(self._pending_values)
+        # Cada muestra tiene su propia posición, salvo que una fila dé la
+        # vuelta al anillo entre dos volcados. NumPy no garantiza qué valor
+        # queda con índices repetidos, así que se conserva solo la última
+        # escritura de cada (fila, posición): np.unique sobre el orden
+        # inverso devuelve su primera aparición
+        _, last = np.unique((rows * self.history_size + slots)[::-1], return_index=True)
+        if len(last) < len(rows):
+            keep = len(rows) - 1 - last
+            rows, slots, values = rows[keep], slots[keep], values[keep]
+        self.data[rows, :, slots] = values
+        self.data[rows, :, slots + self.history_size] = values
+        self._pending_rows = []
+        self._pending_slots = []
+        self._pending_values = []
+
+    def compute(self, metrics: Dict[str, Dict],
+                smoothness: Optional[Dict[str, float]] = None) -> Dict[str, List[Dict]]:
+        """
+        Recalcula en una pasada las filas pendientes y actualiza `metrics`
+        ({sim_id: métricas}, el current_metrics del procesador). La suavidad
+        espectral se calcula aparte, a menor cadencia, y llega ya hecha
+
+        Returns:
+            Eventos extremos notificados desde el último compute() por
+            simulador (solo los que tienen alguno); se pinta el de mayor
+            prioridad
+        """
+        smoothness = smoothness or {}
+        sims = self.num_sims
+        if not sims:
+            return {}
+        self._flush()
+        counts = np.array(self.counts)
+        fresh = np.array(self.fresh)
+        ready = (fresh > 0) & (counts >= MIN_SAMPLES)
+        self.fresh = [0] * sims
+        if not ready.any():
+            return {}
+
+        rows = np.flatnonzero(ready)
+        window = self.history_size
+        counts = counts[rows]
+        # Ventanas ordenadas de la muestra más antigua a la más reciente. Los
+        # simuladores suelen avanzar a la vez, así que se copian por grupos de
+        # filas con el mismo head (normalmente uno solo) en vez de con un
+        # gather elemento a elemento
+        heads = np.array(self.heads)[rows]
+        ordered = np.empty((len(rows), len(CHANNELS), window))
+        for head in np.unique(heads).tolist():
+            group = heads == head
+            ordered[group] = self.data[rows[group], :, head:head + window]
+        valid = np.arange(window) >= (window - counts)[:, None]
+        # Par (j, j+1) válido si j lo es (las muestras válidas van al final)
+        pair_valid = valid[:, :-1]
+
+        steering = ordered[:, STEER]
+        throttle = ordered[:, THROTTLE]
+        brake = ordered[:, BRAKE]
+
+        # === CALMA: desviación estándar de la derivada del volante ===
+        derivatives = np.abs(np.diff(steering, axis=1))
+        n = counts - 1
+        mean = np.where(pair_valid, derivatives, 0.0).sum(axis=1) / np.maximum(n, 1)
+        centered = np.where(pair_valid, derivatives - mean[:, None], 0.0)
+        std_dev = np.sqrt((centered ** 2).sum(axis=1) / np.maximum(n - 1, 1))
+        calm = np.where(n >= 2, np.clip(100 - (std_dev / MAX_STD_EXPECTED * 100), 0.0, 100.0), 50.0)
+
+        # === CONTROL: pedales simultáneos y cambios bruscos ===
+        overlaps = ((throttle > OVERLAP_THRESHOLD) & (brake > OVERLAP_THRESHOLD) & valid).sum(axis=1)
+        jerks = (((np.abs(np.diff(throttle, axis=1)) > JERK_THRESHOLD) |
+                  (np.abs(np.diff(brake, axis=1)) > JERK_THRESHOLD)) & pair_valid).sum(axis=1)
+        control = np.clip(100 - ((overlaps + jerks) / counts * 100), 0.0, 100.0)
+
+        # === PARÁMETROS ARTÍSTICOS (último frame) ===
+        latest = ordered[:, :, -1]
+        position = np.clip((latest[:, STEER] + 45) / 90, 0.0, 1.0)
+        hue = 240 - (np.minimum(latest[:, SPEED], 200.0) / 200.0 * 240)
+        # Como en el backend Python, la saturación usa el índice de calma
+        # vigente antes de este recálculo
+        saturation = 30 + (self.calm[rows] * 0.7)
+        thickness = 1.0 + (np.minimum(latest[:, RPMS], 8000.0) / 8000.0 * 8.0)
+        opacity = 0.2 + (latest[:, THROTTLE] * 0.8)
+
+        events = self._detect_extreme_events(rows, ordered, fresh[rows], np.array(self.totals)[rows])
+
+        self.calm[rows] = calm
+        self.control[rows] = control
+
+        # tolist() convierte cada columna a floats de Python de una vez
+        sim_ids = self.sim_ids
+        notified = {}
+        for row, calm_i, control_i, position_i, hue_i, saturation_i, thickness_i, opacity_i, row_events in zip(
+                rows.tolist(), calm.tolist(), control.tolist(), position.tolist(), hue.tolist(),
+                saturation.tolist(), thickness.tolist(), opacity.tolist(), events):
+            sim_id = sim_ids[row]
+            if row_events:
+                notified[sim_id] = row_events
+            metrics[sim_id] = {
+                "calm_index": calm_i,
+                "control_index": control_i,
+                "smoothness_index": smoothness.get(sim_id, 50.0),
+                "art_parameters": {
+                    "position": position_i,
+                    "color": [hue_i, saturation_i, 50],
+                    "thickness": thickness_i,
+                    "opacity": opacity_i,
+                    "extreme_events": strongest_event(row_events)
+                }
+            }
+        return notified
+
+    def _detect_extreme_events(self, rows, ordered, fresh, totals) -> List[List[Dict]]:
+        """
+        Mismas reglas, prioridad y filtro que ExtremeEventDetector, vectorizados
+
+        Recorre las muestras nuevas de cada fila de la más antigua a la más
+        reciente (una pasada vectorizada por posición) y evalúa las reglas
+        sobre la ventana que acaba en esa muestra, como hace el backend Python
+        al llegar cada frame. Las muestras que ya no caben en la ventana (más
+        de ventana - 4 frames entre dos compute()) no se evalúan.
+
+        Returns:
+            Lista de eventos notificados por fila (en orden de llegada)
+        """
+        events = [[] for _ in range(len(rows))]
+        window = ordered.shape[2]
+        oldest = min(int(fresh.max()), window - EVENT_WINDOW + 1) - 1
+        for age in range(oldest, -1, -1):
+            # El backend Python solo detecta con MIN_SAMPLES en el historial
+            live = np.flatnonzero((fresh > age) & (totals - age >= MIN_SAMPLES))
+            if len(live):
+                end = window - age
+                self._detect_at(rows[live], ordered[live, :, end - EVENT_WINDOW:end], live, events)
+        return events
+
+    def _detect_at(self, rows, recent, live, events: List[List[Dict]]) -> None:
+        """Evalúa las reglas en la última muestra de `recent` (las 5 últimas de cada fila)"""
+        steering = recent[:, STEER]
+        current_steering = steering[:, -1]
+        prev_steering = steering[:, -2]
+        steering_3ago = steering[:, -3]
+        current_speed = recent[:, SPEED, -1]
+        prev_speed = recent[:, SPEED, -2]
+        current_brake = recent[:, BRAKE, -1]
+
+        steering_change = np.abs(current_steering - prev_steering)
+        spin = (np.abs(current_steering) > 90) & (current_speed > 50) & (steering_change > 30)
+
+        speed_drop = prev_speed - current_speed
+        crash = (prev_speed > 80) & (speed_drop > 60) & (current_brake > 0.8)
+
+        emergency = (current_brake > 0.9) & (current_speed > 40)
+
+        total_steering_change = np.abs(current_steering - steering_3ago)
+        sign_change = (prev_steering * current_steering < 0) | (steering_3ago * prev_steering < 0)
+        correction = sign_change & (total_steering_change > 60) & (current_speed > 30)
+
+        # Con MIN_SAMPLES muestras siempre hay 5 ángulos en la ventana
+        steering_std = np.std(steering, axis=1, ddof=1)
+        erratic = (steering_std > 25) & (current_speed > 20)
+
+        # Código del evento de mayor prioridad (0 = normal), como en EVENT_TYPES
+        code = np.select([spin, crash, emergency, correction, erratic], [1, 2, 3, 4, 5], 0)
+
+        # Debounce/cooldown: rachas del mismo tipo y frame de reactivación por tipo
+        self.event_frame[rows] += 1
+        frame = self.event_frame[rows]
+        streak = np.where(code == 0, 0,
+                          np.where(code == self.event_active[rows], self.event_streak[rows] + 1, 1))
+        self.event_active[rows] = code
+        self.event_streak[rows] = streak
+        type_index = np.maximum(code - 1, 0)
+        ready_at = self.event_ready_at[rows, type_index]
+        report = (code > 0) & (streak == self.event_debounce) & (frame >= ready_at)
+        self.event_ready_at[rows[report], type_index[report]] = frame[report] + self.event_cooldown
+
+        # Solo las filas con un evento notificado pasan por el bucle de Python
+        for i in np.flatnonzero(report).tolist():
+            if spin[i]:
+                event = {
+                    "type": "spin",
+                    "intensity": float(min(1.0, (abs(current_steering[i]) / 180) + (steering_change[i] / 90))),
+                    "direction": "left" if current_steering[i] < 0 else "right",
+                    "speed": float(current_speed[i])
+                }
+            elif crash[i]:
+                event = {
+                    "type": "crash",
+                    "intensity": float(min(1.0, speed_drop[i] / 120)),
+                    "impact_speed": float(prev_speed[i]),
+                    "brake_force": float(current_brake[i])
+                }
+            elif emergency[i]:
+                event = {
+                    "type": "emergency_brake",
+                    "intensity": float(current_brake[i] * (current_speed[i] / 100)),
+                    "speed": float(current_speed[i])
+                }
+            elif correction[i]:
+                event = {
+                    "type": "correction",
+                    "intensity": float(min(1.0, total_steering_change[i] / 120)),
+                    "severity": "violent" if total_steering_change[i] > 90 else "sharp"
+                }
+            else:
+                event = {
+                    "type": "erratic",
+                    "intensity": float(min(1.0, steering_std[i] / 50)),
+                    "chaos_level": float(steering_std[i])
+                }
+            events[live[i]].append(event)
+
+    def summary(self) -> Dict:
+        """Estadísticas de grupo de las conductoras conectadas"""
+        sims = self.num_sims
+        connected = np.array(self.connected, dtype=bool) & (np.array(self.counts) > 0)
+        calm = self.calm[:sims][connected]
+        control = self.control[:sims][connected]
+
+        group_calm = float(calm.mean()) if len(calm) else 50
+        group_control = float(control.mean()) if len(control) else 50
+        return {
+            "connected_drivers": int(connected.sum()),
+            "total_drivers": sims,
+            "group_calm_avg": group_calm,
+            "group_control_avg": group_control,
+            "group_calm_harmony": 100 - float(calm.std(ddof=1)) if len(calm) > 1 else 50,
+            "collective_strength": (group_calm + group_control) / 2
+        }
+
+
+def create_engine(history_size: int, event_debounce: int = DEFAULT_EVENT_DEBOUNCE,
+                  event_cooldown: int = DEFAULT_EVENT_COOLDOWN) -> Optional[NumpyMetricsEngine]:
+    """Crea el motor NumPy o devuelve None (con aviso) si NumPy no está disponible"""
+    if not HAS_NUMPY:
+        logger.warning("⚠️ NumPy no está instalado: se usa el backend Python de métricas")
+        return None
+    return NumpyMetricsEngine(history_size, event_debounce=event_debounce, event_cooldown=event_cooldown)
@@ -0,0 +1,212 @@
+"""
+Ventanas multi-resolución para Confianza al Volante
+Tendencias de calma y control a 10 s, 1 minuto y toda la sesión sin
+guardar cada frame: los frames se agregan en cubetas de 1 s, las cubetas
+de 1 s en cubetas de 10 s y estas en el total de la sesión. Cada cubeta
+guarda solo estadísticos suficientes (conteos, media y M2), que se
+combinan sin volver a ver las muestras.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+from streaming_metrics import MAX_STD_EXPECTED, RollingControl
+
+# Niveles expuestos por la API (además de "raw", la ventana del historial)
+TIERS = ("1s", "10s", "60s", "session")
+# Cubetas cerradas que se conservan por nivel: 10 × 1 s y 6 × 10 s
+SECOND_BUCKETS = 10
+TEN_SECOND_BUCKETS = 6
+
+
+class WindowStats:
+    """
+    Estadísticos suficientes de un tramo de conducción
+
+    - derivada absoluta del volante: conteo, media y M2 (Welford), de los
+      que sale la desviación estándar del índice de calma
+    - inputs y inputs erráticos (pedales simultáneos + cambios bruscos),
+      de los que sale el índice de control
+    """
+
+    __slots__ = ("samples", "jerky", "d_count", "d_mean", "d_m2")
+
+    def __init__(self):
+        self.samples = 0
+        self.jerky = 0
+        self.d_count = 0
+        self.d_mean = 0.0
+        self.d_m2 = 0.0
+
+    def add(self, derivative: Optional[float], jerky: int) -> None:
+        """Añade una muestra (derivative None = primera muestra, sin anterior)"""
+        self.samples += 1
+        self.jerky += jerky
+        if derivative is not None:
+            self.d_count += 1
+            delta = derivative - self.d_mean
+            self.d_mean += delta / self.d_count
+            self.d_m2 += delta * (derivative - self.d_mean)
+
+    def merge(self, other: "WindowStats") -> None:
+        """Combina otro tramo (fórmula paralela de Chan para media y M2)"""
+        self.samples += other.samples
+        self.jerky += other.jerky
+        if not other.d_count:
+            return
+        count = self.d_count + other.d_count
+        delta = other.d_mean - self.d_mean
+        self.d_mean += delta * other.d_count / count
+        self.d_m2 += other.d_m2 + delta * delta * self.d_count * other.d_count / count
+        self.d_count = count
+
+    def copy(self) -> "WindowStats":
+        stats = WindowStats()
+        stats.merge(self)
+        return stats
+
+    def calm_index(self) -> float:
+        """Índice de calma (0-100) del tramo; 50 con menos de 2 derivadas"""
+        if self.d_count < 2:
+            return 50.0
+        std_dev = math.sqrt(max(0.0, self.d_m2) / (self.d_count - 1))
+        return min(100.0, max(0.0, 100 - (std_dev / MAX_STD_EXPECTED * 100)))
+
+    def control_index(self) -> float:
+        """Índice de control (0-100) del tramo; 50 sin muestras"""
+        if not self.samples:
+            return 50.0
+        return min(100.0, max(0.0, 100 - (self.jerky / self.samples * 100)))
+
+    def to_dict(self) -> Dict:
+        return {
+            "calm_index": self.calm_index(),
+            "control_index": self.control_index(),
+            "samples": self.samples
+        }
+
+
+class MultiResolutionWindows:
+    """
+    Agregación jerárquica de un simulador: frames → 1 s → 10 s → sesión
+
+    push() es O(1): suma la muestra a la cubeta de 1 s abierta y, al cambiar
+    de segundo, cierra esa cubeta (se guarda y se combina en la de 10 s
+    abierta); al cambiar de decena de segundos cierra la de 10 s (se guarda
+    y se combina en el total de la sesión). metrics() combina como mucho
+    unas pocas cubetas por nivel.
+
+    Tras un hueco (frames desconectados o stale, ver mark_gap) la siguiente
+    muestra no aporta derivada ni cambio brusco: no hay muestra anterior real.
+    """
+
+    def __init__(self):
+        self.seconds: deque = deque(maxlen=SECOND_BUCKETS)            # (segundo, WindowStats)
+        self.ten_seconds: deque = deque(maxlen=TEN_SECOND_BUCKETS)    # (decena, WindowStats)
+        self.session = WindowStats()
+        self._second: Optional[int] = None
+        self._second_stats = WindowStats()
+        self._ten: Optional[int] = None
+        self._ten_stats = WindowStats()
+        self._last: Optional[tuple] = None
+
+    def push(self, timestamp: float, steering: float, throttle: float, brake: float) -> None:
+        """Añade una muestra con su marca de tiempo (segundos, monótona)"""
+        second = int(timestamp)
+        if second != self._second:
+            self._roll(second)
+
+        derivative = None
+        jerky = 1 if throttle > RollingControl.OVERLAP_THRESHOLD and brake > RollingControl.OVERLAP_THRESHOLD else 0
+        if self._last is not None:
+            prev_steering, prev_throttle, prev_brake = self._last
+            derivative = abs(steering - prev_steering)
+            if (abs(throttle - prev_throttle) > RollingControl.JERK_THRESHOLD or
+                    abs(brake - prev_brake) > RollingControl.JERK_THRESHOLD):
+                jerky += 1
+        self._last = (steering, throttle, brake)
+        self._second_stats.add(derivative, jerky)
+
+    def mark_gap(self) -> None:
+        """Corta la continuidad: la próxima muestra no se compara con la última"""
+        self._last = None
+
+    def _roll(self, second: int) -> None:
+        """Cierra la cubeta de 1 s abierta (y la de 10 s si cambia la decena)"""
+        if self._second is not None:
+            self.seconds.append((self._second, self._second_stats))
+            self._ten_stats.merge(self._second_stats)
+        ten = second // 10
+        if ten != self._ten:
+            if self._ten is not None:
+                self.ten_seconds.append((self._ten, self._ten_stats))
+                self.session.merge(self._ten_stats)
+            self._ten = ten
+            self._ten_stats = WindowStats()
+        self._second = second
+        self._second_stats = WindowStats()
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Calma y control por nivel: último segundo completo, últimos 10 s, último minuto y sesión"""
+        if self._second is None:
+            return {tier: WindowStats().to_dict() for tier in TIERS}
+
+        # Segundo anterior al abierto (sin datos en ese segundo = neutral)
+        last_second = WindowStats()
+        if self.seconds and self.seconds[-1][0] == self._second - 1:
+            last_second = self.seconds[-1][1]
+
+        last_10s = self._second_stats.copy()
+        for second, stats in self.seconds:
+            if second > self._second - SECOND_BUCKETS:
+                last_10s.merge(stats)
+
+        # Decena abierta (cubetas de 1 s ya cerradas) + cubeta de 1 s abierta
+        open_ten = self._ten_stats.copy()
+        open_ten.merge(self._second_stats)
+
+        last_minute = open_ten.copy()
+        for ten, stats in self.ten_seconds:
+            if ten > self._ten - TEN_SECOND_BUCKETS:
+                last_minute.merge(stats)
+
+        session = self.session.copy()
+        session.merge(open_ten)
+        return {
+            "1s": last_second.to_dict(),
+            "10s": last_10s.to_dict(),
+            "60s": last_minute.to_dict(),
+            "session": session.to_dict()
+        }
+
+
+def test_rolling_windows():
+    """Prueba rápida contra el cálculo directo sobre todas las muestras"""
+    import random
+    import statistics
+
+    print("🧪 Probando MultiResolutionWindows...")
+    windows = MultiResolutionWindows()
+    samples = []
+    for step in range(20 * 95):  # 95 s a 20 Hz
+        timestamp = step * 0.05
+        steering = random.gauss(0, 10)
+        windows.push(timestamp, steering, random.random(), random.choice((0.0, random.random())))
+        samples.append((timestamp, steering))
+
+    def direct_calm(since: float) -> float:
+        window = [s for t, s in samples if t >= since]
+        derivatives = [abs(window[i] - window[i - 1]) for i in range(1, len(window))]
+        std_dev = statistics.stdev(derivatives)
+        return min(100.0, max(0.0, 100 - (std_dev / MAX_STD_EXPECTED * 100)))
+
+    metrics = windows.metrics()
+    print(f"📊 Calma sesión: {metrics['session']['calm_index']:.3f} (directo {direct_calm(0):.3f})")
+    print(f"📊 Calma 1 s: {metrics['1s']['calm_index']:.3f}, 10 s: {metrics['10s']['calm_index']:.3f}, "
+          f"60 s: {metrics['60s']['calm_index']:.3f}")
+    print(f"📊 Muestras por nivel: " + ", ".join(f"{tier}={metrics[tier]['samples']}" for tier in TIERS))
+
+
+if __name__ == "__main__":
+    test_rolling_windows()
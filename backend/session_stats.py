@@ -0,0 +1,235 @@
+"""
+Estadísticas de sesión con memoria acotada para Confianza al Volante
+Acumuladores por conductora para la tarjeta de fin de sesión ("tu calma
+durante toda la conducción"): histogramas de bins fijos para velocidad,
+volante y acelerador, cuantiles P² para calma y control, y conteo de
+eventos extremos. La memoria no crece con la duración de la sesión.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Canales con histograma: (mínimo, máximo, bins)
+HISTOGRAM_CHANNELS: Dict[str, Tuple[float, float, int]] = {
+    "SpeedKmh": (0.0, 350.0, 35),
+    "SteeringAngle": (-180.0, 180.0, 36),
+    "Throttle": (0.0, 1.0, 10),
+}
+# Cuantiles que se siguen para calma y control
+QUANTILES = (0.1, 0.5, 0.9)
+
+
+class FixedHistogram:
+    """Histograma de bins fijos; los valores fuera de rango van al bin extremo"""
+
+    __slots__ = ("lo", "hi", "counts", "total", "sum", "min", "max")
+
+    def __init__(self, lo: float, hi: float, bins: int):
+        self.lo = lo
+        self.hi = hi
+        self.counts = [0] * bins
+        self.total = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        bins = len(self.counts)
+        index = int((value - self.lo) / (self.hi - self.lo) * bins)
+        self.counts[min(bins - 1, max(0, index))] += 1
+        self.total += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self) -> Dict:
+        return {
+            "lo": self.lo,
+            "hi": self.hi,
+            "counts": list(self.counts),
+            "mean": self.sum / self.total if self.total else None,
+            "min": self.min if self.total else None,
+            "max": self.max if self.total else None
+        }
+
+
+class P2Quantile:
+    """
+    Estimador P² de un cuantil (Jain y Chlamtac, 1985)
+
+    Sigue el cuantil `p` de un flujo con cinco marcadores y sin guardar las
+    muestras: memoria constante y O(1) por valor.
+    """
+
+    __slots__ = ("p", "count", "heights", "positions", "desired", "increments")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # Celda k donde cae x (ajustando los extremos)
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajustar los marcadores centrales hacia su posición deseada
+        for i in range(1, 4):
+            d = self.desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        """Cuantil estimado (exacto con 5 valores o menos; None sin datos)"""
+        if not self.count:
+            return None
+        if self.count <= 5:
+            ordered = self.heights
+            return ordered[min(len(ordered) - 1, int(round(self.p * (len(ordered) - 1))))]
+        return self.heights[2]
+
+
+class MetricSketch:
+    """Media y cuantiles P² de una métrica (0-100) a lo largo de la sesión"""
+
+    __slots__ = ("count", "sum", "quantiles")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.quantiles = [P2Quantile(p) for p in QUANTILES]
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for quantile in self.quantiles:
+            quantile.add(value)
+
+    def to_dict(self) -> Dict:
+        result = {"mean": self.sum / self.count if self.count else None, "samples": self.count}
+        for quantile in self.quantiles:
+            result[f"p{int(quantile.p * 100)}"] = quantile.value()
+        return result
+
+
+class SessionStats:
+    """Acumuladores de sesión de una conductora (memoria constante)"""
+
+    def __init__(self):
+        self.frames = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self.histograms = {channel: FixedHistogram(*bounds) for channel, bounds in HISTOGRAM_CHANNELS.items()}
+        self.calm = MetricSketch()
+        self.control = MetricSketch()
+        self.events: Dict[str, int] = {}
+
+    def add_frame(self, frame: Dict) -> None:
+        """Frame de telemetría nuevo (conectado y no stale)"""
+        self.frames += 1
+        timestamp = frame.get("timestamp")
+        if timestamp is not None:
+            if self.first_timestamp is None:
+                self.first_timestamp = timestamp
+            self.last_timestamp = timestamp
+        for channel, histogram in self.histograms.items():
+            histogram.add(frame.get(channel) or 0.0)
+
+    def add_metrics(self, metrics: Dict, events: Optional[List[Dict]] = None) -> None:
+        """
+        Métricas recién calculadas (una vez por cálculo, no por lectura)
+
+        Args:
+            metrics: Métricas de la conductora
+            events: Todos los eventos notificados desde el cálculo anterior;
+                sin ellos se cuenta el evento de las métricas
+        """
+        self.calm.add(metrics.get("calm_index", 50.0))
+        self.control.add(metrics.get("control_index", 50.0))
+        if events is None:
+            self._count_event(metrics.get("art_parameters", {}).get("extreme_events", {}))
+        else:
+            for event in events:
+                self._count_event(event)
+
+    def _count_event(self, event: Dict) -> None:
+        event_type = event.get("type", "normal")
+        if event_type != "normal":
+            self.events[event_type] = self.events.get(event_type, 0) + 1
+
+    def to_dict(self) -> Dict:
+        duration = None
+        if self.first_timestamp is not None:
+            duration = self.last_timestamp - self.first_timestamp
+        return {
+            "frames": self.frames,
+            "duration_s": duration,
+            "histograms": {channel: histogram.to_dict() for channel, histogram in self.histograms.items()},
+            "calm": self.calm.to_dict(),
+            "control": self.control.to_dict(),
+            "events": dict(self.events)
+        }
+
+
+def test_session_stats():
+    """Prueba rápida: cuantiles P² frente a los exactos"""
+    import random
+
+    print("🧪 Probando SessionStats...")
+    stats = SessionStats()
+    values = []
+    for step in range(20000):
+        calm = min(100.0, max(0.0, random.gauss(70, 12)))
+        values.append(calm)
+        stats.add_frame({"SpeedKmh": random.uniform(0, 250), "SteeringAngle": random.gauss(0, 30),
+                         "Throttle": random.random(), "timestamp": step * 0.05})
+        stats.add_metrics({"calm_index": calm, "control_index": 80.0,
+                           "art_parameters": {"extreme_events": {"type": "spin" if step % 1000 == 0 else "normal"}}})
+    values.sort()
+    summary = stats.to_dict()
+    for p in QUANTILES:
+        key = f"p{int(p * 100)}"
+        print(f"📊 Calma {key}: P² {summary['calm'][key]:.2f}, exacto {values[int(p * (len(values) - 1))]:.2f}")
+    print(f"📊 Duración {summary['duration_s']:.1f}s, eventos {summary['events']}")
+
+
+if __name__ == "__main__":
+    test_session_stats()
@@ -7,176 +7,585 @@ para capturar datos de telemetría en tiempo real.
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Optional
+import random
+from typing import List, Dict, Optional, Tuple
 import json
+from urllib.parse import urlsplit
 from f1_2024_normalizer import normalize_f1_data
+from simhub_decoder import decode_game_data
+from telemetry_logging import RateLimitedLogger
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
+# El logging se configura en los puntos de entrada (main.py, main_demo.py)
 logger = logging.getLogger(__name__)
+# Mensajes por frame: límite por simulador y formateo diferido
+hot_log = RateLimitedLogger(logger)
+
+# Nombres de campo que SimHub puede usar para cada canal, por orden de preferencia
+FIELD_ALIASES = {
+    "Throttle": ("Throttle", "Gas"),
+    "Brake": ("Brake",),
+    # SteeringAngle: Assetto Corsa no lo expone directamente
+    # Usar YawChangeVelocity o OrientationYaw como alternativa
+    "SteeringAngle": ("SteeringAngle", "Steering", "YawChangeVelocity", "OrientationYaw"),
+    "SpeedKmh": ("SpeedKmh", "Speed"),
+    "Rpms": ("Rpms", "RPM", "EngineRpm"),
+    "Gear": ("Gear", "CurrentGear"),
+}
+
+
+# Orden fijo de canales en los mapas de alias resueltos
+FIELD_CHANNELS = tuple(FIELD_ALIASES)
+
+
+def resolve_field_map(game_data: Dict) -> Tuple[Optional[str], ...]:
+    """
+    Resuelve qué alias usa un simulador para cada canal
+    
+    Args:
+        game_data: Bloque NewData de SimHub
+        
+    Returns:
+        Tupla de campos de SimHub en el orden de FIELD_CHANNELS
+        (None si el juego no expone ese canal). Un alias presente con valor
+        null no cuenta: SimHub publica a veces la clave sin datos para juegos
+        que no la soportan
+    """
+    return tuple(
+        next((alias for alias in FIELD_ALIASES[channel] if game_data.get(alias) is not None), None)
+        for channel in FIELD_CHANNELS
+    )
+
+
+def _fallback_value(game_data: Dict, channel: str):
+    """Primer alias del canal con datos (el resuelto llegó null en este frame)"""
+    for alias in FIELD_ALIASES[channel]:
+        value = game_data.get(alias)
+        if value is not None:
+            return value
+    return None
+
+
+def extract_telemetry(game_data: Dict, field_map: Tuple[Optional[str], ...]) -> Dict:
+    """
+    Extrae los datos reales del juego (sin normalizar) usando un mapa de alias
+    
+    Args:
+        game_data: Bloque NewData de SimHub
+        field_map: Campos resueltos con resolve_field_map
+        
+    Returns:
+        Diccionario con SpeedKmh, Rpms, Gear, SteeringAngle, Throttle y Brake
+    """
+    throttle_field, brake_field, steering_field, speed_field, rpms_field, gear_field = field_map
+    # dict.get(None) devuelve None: un canal sin ningún alias con datos vale 0.
+    # El mapa está cacheado por juego, así que si el campo resuelto llega
+    # null se prueban los demás alias
+    get = game_data.get
+    
+    # Throttle puede venir en escala 0-100 (Assetto Corsa) o 0-1
+    throttle_value = get(throttle_field)
+    if throttle_value is None:
+        throttle_value = _fallback_value(game_data, "Throttle")
+    throttle_raw = float(throttle_value) if throttle_value is not None else 0.0
+    throttle = throttle_raw / 100.0 if throttle_raw > 1.0 else throttle_raw
+    
+    # Brake generalmente está en 0-1
+    brake_value = get(brake_field)
+    if brake_value is None:
+        brake_value = _fallback_value(game_data, "Brake")
+    brake = float(brake_value) if brake_value is not None else 0.0
+    
+    steering_value = get(steering_field)
+    if steering_value is None:
+        steering_value = _fallback_value(game_data, "SteeringAngle")
+    steering_angle = float(steering_value) if steering_value is not None else 0.0
+    
+    # Si usamos YawChangeVelocity, normalizarlo a rango más apropiado
+    if abs(steering_angle) > 180:
+        # Es OrientationYaw, normalizar a -45 a +45
+        steering_angle = (steering_angle % 360) - 180
+        steering_angle = max(-45, min(45, steering_angle / 4))
+    
+    # Extraer otros campos de manera segura
+    speed_value = get(speed_field)
+    if speed_value is None:
+        speed_value = _fallback_value(game_data, "SpeedKmh")
+    speed = float(speed_value) if speed_value is not None else 0.0
+    
+    rpms_value = get(rpms_field)
+    if rpms_value is None:
+        rpms_value = _fallback_value(game_data, "Rpms")
+    rpms = float(rpms_value) if rpms_value is not None else 0.0
+    
+    gear_value = get(gear_field)
+    if gear_value is None:
+        gear_value = _fallback_value(game_data, "Gear")
+    gear = int(float(gear_value)) if gear_value is not None else 0
+    
+    return {
+        "SpeedKmh": speed,
+        "Rpms": rpms,
+        "Gear": gear,
+        "SteeringAngle": steering_angle,
+        "Throttle": throttle,
+        "Brake": brake,
+    }
+
+
+def default_sim_frame(sim_id: str) -> Dict:
+    """Frame por defecto (desconectado) para un simulador"""
+    return {
+        "sim_id": sim_id,
+        "connected": False,
+        "SpeedKmh": 0.0,
+        "Rpms": 0.0,
+        "Gear": 0,
+        "SteeringAngle": 0.0,
+        "Throttle": 0.0,
+        "Brake": 0.0,
+        "timestamp": asyncio.get_event_loop().time()
+    }
+
+
+def build_sim_frame(sim_id: str, raw_game_data: Dict, game_running: bool,
+                    is_in_race: bool, timestamp: float) -> Dict:
+    """
+    Construye el frame que consume el procesador a partir de datos reales del juego
+    
+    Compartido por todas las fuentes de telemetría (HTTP de SimHub, UDP...)
+    para que todas produzcan exactamente la misma forma de datos.
+    
+    Args:
+        sim_id: Identificador del simulador
+        raw_game_data: Datos reales (SpeedKmh, Rpms, Gear, SteeringAngle, Throttle, Brake)
+        game_running: Si hay un juego activo
+        is_in_race: Si el juego está en carrera
+        timestamp: Marca de tiempo del frame
+        
+    Returns:
+        Frame con datos normalizados y los datos reales en "raw_game_data"
+    """
+    raw_processed_data = {
+        "sim_id": sim_id,
+        "connected": True,
+        "game_running": game_running,
+        "is_in_race": is_in_race,
+        "timestamp": timestamp,
+        **raw_game_data
+    }
+    
+    # NORMALIZAR DATOS PARA QUE EL ARTE SE VEA COMO EL DEMO
+    normalized_data = normalize_f1_data(raw_processed_data, apply_boost=True)
+    
+    # ENVIAR AMBOS: datos reales Y normalizados
+    return {
+        "sim_id": sim_id,
+        "connected": True,
+        "game_running": game_running,
+        "is_in_race": is_in_race,
+        "timestamp": timestamp,
+        # Datos normalizados (para arte y cálculo de métricas)
+        "SpeedKmh": normalized_data["SpeedKmh"],
+        "Rpms": normalized_data["Rpms"],
+        "Gear": normalized_data["Gear"],
+        "SteeringAngle": normalized_data["SteeringAngle"],
+        "Throttle": normalized_data["Throttle"],
+        "Brake": normalized_data["Brake"],
+        # Datos reales del juego (para dashboard)
+        "raw_game_data": raw_game_data
+    }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por simulador (closed / open / half_open).
+    
+    Tras varios fallos seguidos el circuito se abre y no se vuelve a
+    intentar la conexión hasta que vence el backoff (exponencial con jitter).
+    Al vencer pasa a half_open y deja pasar una única petición de prueba:
+    si tiene éxito se cierra, si falla vuelve a abrirse con el doble de espera.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 0.5,
+                 max_backoff: float = 5.0, jitter: float = 0.2):
+        """
+        Args:
+            failure_threshold: Fallos consecutivos necesarios para abrir el circuito
+            base_backoff: Espera inicial (s) antes de la primera prueba
+            max_backoff: Espera máxima (s) entre pruebas; acota lo que tarda
+                en volver un simulador recuperado
+            jitter: Variación relativa aleatoria aplicada a cada espera
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.backoff = base_backoff
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.times_opened = 0
+    
+    def allow_request(self, now: float) -> bool:
+        """Indica si se puede intentar una petición en este momento"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if now < self.open_until:
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+        # HALF_OPEN: solo una petición de prueba a la vez
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+    
+    def record_success(self) -> None:
+        """El simulador respondió: cerrar el circuito y reiniciar el backoff"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.backoff = self.base_backoff
+        self.probe_in_flight = False
+        self.last_error = None
+    
+    def record_failure(self, now: float, error: str) -> bool:
+        """
+        Registra un fallo de conexión
+        
+        Returns:
+            True si este fallo abrió el circuito
+        """
+        self.consecutive_failures += 1
+        self.last_error = error
+        self.probe_in_flight = False
+        
+        if self.state == self.HALF_OPEN:
+            # La prueba falló: reabrir con más espera
+            self.backoff = min(self.max_backoff, self.backoff * 2)
+        elif self.consecutive_failures < self.failure_threshold:
+            return False
+        
+        self.state = self.OPEN
+        self.times_opened += 1
+        delay = self.backoff * (1 + random.uniform(-self.jitter, self.jitter))
+        self.open_until = now + min(self.max_backoff, delay)
+        return True
+    
+    def to_dict(self, now: float) -> Dict:
+        """Estado serializable para /api/status"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "backoff_s": round(self.backoff, 3),
+            "retry_in_s": round(max(0.0, self.open_until - now), 3) if self.state == self.OPEN else 0.0,
+            "times_opened": self.times_opened,
+            "last_error": self.last_error
+        }
+
 
 class SimHubConnector:
     """Conector asíncrono para múltiples instancias de SimHub"""
     
-    def __init__(self, timeout: int = 5):
-        self.timeout = aiohttp.ClientTimeout(total=timeout)
+    def __init__(self, timeout: int = 5, breaker_failure_threshold: int = 3,
+                 breaker_base_backoff: float = 0.5, breaker_max_backoff: float = 5.0,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                 pool_limit: int = 100, pool_limit_per_host: int = 4,
+                 keepalive_timeout: float = 30.0, dns_cache_ttl: int = 300,
+                 max_concurrency: int = 16, stale_ttl: float = 1.0):
+        """
+        Args:
+            timeout: Tiempo máximo total por petición (s)
+            breaker_*: Configuración de los circuit breakers (ver CircuitBreaker)
+            connect_timeout: Tiempo máximo para establecer la conexión TCP (s)
+            read_timeout: Tiempo máximo de espera entre lecturas del socket (s)
+            pool_limit: Conexiones simultáneas máximas en total
+            pool_limit_per_host: Conexiones simultáneas máximas por host SimHub
+            keepalive_timeout: Segundos que una conexión ociosa se mantiene
+                abierta para reutilizarla (0 = cerrar tras cada petición)
+            dns_cache_ttl: Segundos que se cachean las resoluciones DNS
+            max_concurrency: Peticiones en vuelo como máximo entre todos los simuladores
+            stale_ttl: Segundos que se sigue sirviendo el último frame válido tras
+                un error antes de reportar el simulador como desconectado
+        """
+        # sock_connect acota solo el connect TCP; `connect` de aiohttp incluye
+        # además la espera de una conexión libre del pool, que con el límite
+        # por host es normal en un equipo sano y no debe abrir el circuito
+        # (esa espera queda acotada por `total`)
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout,
+                                             sock_read=read_timeout)
         self.session: Optional[aiohttp.ClientSession] = None
+        self.pool_settings = {
+            "limit": pool_limit,
+            "limit_per_host": pool_limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "dns_cache_ttl": dns_cache_ttl,
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout
+        }
+        self.max_concurrency = max_concurrency
+        self._fetch_semaphore: Optional[asyncio.Semaphore] = None
+        # Contadores del pool por host {host: {requests, new_connections, reused_connections}}
+        self.pool_stats: Dict[str, Dict[str, int]] = {}
+        self._url_hosts: Dict[str, str] = {}
+        # Mapa de alias resuelto por simulador {sim_id: (juego, nº de campos, field_map)}
+        self._field_maps: Dict[str, Tuple[Optional[str], int, Tuple[Optional[str], ...]]] = {}
+        # Circuit breakers por simulador {sim_id: CircuitBreaker}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._breaker_settings = {
+            "failure_threshold": breaker_failure_threshold,
+            "base_backoff": breaker_base_backoff,
+            "max_backoff": breaker_max_backoff
+        }
+        # Último frame válido por simulador, servido (stale) durante stale_ttl
+        self.stale_ttl = stale_ttl
+        self.last_good_frames: Dict[str, Dict] = {}
+        # Modo poller: último frame recibido por simulador {sim_id: data}
+        self.latest_data: Dict[str, Dict] = {}
+        # Tareas de polling independientes por simulador {sim_id: task}
+        self._poll_tasks: Dict[str, asyncio.Task] = {}
         
     async def __aenter__(self):
-        """Inicializar sesión HTTP asíncrona"""
-        self.session = aiohttp.ClientSession(timeout=self.timeout)
+        """Inicializar sesión HTTP asíncrona con pool de conexiones persistentes"""
+        settings = self.pool_settings
+        if settings["keepalive_timeout"] > 0:
+            keepalive = {"keepalive_timeout": settings["keepalive_timeout"]}
+        else:
+            keepalive = {"force_close": True}
+        tcp_connector = aiohttp.TCPConnector(
+            limit=settings["limit"],
+            limit_per_host=settings["limit_per_host"],
+            ttl_dns_cache=settings["dns_cache_ttl"],
+            **keepalive
+        )
+        
+        # Instrumentación: conexiones nuevas vs reutilizadas por host
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        
+        self.session = aiohttp.ClientSession(timeout=self.timeout, connector=tcp_connector,
+                                             trace_configs=[trace_config])
+        self._fetch_semaphore = asyncio.Semaphore(self.max_concurrency)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Cerrar sesión HTTP"""
+        await self.stop_polling()
         if self.session:
             await self.session.close()
     
+    def _host_stats(self, trace_config_ctx) -> Optional[Dict[str, int]]:
+        """Contadores del host asociado a una petición instrumentada"""
+        host = trace_config_ctx.trace_request_ctx
+        if host is None:
+            return None
+        stats = self.pool_stats.get(host)
+        if stats is None:
+            stats = {"requests": 0, "new_connections": 0, "reused_connections": 0}
+            self.pool_stats[host] = stats
+        return stats
+    
+    async def _on_request_start(self, session, trace_config_ctx, params) -> None:
+        stats = self._host_stats(trace_config_ctx)
+        if stats is not None:
+            stats["requests"] += 1
+    
+    async def _on_connection_created(self, session, trace_config_ctx, params) -> None:
+        stats = self._host_stats(trace_config_ctx)
+        if stats is not None:
+            stats["new_connections"] += 1
+    
+    async def _on_connection_reused(self, session, trace_config_ctx, params) -> None:
+        stats = self._host_stats(trace_config_ctx)
+        if stats is not None:
+            stats["reused_connections"] += 1
+    
+    def _get_host(self, url: str) -> str:
+        """host:puerto de una URL (cacheado)"""
+        host = self._url_hosts.get(url)
+        if host is None:
+            host = urlsplit(url).netloc
+            self._url_hosts[url] = host
+        return host
+    
+    def get_pool_stats(self) -> Dict:
+        """
+        Estado del pool de conexiones HTTP
+        
+        Returns:
+            Configuración del pool y contadores por host, con el ratio de
+            reutilización de conexiones
+        """
+        hosts = {}
+        for host, stats in self.pool_stats.items():
+            connections = stats["new_connections"] + stats["reused_connections"]
+            hosts[host] = {
+                **stats,
+                "reuse_ratio": round(stats["reused_connections"] / connections, 3) if connections else 0.0
+            }
+        return {"settings": self.pool_settings, "hosts": hosts}
+    
+    def _get_field_map(self, sim_id: str, game_name: Optional[str],
+                       game_data: Dict) -> Tuple[Optional[str], ...]:
+        """
+        Devuelve el mapa de alias cacheado del simulador
+        
+        El mapa solo se vuelve a resolver cuando cambia la firma del
+        documento (juego detectado y número de campos de NewData), es decir,
+        cuando el simulador cambia de juego o SimHub cambia de esquema.
+        """
+        cached = self._field_maps.get(sim_id)
+        if cached is not None and cached[0] == game_name and cached[1] == len(game_data):
+            return cached[2]
+        
+        field_map = resolve_field_map(game_data)
+        self._field_maps[sim_id] = (game_name, len(game_data), field_map)
+        resolved = {channel: field for channel, field in zip(FIELD_CHANNELS, field_map) if field}
+        logger.info(f"🗺️ {sim_id}: campos resueltos para {game_name or 'juego desconocido'}: {resolved}")
+        return field_map
+    
+    def _get_breaker(self, sim_id: str) -> CircuitBreaker:
+        """Obtiene (o crea) el circuit breaker de un simulador"""
+        breaker = self.breakers.get(sim_id)
+        if breaker is None:
+            breaker = CircuitBreaker(**self._breaker_settings)
+            self.breakers[sim_id] = breaker
+        return breaker
+    
+    def _record_failure(self, sim_id: str, url: str, error: str) -> None:
+        """Registra un fallo de red en el breaker del simulador"""
+        breaker = self._get_breaker(sim_id)
+        now = asyncio.get_event_loop().time()
+        if breaker.record_failure(now, error):
+            # Espera real (con jitter) hasta la prueba, no el backoff base
+            logger.warning(f"⛔ Circuito abierto para {sim_id} ({url}): "
+                           f"reintento en {breaker.open_until - now:.2f}s")
+    
+    def get_breaker_states(self) -> Dict[str, Dict]:
+        """
+        Estado de los circuit breakers de todos los simuladores
+        
+        Returns:
+            Diccionario {sim_id: estado del breaker}
+        """
+        now = asyncio.get_event_loop().time()
+        return {sim_id: breaker.to_dict(now) for sim_id, breaker in self.breakers.items()}
+    
     async def fetch_single_sim_data(self, sim_id: str, url: str) -> Dict:
         """
         Obtiene datos de telemetría de un solo simulador
         
+        Si la petición falla se sirve el último frame válido del simulador,
+        marcado con "stale_ms" (su antigüedad), mientras no supere stale_ttl;
+        solo después se reporta el frame desconectado por defecto.
+        
         Args:
             sim_id: Identificador del simulador (ej. "sim_1")
             url: URL de la API de SimHub
             
         Returns:
-            Diccionario con los datos del simulador o datos por defecto si hay error
-        """
-        default_data = {
-            "sim_id": sim_id,
-            "connected": False,
-            "SpeedKmh": 0.0,
-            "Rpms": 0.0,
-            "Gear": 0,
-            "SteeringAngle": 0.0,
-            "Throttle": 0.0,
-            "Brake": 0.0,
-            "timestamp": asyncio.get_event_loop().time()
-        }
+            Diccionario con los datos del simulador, el último frame válido o
+            datos por defecto si hay error
+        """
+        frame = await self._fetch_frame(sim_id, url)
+        if frame is not None:
+            self.last_good_frames[sim_id] = frame
+            return frame
+        
+        last_good = self.last_good_frames.get(sim_id)
+        if last_good is not None:
+            age = asyncio.get_event_loop().time() - last_good["timestamp"]
+            if age <= self.stale_ttl:
+                return {**last_good, "stale_ms": int(age * 1000)}
+        return default_sim_frame(sim_id)
+    
+    async def _fetch_frame(self, sim_id: str, url: str) -> Optional[Dict]:
+        """
+        Hace la petición a SimHub y construye el frame
+        
+        Returns:
+            Frame del simulador o None si el circuito está abierto o hubo error
+        """
+        # Circuito abierto: no gastar un socket en un simulador apagado
+        breaker = self._get_breaker(sim_id)
+        if not breaker.allow_request(asyncio.get_event_loop().time()):
+            return None
         
         try:
             if not self.session:
                 logger.error(f"Sesión no inicializada para {sim_id}")
-                return default_data
+                breaker.probe_in_flight = False
+                return None
                 
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    raw_data = await response.json()
-                    
-                    # Verificar que raw_data sea válido
-                    if not raw_data or not isinstance(raw_data, dict):
-                        logger.warning(f"Datos inválidos recibidos de {sim_id}")
-                        return default_data
-                    
-                    # SimHub /api/getgamedata puede contener datos en "NewData" cuando hay juego activo
-                    # o directamente en el root si está configurado así
-                    game_data = raw_data.get("NewData")
-                    if not game_data or not isinstance(game_data, dict):
-                        # Si NewData no existe o no es dict, usar raw_data directamente
-                        game_data = raw_data
-                    
-                    # Verificar si hay juego activo
-                    game_running = raw_data.get("GameRunning", False)
-                    is_in_race = raw_data.get("IsGameInRace", False)
-                    
-                    # Extraer y validar los datos necesarios
-                    # Intentar diferentes nombres de campos que SimHub puede usar
-                    
-                    # Throttle puede venir en escala 0-100 (Assetto Corsa) o 0-1
-                    throttle_value = game_data.get("Throttle") or game_data.get("Gas") or 0
-                    throttle_raw = float(throttle_value) if throttle_value is not None else 0.0
-                    throttle = throttle_raw / 100.0 if throttle_raw > 1.0 else throttle_raw
-                    
-                    # Brake generalmente está en 0-1
-                    brake_value = game_data.get("Brake") or 0
-                    brake = float(brake_value) if brake_value is not None else 0.0
-                    
-                    # SteeringAngle: Assetto Corsa no lo expone directamente
-                    # Usar YawChangeVelocity o OrientationYaw como alternativa
-                    steering_value = (
-                        game_data.get("SteeringAngle") or 
-                        game_data.get("Steering") or
-                        game_data.get("YawChangeVelocity") or
-                        game_data.get("OrientationYaw") or 
-                        0
-                    )
-                    steering_angle = float(steering_value) if steering_value is not None else 0.0
-                    
-                    # Si usamos YawChangeVelocity, normalizarlo a rango más apropiado
-                    if abs(steering_angle) > 180:
-                        # Es OrientationYaw, normalizar a -45 a +45
-                        steering_angle = (steering_angle % 360) - 180
-                        steering_angle = max(-45, min(45, steering_angle / 4))
-                    
-                    # Extraer otros campos de manera segura
-                    speed_value = game_data.get("SpeedKmh") or game_data.get("Speed") or 0
-                    speed = float(speed_value) if speed_value is not None else 0.0
-                    
-                    rpms_value = game_data.get("Rpms") or game_data.get("RPM") or game_data.get("EngineRpm") or 0
-                    rpms = float(rpms_value) if rpms_value is not None else 0.0
+            async with self._fetch_semaphore:
+                async with self.session.get(url, trace_request_ctx=self._get_host(url)) as response:
+                    if response.status == 200:
+                        if breaker.state != CircuitBreaker.CLOSED:
+                            logger.info(f"🔌 {sim_id} recuperado, circuito cerrado")
+                        breaker.record_success()
+                        # Leer bytes crudos y proyectar solo los campos necesarios
+                        raw_data = decode_game_data(await response.read())
                     
-                    gear_value = game_data.get("Gear") or game_data.get("CurrentGear") or 0
-                    gear = int(float(gear_value)) if gear_value is not None else 0
+                        # Verificar que raw_data sea válido
+                        if not raw_data or not isinstance(raw_data, dict):
+                            hot_log.warning(("invalid", sim_id), "Datos inválidos recibidos de %s", sim_id)
+                            return None
                     
-                    # DATOS REALES DEL JUEGO (sin normalizar)
-                    raw_game_data = {
-                        "SpeedKmh": speed,
-                        "Rpms": rpms,
-                        "Gear": gear,
-                        "SteeringAngle": steering_angle,
-                        "Throttle": throttle,
-                        "Brake": brake,
-                    }
+                        # SimHub /api/getgamedata puede contener datos en "NewData" cuando hay juego activo
+                        # o directamente en el root si está configurado así
+                        game_data = raw_data.get("NewData")
+                        if not game_data or not isinstance(game_data, dict):
+                            # Si NewData no existe o no es dict, usar raw_data directamente
+                            game_data = raw_data
                     
-                    raw_processed_data = {
-                        "sim_id": sim_id,
-                        "connected": True,
-                        "game_running": game_running,
-                        "is_in_race": is_in_race,
-                        "timestamp": asyncio.get_event_loop().time(),
-                        **raw_game_data
-                    }
+                        # Verificar si hay juego activo
+                        game_running = raw_data.get("GameRunning", False)
+                        is_in_race = raw_data.get("IsGameInRace", False)
                     
-                    # NORMALIZAR DATOS PARA QUE EL ARTE SE VEA COMO EL DEMO
-                    normalized_data = normalize_f1_data(raw_processed_data, apply_boost=True)
+                        # Extraer y validar los datos necesarios usando el mapa de
+                        # alias resuelto (y cacheado) para este simulador
+                        field_map = self._get_field_map(sim_id, raw_data.get("GameName"), game_data)
+                        raw_game_data = extract_telemetry(game_data, field_map)
                     
-                    # ENVIAR AMBOS: datos reales Y normalizados
-                    processed_data = {
-                        "sim_id": sim_id,
-                        "connected": True,
-                        "game_running": game_running,
-                        "is_in_race": is_in_race,
-                        "timestamp": raw_processed_data["timestamp"],
-                        # Datos normalizados (para arte y cálculo de métricas)
-                        "SpeedKmh": normalized_data["SpeedKmh"],
-                        "Rpms": normalized_data["Rpms"],
-                        "Gear": normalized_data["Gear"],
-                        "SteeringAngle": normalized_data["SteeringAngle"],
-                        "Throttle": normalized_data["Throttle"],
-                        "Brake": normalized_data["Brake"],
-                        # Datos reales del juego (para dashboard)
-                        "raw_game_data": raw_game_data
-                    }
+                        processed_data = build_sim_frame(
+                            sim_id, raw_game_data, game_running, is_in_race,
+                            asyncio.get_event_loop().time()
+                        )
                     
-                    logger.info(f"✅ {sim_id}: Real({raw_game_data['SpeedKmh']:.0f}km/h, {raw_game_data['Rpms']:.0f}rpm) → Norm({normalized_data['SpeedKmh']:.0f}km/h, {normalized_data['Rpms']:.0f}rpm)")
-                    return processed_data
-                else:
-                    logger.warning(f"Error HTTP {response.status} en {sim_id} ({url})")
-                    return default_data
+                        hot_log.info(("frame", sim_id), "✅ %s: Real(%.0fkm/h, %.0frpm) → Norm(%.0fkm/h, %.0frpm)",
+                                     sim_id, raw_game_data["SpeedKmh"], raw_game_data["Rpms"],
+                                     processed_data["SpeedKmh"], processed_data["Rpms"])
+                        return processed_data
+                    else:
+                        hot_log.warning(("http", sim_id), "Error HTTP %s en %s (%s)", response.status, sim_id, url)
+                        self._record_failure(sim_id, url, f"HTTP {response.status}")
+                        return None
                     
         except asyncio.TimeoutError:
-            logger.warning(f"Timeout en {sim_id} ({url})")
-            return default_data
+            hot_log.warning(("timeout", sim_id), "Timeout en %s (%s)", sim_id, url)
+            self._record_failure(sim_id, url, "timeout")
+            return None
         except aiohttp.ClientError as e:
-            logger.warning(f"Error de cliente en {sim_id} ({url}): {e}")
-            return default_data
+            hot_log.warning(("client", sim_id), "Error de cliente en %s (%s): %s", sim_id, url, e)
+            self._record_failure(sim_id, url, str(e) or type(e).__name__)
+            return None
         except json.JSONDecodeError as e:
-            logger.warning(f"Error JSON en {sim_id} ({url}): {e}")
-            return default_data
+            hot_log.warning(("json", sim_id), "Error JSON en %s (%s): %s", sim_id, url, e)
+            breaker.probe_in_flight = False
+            return None
         except Exception as e:
-            logger.error(f"Error inesperado en {sim_id} ({url}): {e}")
-            return default_data
+            hot_log.error(("unexpected", sim_id), "Error inesperado en %s (%s): %s", sim_id, url, e)
+            breaker.probe_in_flight = False
+            return None
     
     async def fetch_all_sim_data(self, sim_urls: Dict[str, str]) -> Dict[str, Dict]:
         """
@@ -206,19 +615,68 @@ class SimHubConnector:
             all_data = {}
             for result in results:
                 if isinstance(result, Exception):
-                    logger.error(f"Excepción en tarea paralela: {result}")
+                    hot_log.error("gather_task", "Excepción en tarea paralela: %s", result)
                     continue
                     
                 sim_id = result.get("sim_id")
                 if sim_id:
                     all_data[sim_id] = result
                     
-            logger.info(f"Datos obtenidos de {len(all_data)} simuladores")
+            hot_log.info("gather", "Datos obtenidos de %d simuladores", len(all_data))
             return all_data
             
         except Exception as e:
             logger.error(f"Error en fetch_all_sim_data: {e}")
             return {}
+    
+    def start_polling(self, sim_urls: Dict[str, str], interval: float) -> None:
+        """
+        Inicia una tarea de polling independiente por simulador (modo poller).
+        
+        Cada tarea escribe su último frame en `latest_data`, de modo que un
+        simulador lento o apagado nunca bloquea a los demás.
+        
+        Args:
+            sim_urls: Diccionario {sim_id: url} para cada simulador
+            interval: Intervalo objetivo entre peticiones de cada simulador (s)
+        """
+        for sim_id, url in sim_urls.items():
+            if sim_id in self._poll_tasks:
+                continue
+            # Slot inicial desconectado hasta recibir el primer frame
+            self.latest_data.setdefault(sim_id, default_sim_frame(sim_id))
+            self._poll_tasks[sim_id] = asyncio.create_task(
+                self._poll_loop(sim_id, url, interval),
+                name=f"simhub-poll-{sim_id}"
+            )
+        logger.info(f"🔁 Polling independiente iniciado para {len(self._poll_tasks)} simuladores")
+    
+    async def _poll_loop(self, sim_id: str, url: str, interval: float) -> None:
+        """Bucle de polling de larga vida para un solo simulador"""
+        loop = asyncio.get_event_loop()
+        while True:
+            started = loop.time()
+            self.latest_data[sim_id] = await self.fetch_single_sim_data(sim_id, url)
+            # Mantener la cadencia: descontar lo que tardó la petición
+            await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+    
+    def get_latest_data(self) -> Dict[str, Dict]:
+        """
+        Obtiene el último frame disponible de cada simulador (modo poller)
+        
+        Returns:
+            Diccionario {sim_id: data} con el contenido actual de cada slot
+        """
+        return dict(self.latest_data)
+    
+    async def stop_polling(self) -> None:
+        """Cancela todas las tareas de polling activas"""
+        tasks = list(self._poll_tasks.values())
+        self._poll_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
 
 # Configuración por defecto para desarrollo/testing
@@ -246,4 +704,5 @@ async def test_connector():
 
 if __name__ == "__main__":
     # Ejecutar prueba
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_connector())
@@ -0,0 +1,75 @@
+"""
+Decodificador rápido de SimHub para Confianza al Volante
+Lee los bytes crudos de /api/getgamedata y se queda solo con los campos
+que el conector necesita, en lugar de conservar el documento completo.
+"""
+
+import json
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Backend JSON opcional más rápido (orjson); si no está instalado se usa json
+try:
+    import orjson
+    _json_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depende del entorno
+    _json_loads = json.loads
+    JSON_BACKEND = "json"
+
+# Campos de NewData que usa el conector (incluye todos los alias conocidos)
+GAME_DATA_FIELDS = (
+    "Throttle", "Gas",
+    "Brake",
+    "SteeringAngle", "Steering", "YawChangeVelocity", "OrientationYaw",
+    "SpeedKmh", "Speed",
+    "Rpms", "RPM", "EngineRpm",
+    "Gear", "CurrentGear",
+)
+
+# Campos de la raíz del documento
+ROOT_FIELDS = ("GameRunning", "IsGameInRace", "GameName")
+
+
+def project_game_data(document: Dict) -> Dict:
+    """
+    Proyecta un documento de SimHub a los campos que consume el conector
+
+    Args:
+        document: Documento completo de /api/getgamedata ya parseado
+
+    Returns:
+        Documento reducido {GameRunning, IsGameInRace, GameName, NewData}
+        donde NewData solo contiene los campos de GAME_DATA_FIELDS presentes
+    """
+    # SimHub pone los datos en "NewData" con juego activo, o en la raíz
+    source = document.get("NewData")
+    if not source or not isinstance(source, dict):
+        source = document
+
+    projected = {field: source[field] for field in GAME_DATA_FIELDS if field in source}
+    result = {field: document[field] for field in ROOT_FIELDS if field in document}
+    result["NewData"] = projected
+    return result
+
+
+def decode_game_data(raw: bytes) -> Optional[Dict]:
+    """
+    Decodifica los bytes de /api/getgamedata y proyecta los campos necesarios
+
+    Args:
+        raw: Cuerpo HTTP sin decodificar
+
+    Returns:
+        Documento proyectado, o None si el JSON no es un objeto
+
+    Raises:
+        json.JSONDecodeError: Si el cuerpo no es JSON válido
+            (orjson.JSONDecodeError hereda de esta clase)
+    """
+    document = _json_loads(raw)
+    if not document or not isinstance(document, dict):
+        return None
+    return project_game_data(document)
@@ -0,0 +1,100 @@
+"""
+Suavidad espectral del volante para Confianza al Volante
+El índice de calma mira la desviación de las primeras diferencias y no
+distingue un eslalon amplio y suave de un temblor de manos de alta
+frecuencia. Aquí se mide la fracción de energía del espectro del volante
+por encima de una frecuencia de corte, para todas las conductoras a la
+vez (FFT por lotes con NumPy; DFT en Python puro si no está instalado).
+
+La DFT directa es O(n²) por ventana: sirve para la analítica fuera del
+event loop y para pruebas, pero DriverPerformanceProcessor no la ejecuta
+en el tick (sin NumPy deja la suavidad en el valor neutro).
+"""
+
+import cmath
+import math
+from typing import List, Sequence
+
+# NumPy es opcional: sin él se usa la DFT directa por conductora
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+    HAS_NUMPY = False
+
+# Frecuencia de muestreo de los frames (20 Hz = intervalo de 50 ms)
+DEFAULT_SAMPLE_RATE = 20.0
+# Por encima de esta frecuencia la energía cuenta como temblor (Hz)
+DEFAULT_CUTOFF_HZ = 3.0
+# Muestras mínimas para que el espectro tenga resolución útil
+MIN_SAMPLES = 16
+
+
+def spectral_smoothness(steering: Sequence[float], sample_rate: float = DEFAULT_SAMPLE_RATE,
+                        cutoff_hz: float = DEFAULT_CUTOFF_HZ) -> float:
+    """
+    Suavidad (0-100) de una ventana de volante: 100 = nada de energía por
+    encima del corte, 0 = toda. DFT directa en Python (ventanas cortas)
+    """
+    n = len(steering)
+    if n < 4:
+        return 50.0
+    mean = sum(steering) / n
+    centered = [x - mean for x in steering]
+    low = high = 0.0
+    # Solo frecuencias positivas sin la componente continua
+    for k in range(1, n // 2 + 1):
+        angle = -2j * math.pi * k / n
+        energy = abs(sum(x * cmath.exp(angle * t) for t, x in enumerate(centered))) ** 2
+        if k * sample_rate / n > cutoff_hz:
+            high += energy
+        else:
+            low += energy
+    total = low + high
+    return 100.0 if total == 0 else 100.0 * low / total
+
+
+def spectral_smoothness_batch(windows, sample_rate: float = DEFAULT_SAMPLE_RATE,
+                              cutoff_hz: float = DEFAULT_CUTOFF_HZ) -> List[float]:
+    """
+    Suavidad de varias ventanas de la misma longitud en una sola pasada
+
+    Args:
+        windows: Matriz (conductoras × muestras) o lista de ventanas
+        sample_rate: Frecuencia de muestreo en Hz
+        cutoff_hz: Frecuencia de corte del temblor en Hz
+
+    Returns:
+        Una suavidad (0-100) por ventana, en el mismo orden
+    """
+    if not HAS_NUMPY:
+        return [spectral_smoothness(window, sample_rate, cutoff_hz) for window in windows]
+    data = np.asarray(windows, dtype=np.float64)
+    if data.ndim != 2 or data.shape[0] == 0:
+        return []
+    if data.shape[1] < 4:
+        return [50.0] * data.shape[0]
+
+    data = data - data.mean(axis=1, keepdims=True)
+    power = np.abs(np.fft.rfft(data, axis=1)[:, 1:]) ** 2
+    freqs = np.fft.rfftfreq(data.shape[1], d=1.0 / sample_rate)[1:]
+    high = power[:, freqs > cutoff_hz].sum(axis=1)
+    total = power.sum(axis=1)
+    smoothness = np.where(total > 0, 100.0 * (1.0 - high / np.where(total > 0, total, 1.0)), 100.0)
+    return smoothness.tolist()
+
+
+def test_spectral():
+    """Prueba rápida: eslalon amplio frente a temblor de manos"""
+    print("🧪 Probando suavidad espectral...")
+    n = 64
+    slalom = [60 * math.sin(2 * math.pi * 0.5 * t / DEFAULT_SAMPLE_RATE) for t in range(n)]
+    tremor = [5 * math.sin(2 * math.pi * 8 * t / DEFAULT_SAMPLE_RATE) for t in range(n)]
+    batch = spectral_smoothness_batch([slalom, tremor])
+    direct = [spectral_smoothness(slalom), spectral_smoothness(tremor)]
+    print(f"📊 Eslalon: {batch[0]:.1f} (directo {direct[0]:.1f}), temblor: {batch[1]:.1f} (directo {direct[1]:.1f})")
+
+
+if __name__ == "__main__":
+    test_spectral()
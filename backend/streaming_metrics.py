@@ -0,0 +1,464 @@
+"""
+Métricas en streaming para Confianza al Volante
+Motores incrementales que actualizan las métricas de cada conductora con
+un coste constante por frame: cada muestra nueva se suma y la que sale de
+la ventana se resta, en lugar de recorrer todo el historial.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+# Valores típicos de desviación estándar de la derivada del volante: 0-20 grados
+MAX_STD_EXPECTED = 15.0
+
+# Tipos de evento extremo en orden de prioridad (código = posición + 1; 0 = normal)
+EVENT_TYPES = ("spin", "crash", "emergency_brake", "correction", "erratic")
+# Evento sin nada que pintar; se comparte entre frames, no debe modificarse
+NORMAL_EVENT = {"type": "normal", "intensity": 0.0}
+# Un evento se notifica cuando lleva DEBOUNCE frames seguidos detectándose,
+# y el mismo tipo no vuelve a notificarse hasta pasados COOLDOWN frames
+DEFAULT_EVENT_DEBOUNCE = 1
+DEFAULT_EVENT_COOLDOWN = 10
+
+
+def strongest_event(events) -> Dict:
+    """Evento de mayor prioridad (orden de EVENT_TYPES) o NORMAL_EVENT si no hay"""
+    if not events:
+        return NORMAL_EVENT
+    return min(events, key=lambda event: EVENT_TYPES.index(event["type"]))
+
+
+class RollingCalm:
+    """
+    Índice de calma incremental (Welford con ventana deslizante)
+
+    Mantiene la media y la suma de cuadrados (M2) de la derivada absoluta del
+    volante sobre las últimas `history_size` muestras, es decir, las
+    `history_size - 1` derivadas entre muestras consecutivas. Equivale a
+    calcular `statistics.stdev` sobre esas derivadas en cada frame.
+    """
+
+    # Cada cuántas expulsiones se recalculan media y M2 desde cero para que
+    # el error de redondeo de las restas no se acumule
+    RESYNC_EVERY = 10_000
+
+    def __init__(self, history_size: int = 50, max_std_expected: float = MAX_STD_EXPECTED):
+        self.max_std_expected = max_std_expected
+        self.derivatives: deque = deque(maxlen=max(1, history_size - 1))
+        self.last_steering: Optional[float] = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._evictions = 0
+
+    def push(self, steering_angle: float) -> None:
+        """Añade una muestra del volante (y expulsa la más antigua si hace falta)"""
+        previous = self.last_steering
+        self.last_steering = steering_angle
+        if previous is None:
+            return
+
+        derivative = abs(steering_angle - previous)
+        derivatives = self.derivatives
+        if len(derivatives) == derivatives.maxlen:
+            self._remove(derivatives[0])
+        derivatives.append(derivative)
+        self._add(derivative)
+
+    def _add(self, x: float) -> None:
+        n = len(self.derivatives)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        n = len(self.derivatives) - 1
+        if n == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / n
+        self.m2 -= delta * (x - self.mean)
+
+        self._evictions += 1
+        if self._evictions >= self.RESYNC_EVERY:
+            self._evictions = 0
+            self._resync(n)
+
+    def _resync(self, n: int) -> None:
+        """Recalcula media y M2 exactos sin la derivada que se está expulsando ([0])"""
+        window = list(self.derivatives)[1:]
+        self.mean = math.fsum(window) / n
+        self.m2 = math.fsum((x - self.mean) ** 2 for x in window)
+
+    def stdev(self) -> Optional[float]:
+        """Desviación estándar muestral de las derivadas (None con menos de 2)"""
+        n = len(self.derivatives)
+        if n < 2:
+            return None
+        return math.sqrt(max(0.0, self.m2) / (n - 1))
+
+    def calm_index(self) -> float:
+        """Índice de calma (0-100): desviación baja = alta calma"""
+        std_dev = self.stdev()
+        if std_dev is None:
+            return 50.0
+        calm_index = max(0, 100 - (std_dev / self.max_std_expected * 100))
+        return min(100.0, max(0.0, calm_index))
+
+
+
+class RollingControl:
+    """
+    Índice de control incremental (contador de inputs erráticos)
+
+    Por cada muestra guarda dos marcas: uso simultáneo de acelerador y freno
+    (> 0.1) y cambio brusco (> 0.3) respecto a la muestra anterior. Las sumas
+    de ambas marcas sobre la ventana se actualizan al entrar y salir cada
+    muestra. Como el cálculo original solo compara pares dentro de la
+    ventana, la marca de cambio brusco de la muestra más antigua no cuenta.
+    """
+
+    OVERLAP_THRESHOLD = 0.1
+    JERK_THRESHOLD = 0.3
+
+    def __init__(self, history_size: int = 50):
+        self.flags: deque = deque(maxlen=max(1, history_size))
+        self.last_inputs: Optional[tuple] = None
+        self.overlaps = 0
+        self.jerks = 0
+
+    def push(self, throttle: float, brake: float) -> None:
+        """Añade una muestra de acelerador/freno (y expulsa la más antigua si hace falta)"""
+        overlap = 1 if throttle > self.OVERLAP_THRESHOLD and brake > self.OVERLAP_THRESHOLD else 0
+        jerk = 0
+        if self.last_inputs is not None:
+            prev_throttle, prev_brake = self.last_inputs
+            if (abs(throttle - prev_throttle) > self.JERK_THRESHOLD or
+                    abs(brake - prev_brake) > self.JERK_THRESHOLD):
+                jerk = 1
+        self.last_inputs = (throttle, brake)
+
+        flags = self.flags
+        if len(flags) == flags.maxlen:
+            old_overlap, old_jerk = flags[0]
+            self.overlaps -= old_overlap
+            self.jerks -= old_jerk
+        flags.append((overlap, jerk))
+        self.overlaps += overlap
+        self.jerks += jerk
+
+    def jerky_inputs(self) -> int:
+        """Inputs erráticos en la ventana actual"""
+        if not self.flags:
+            return 0
+        return self.overlaps + self.jerks - self.flags[0][1]
+
+    def control_index(self) -> float:
+        """Índice de control (0-100): menos errático = más control"""
+        total_inputs = len(self.flags)
+        jerky_percentage = self.jerky_inputs() / total_inputs if total_inputs > 0 else 0
+        control_index = max(0, 100 - (jerky_percentage * 100))
+        return min(100.0, max(0.0, control_index))
+
+
+class ExtremeEventDetector:
+    """
+    Detector de eventos extremos en streaming (máquina de estados)
+
+    Guarda solo lo que usan las reglas: los 5 últimos ángulos de volante en
+    un anillo fijo, la velocidad anterior y el freno actual. detect() aplica
+    las mismas reglas y prioridad que el detector original (trompo, choque,
+    frenada de emergencia, contravolante, errático) sin copiar el historial.
+
+    Además filtra la salida: un evento solo se notifica al cumplir
+    `debounce_frames` detecciones seguidas del mismo tipo, una sola vez
+    mientras dure, y ese tipo queda silenciado `cooldown_frames` frames
+    desde la notificación. Así un trompo de diez frames se pinta una vez.
+    """
+
+    STEERING_WINDOW = 5
+
+    def __init__(self, debounce_frames: int = DEFAULT_EVENT_DEBOUNCE,
+                 cooldown_frames: int = DEFAULT_EVENT_COOLDOWN):
+        self.debounce_frames = max(1, debounce_frames)
+        self.cooldown_frames = max(0, cooldown_frames)
+        self._steering = [0.0] * self.STEERING_WINDOW
+        self._head = 0
+        self.count = 0
+        self.speed = 0.0
+        self.prev_speed = 0.0
+        self.brake = 0.0
+        # Estado del filtro: tipo detectado en el último frame, cuántos
+        # frames seguidos lleva y frame a partir del cual cada tipo puede
+        # volver a notificarse
+        self.frame = 0
+        self.active = 0
+        self.streak = 0
+        self._ready_at = [0] * len(EVENT_TYPES)
+
+    def push(self, steering_angle: float, speed: float, brake: float) -> None:
+        """Añade una muestra (sobrescribe la posición más antigua del anillo)"""
+        self._steering[self._head] = steering_angle
+        self._head = (self._head + 1) % self.STEERING_WINDOW
+        self.count += 1
+        self.prev_speed = self.speed
+        self.speed = speed
+        self.brake = brake
+
+    def _steering_ago(self, age: int) -> float:
+        return self._steering[(self._head - 1 - age) % self.STEERING_WINDOW]
+
+    def _steering_stdev(self) -> float:
+        """Desviación estándar muestral de los 5 últimos ángulos"""
+        steering = self._steering
+        mean = (steering[0] + steering[1] + steering[2] + steering[3] + steering[4]) / 5
+        variance = ((steering[0] - mean) ** 2 + (steering[1] - mean) ** 2 + (steering[2] - mean) ** 2 +
+                    (steering[3] - mean) ** 2 + (steering[4] - mean) ** 2) / 4
+        return math.sqrt(variance)
+
+    def detect(self) -> Dict:
+        """Evento del frame actual tras debounce y cooldown (NORMAL_EVENT si no hay)"""
+        self.frame += 1
+        if self.count < 3:
+            self.active = self.streak = 0
+            return NORMAL_EVENT
+
+        current_speed = self.speed
+        prev_speed = self.prev_speed
+        current_brake = self.brake
+        current_steering = self._steering_ago(0)
+        prev_steering = self._steering_ago(1)
+        steering_3ago = self._steering_ago(2)
+
+        # Reglas en orden de prioridad: el primer tipo que se cumple gana
+        steering_change = abs(current_steering - prev_steering)
+        speed_drop = prev_speed - current_speed
+        total_steering_change = abs(current_steering - steering_3ago)
+        steering_std = 0.0
+        if abs(current_steering) > 90 and current_speed > 50 and steering_change > 30:
+            code = 1
+        elif prev_speed > 80 and speed_drop > 60 and current_brake > 0.8:
+            code = 2
+        elif current_brake > 0.9 and current_speed > 40:
+            code = 3
+        elif (((prev_steering * current_steering < 0) or (steering_3ago * prev_steering < 0)) and
+              total_steering_change > 60 and current_speed > 30):
+            code = 4
+        elif self.count >= 5 and current_speed > 20:
+            steering_std = self._steering_stdev()
+            code = 5 if steering_std > 25 else 0
+        else:
+            code = 0
+
+        if not self._should_report(code):
+            return NORMAL_EVENT
+
+        if code == 1:
+            return {
+                "type": "spin",
+                "intensity": min(1.0, (abs(current_steering) / 180) + (steering_change / 90)),
+                "direction": "left" if current_steering < 0 else "right",
+                "speed": current_speed
+            }
+        if code == 2:
+            return {
+                "type": "crash",
+                "intensity": min(1.0, speed_drop / 120),
+                "impact_speed": prev_speed,
+                "brake_force": current_brake
+            }
+        if code == 3:
+            return {
+                "type": "emergency_brake",
+                "intensity": current_brake * (current_speed / 100),
+                "speed": current_speed
+            }
+        if code == 4:
+            return {
+                "type": "correction",
+                "intensity": min(1.0, total_steering_change / 120),
+                "severity": "violent" if total_steering_change > 90 else "sharp"
+            }
+        return {
+            "type": "erratic",
+            "intensity": min(1.0, steering_std / 50),
+            "chaos_level": steering_std
+        }
+
+    def _should_report(self, code: int) -> bool:
+        """Avanza el filtro debounce/cooldown con el tipo detectado en este frame"""
+        if code == 0:
+            self.active = self.streak = 0
+            return False
+        self.streak = self.streak + 1 if code == self.active else 1
+        self.active = code
+        if self.streak != self.debounce_frames or self.frame < self._ready_at[code - 1]:
+            return False
+        self._ready_at[code - 1] = self.frame + self.cooldown_frames
+        return True
+
+
+class GroupSummary:
+    """
+    Estadísticas de grupo incrementales (agregador de conductoras)
+
+    Guarda la última contribución de cada simulador (conectado, calma,
+    control) y, para las conductoras conectadas, la media y M2 de la calma
+    (Welford) y la suma del control. Cambiar las métricas de un simulador
+    resta su contribución anterior y suma la nueva: O(1) por actualización,
+    sin recorrer el grupo para cada resumen.
+    """
+
+    # Cada cuántas actualizaciones se recalculan las sumas desde cero (O(n))
+    RESYNC_EVERY = 10_000
+
+    def __init__(self):
+        # {sim_id: (conectado, calma, control)}
+        self.members: Dict[str, Tuple[bool, float, float]] = {}
+        self.connected = 0
+        self.calm_mean = 0.0
+        self.calm_m2 = 0.0
+        self.control_sum = 0.0
+        # Actualizaciones desde el último recálculo exacto
+        self._updates = 0
+
+    def update(self, sim_id: str, connected: bool, calm: float, control: float) -> None:
+        """Sustituye la contribución del simulador por sus métricas actuales"""
+        previous = self.members.get(sim_id)
+        self.members[sim_id] = (connected, calm, control)
+        if previous is not None and previous[0]:
+            self._remove(previous[1], previous[2])
+        if connected:
+            self._add(calm, control)
+
+        self._updates += 1
+        if self._updates >= self.RESYNC_EVERY:
+            self._updates = 0
+            self._resync()
+
+    def _add(self, calm: float, control: float) -> None:
+        self.connected += 1
+        delta = calm - self.calm_mean
+        self.calm_mean += delta / self.connected
+        self.calm_m2 += delta * (calm - self.calm_mean)
+        self.control_sum += control
+
+    def _remove(self, calm: float, control: float) -> None:
+        self.connected -= 1
+        if self.connected == 0:
+            self.calm_mean = self.calm_m2 = self.control_sum = 0.0
+            return
+        delta = calm - self.calm_mean
+        self.calm_mean -= delta / self.connected
+        self.calm_m2 -= delta * (calm - self.calm_mean)
+        self.control_sum -= control
+
+    def _resync(self) -> None:
+        """Recalcula media, M2 y suma exactas para que no se acumule error de redondeo"""
+        connected = [member for member in self.members.values() if member[0]]
+        self.connected = len(connected)
+        if not connected:
+            self.calm_mean = self.calm_m2 = self.control_sum = 0.0
+            return
+        self.calm_mean = math.fsum(member[1] for member in connected) / len(connected)
+        self.calm_m2 = math.fsum((member[1] - self.calm_mean) ** 2 for member in connected)
+        self.control_sum = math.fsum(member[2] for member in connected)
+
+    def summary(self) -> Dict:
+        """Resumen de grupo con el mismo formato que get_summary_stats"""
+        n = self.connected
+        group_calm = self.calm_mean if n else 50
+        group_control = self.control_sum / n if n else 50
+        return {
+            "connected_drivers": n,
+            "total_drivers": len(self.members),
+            "group_calm_avg": group_calm,
+            "group_control_avg": group_control,
+            "group_calm_harmony": 100 - math.sqrt(max(0.0, self.calm_m2) / (n - 1)) if n > 1 else 50,
+            "collective_strength": (group_calm + group_control) / 2
+        }
+
+
+def test_rolling_calm():
+    """Prueba rápida contra el cálculo completo con statistics.stdev"""
+    import random
+    import statistics
+
+    print("🧪 Probando RollingCalm...")
+    history_size = 50
+    engine = RollingCalm(history_size)
+    window = deque(maxlen=history_size)
+    max_error = 0.0
+    for _ in range(5000):
+        angle = random.gauss(0, 10)
+        engine.push(angle)
+        window.append(angle)
+        if len(window) > 2:
+            samples = list(window)
+            derivatives = [abs(samples[i] - samples[i - 1]) for i in range(1, len(samples))]
+            max_error = max(max_error, abs(engine.stdev() - statistics.stdev(derivatives)))
+    print(f"📊 Error máximo frente a statistics.stdev: {max_error:.2e}")
+
+
+
+def test_rolling_control():
+    """Prueba rápida contra el recorrido completo de la ventana"""
+    import random
+
+    print("🧪 Probando RollingControl...")
+    history_size = 50
+    engine = RollingControl(history_size)
+    window = deque(maxlen=history_size)
+    mismatches = 0
+    for _ in range(5000):
+        sample = (random.choice((0.0, random.random())), random.choice((0.0, random.random())))
+        engine.push(*sample)
+        window.append(sample)
+        samples = list(window)
+        jerky = sum(1 for t, b in samples if t > 0.1 and b > 0.1)
+        jerky += sum(1 for i in range(1, len(samples))
+                     if abs(samples[i][0] - samples[i - 1][0]) > 0.3 or
+                     abs(samples[i][1] - samples[i - 1][1]) > 0.3)
+        mismatches += jerky != engine.jerky_inputs()
+    print(f"📊 Ventanas con conteo distinto al recorrido completo: {mismatches}")
+
+
+def test_extreme_event_detector():
+    """Prueba rápida: un trompo de diez frames se notifica una sola vez"""
+    print("🧪 Probando ExtremeEventDetector...")
+    detector = ExtremeEventDetector(debounce_frames=1, cooldown_frames=10)
+    reported = []
+    for step in range(30):
+        spinning = 10 <= step < 20
+        steering = (120 if step % 2 else -120) if spinning else 0.0
+        detector.push(steering, 90.0, 0.0)
+        reported.append(detector.detect()["type"])
+    spins = sum(1 for event in reported if event == "spin")
+    print(f"📊 Frames en trompo: 10, trompos notificados: {spins}")
+
+
+def test_group_summary():
+    """Prueba rápida contra statistics sobre las contribuciones actuales"""
+    import random
+    import statistics
+
+    print("🧪 Probando GroupSummary...")
+    group = GroupSummary()
+    max_error = 0.0
+    for _ in range(20000):
+        sim_id = f"sim_{random.randint(1, 50)}"
+        group.update(sim_id, random.random() < 0.8, random.uniform(0, 100), random.uniform(0, 100))
+        calm = [m[1] for m in group.members.values() if m[0]]
+        if len(calm) > 1:
+            max_error = max(max_error, abs(group.summary()["group_calm_harmony"] - (100 - statistics.stdev(calm))))
+    print(f"📊 Error máximo de la armonía frente a statistics.stdev: {max_error:.2e}")
+    print(f"📊 Resumen: {group.summary()}")
+
+
+if __name__ == "__main__":
+    test_rolling_calm()
+    test_rolling_control()
+    test_extreme_event_detector()
+    test_group_summary()
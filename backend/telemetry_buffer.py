@@ -0,0 +1,96 @@
+"""
+Buffer circular columnar de telemetría para Confianza al Volante
+Guarda el historial de cada simulador como un array tipado por canal en
+lugar de un deque de diccionarios, y ofrece ventanas de las últimas N
+muestras como memoryview sin copiar datos.
+"""
+
+from array import array
+from typing import Dict, Optional
+
+# Canales guardados por frame (claves del frame del conector) y su tipo:
+# float32 basta para la telemetría del juego (F1 y AC la emiten así), pero
+# el timestamp (tiempo del event loop) necesita float64 para no perder ms
+CHANNEL_TYPES = {
+    "SpeedKmh": "f",
+    "Rpms": "f",
+    "SteeringAngle": "f",
+    "Throttle": "f",
+    "Brake": "f",
+    "Gear": "f",
+    "timestamp": "d",
+}
+CHANNELS = tuple(CHANNEL_TYPES)
+
+
+class TelemetryRingBuffer:
+    """
+    Historial de un simulador en columnas array tipadas (una por canal)
+
+    Cada columna reserva 2 × capacity posiciones y cada muestra se escribe
+    dos veces (en i y en i + capacity). Así las últimas N muestras siempre
+    están contiguas y en orden, y window() las devuelve como una rebanada
+    de memoryview, sin copias ni reordenar el anillo.
+    """
+
+    def __init__(self, capacity: int = 50):
+        self.capacity = max(1, capacity)
+        self._columns: Dict[str, array] = {
+            channel: array(typecode, bytes(array(typecode).itemsize * 2 * self.capacity))
+            for channel, typecode in CHANNEL_TYPES.items()
+        }
+        self._views: Dict[str, memoryview] = {
+            channel: memoryview(column) for channel, column in self._columns.items()
+        }
+        # Para no reconstruir la lista de columnas en cada append
+        self._channel_columns = tuple((channel, self._columns[channel]) for channel in CHANNELS)
+        # Próxima posición de escritura en [0, capacity)
+        self._head = 0
+        self._count = 0
+        # Estado de conexión del último frame
+        self.connected = False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, frame: Dict) -> None:
+        """Copia los canales del frame al anillo (expulsa la muestra más antigua si está lleno)"""
+        i = self._head
+        j = i + self.capacity
+        for channel, column in self._channel_columns:
+            value = float(frame.get(channel) or 0.0)
+            column[i] = value
+            column[j] = value
+        self._head = i + 1 if i + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+        self.connected = bool(frame.get("connected", False))
+
+    def value(self, channel: str, age: int = 0) -> float:
+        """Valor del canal hace `age` muestras (0 = la más reciente)"""
+        if age >= self._count:
+            raise IndexError(f"Solo hay {self._count} muestras en el historial")
+        return self._columns[channel][self._head + self.capacity - 1 - age]
+
+    def window(self, channel: str, n: Optional[int] = None) -> memoryview:
+        """
+        Últimas `n` muestras del canal (todas si n es None), de la más
+        antigua a la más reciente, como memoryview sin copia
+        """
+        n = self._count if n is None else min(n, self._count)
+        end = self._head + self.capacity
+        return self._views[channel][end - n:end]
+
+
+def test_ring_buffer():
+    """Prueba rápida del anillo"""
+    print("🧪 Probando TelemetryRingBuffer...")
+    buffer = TelemetryRingBuffer(5)
+    for step in range(12):
+        buffer.append({"SteeringAngle": float(step), "SpeedKmh": step * 10.0, "connected": True})
+    print(f"📊 Ventana final: {buffer.window('SteeringAngle').tolist()} (len={len(buffer)})")
+    print(f"📊 Último volante: {buffer.value('SteeringAngle')}, conectado: {buffer.connected}")
+
+
+if __name__ == "__main__":
+    test_ring_buffer()
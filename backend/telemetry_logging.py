@@ -0,0 +1,151 @@
+"""
+Logging del camino caliente de telemetría - Confianza al Volante
+Límites por clave, muestreo y formateo diferido para los mensajes que se
+repiten en cada frame, más un QueueHandler que saca la escritura de logs
+del hilo del event loop.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from typing import Dict, Hashable, Optional
+
+# Segundos mínimos entre dos mensajes con la misma clave
+DEFAULT_LOG_INTERVAL = float(os.getenv("TELEMETRY_LOG_INTERVAL", "5.0"))
+# Solo 1 de cada N eventos de una clave llega a evaluar el límite
+DEFAULT_SAMPLE_EVERY = int(os.getenv("TELEMETRY_LOG_SAMPLE_EVERY", "1"))
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RateLimitedLogger:
+    """
+    Envoltorio de un logger para mensajes de alta frecuencia
+
+    Cada mensaje lleva una clave (p. ej. "frame:sim_3"). Por clave se emite
+    como máximo un mensaje cada `interval` segundos y solo se consideran 1 de
+    cada `sample_every` eventos. Los argumentos se pasan al estilo %-format,
+    así que el texto solo se construye si el mensaje se emite de verdad. Al
+    emitir se añade cuántos mensajes de esa clave se suprimieron desde el
+    anterior.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = DEFAULT_LOG_INTERVAL,
+                 sample_every: int = DEFAULT_SAMPLE_EVERY, clock=time.monotonic):
+        self.logger = logger
+        self.interval = interval
+        self.sample_every = max(1, sample_every)
+        self._clock = clock
+        self._last_emit: Dict[Hashable, float] = {}
+        self._seen: Dict[Hashable, int] = {}
+        self._suppressed: Dict[Hashable, int] = {}
+        self.stats = {"emitted": 0, "suppressed": 0}
+
+    def log(self, level: int, key: Hashable, msg: str, *args,
+            interval: Optional[float] = None) -> bool:
+        """
+        Registra `msg % args` si la clave no ha superado su límite
+
+        Returns:
+            True si el mensaje se emitió
+        """
+        if not self.logger.isEnabledFor(level):
+            return False
+
+        seen = self._seen.get(key, 0) + 1
+        self._seen[key] = seen
+        if seen % self.sample_every:
+            self._suppress(key)
+            return False
+
+        now = self._clock()
+        last = self._last_emit.get(key)
+        if last is not None and now - last < (self.interval if interval is None else interval):
+            self._suppress(key)
+            return False
+
+        self._last_emit[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            msg += " (+%d suprimidos)"
+            args += (suppressed,)
+        self.stats["emitted"] += 1
+        self.logger.log(level, msg, *args)
+        return True
+
+    def _suppress(self, key: Hashable) -> None:
+        self._suppressed[key] = self._suppressed.get(key, 0) + 1
+        self.stats["suppressed"] += 1
+
+    def debug(self, key: Hashable, msg: str, *args, **kwargs) -> bool:
+        return self.log(logging.DEBUG, key, msg, *args, **kwargs)
+
+    def info(self, key: Hashable, msg: str, *args, **kwargs) -> bool:
+        return self.log(logging.INFO, key, msg, *args, **kwargs)
+
+    def warning(self, key: Hashable, msg: str, *args, **kwargs) -> bool:
+        return self.log(logging.WARNING, key, msg, *args, **kwargs)
+
+    def error(self, key: Hashable, msg: str, *args, **kwargs) -> bool:
+        return self.log(logging.ERROR, key, msg, *args, **kwargs)
+
+
+def setup_queue_logging(level: int = logging.INFO, fmt: str = LOG_FORMAT) -> logging.handlers.QueueListener:
+    """
+    Configura el logger raíz para escribir a través de una cola
+
+    El event loop solo encola registros (QueueHandler); un hilo aparte
+    (QueueListener) hace el formateo final y la escritura en consola. Es
+    idempotente: si ya está configurado devuelve el listener existente.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_queue_logging)
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """Vacía la cola de logs y detiene el hilo de escritura"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def test_rate_limited_logger():
+    """Prueba rápida del límite por clave y del muestreo"""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    now = [0.0]
+    hot_log = RateLimitedLogger(logging.getLogger("telemetry_logging.test"),
+                                interval=1.0, clock=lambda: now[0])
+
+    print("🧪 Probando RateLimitedLogger...")
+    emitted = 0
+    for frame in range(100):
+        now[0] = frame * 0.05  # 20 Hz durante 5 s
+        emitted += hot_log.info("frame:sim_1", "✅ %s: frame %d", "sim_1", frame)
+    print(f"📊 100 frames a 20 Hz con límite de 1 s → {emitted} mensajes emitidos")
+    print(f"📊 Estadísticas: {hot_log.stats}")
+
+
+if __name__ == "__main__":
+    test_rate_limited_logger()
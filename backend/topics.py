@@ -0,0 +1,133 @@
+"""
+Suscripciones por tema del WebSocket para Confianza al Volante
+Cada vista recibe solo lo que pinta: el dashboard (script.js) no necesita
+los parámetros artísticos y la obra (artwork.js) no necesita raw_game_data
+ni el resumen. El cliente se suscribe enviando
+{"type": "subscribe", "topics": [...]} (y {"type": "unsubscribe", ...});
+sin suscripciones recibe el payload completo como siempre. Los temas
+desconocidos se rechazan en la confirmación ("rejected").
+
+Temas:
+    dashboard  medidores y telemetría dual por conductora + resumen de grupo
+    art        lo que usa la obra: entradas de conducción, calma, control y eventos
+    summary    solo el resumen de grupo
+    sim_N      payload completo de una conductora
+
+Cada proyección es un payload parcial con la misma forma que el completo
+(más "topic"), así que los manejadores del frontend no cambian. Se
+construye y serializa una vez por tick para todos sus suscriptores.
+"""
+
+import json
+import re
+from typing import Dict, Optional
+
+STATIC_TOPICS = ("dashboard", "art", "summary")
+# Límites por cliente (cada tema es un mensaje más por tick)
+MAX_TOPICS = 16
+# Temas de una conductora: sim_1, sim_2...
+SIM_TOPIC = re.compile(r"sim_\d+")
+
+# Campos que lee cada vista
+DASHBOARD_RAW = ("connected", "SpeedKmh", "Rpms", "Throttle", "Brake")
+DASHBOARD_GAME = ("SpeedKmh", "Rpms")
+DASHBOARD_METRICS = ("calm_index", "control_index")
+ART_RAW = ("connected", "SpeedKmh", "Rpms", "Gear", "SteeringAngle", "Throttle", "Brake")
+ART_METRICS = ("calm_index", "control_index")
+
+
+def valid_topic(topic) -> bool:
+    """Tema fijo o de una conductora (sim_N)"""
+    return isinstance(topic, str) and (topic in STATIC_TOPICS or SIM_TOPIC.fullmatch(topic) is not None)
+
+
+def _pick(source: Dict, keys: tuple) -> Dict:
+    return {key: source[key] for key in keys if key in source}
+
+
+def _dashboard_sim(sim: Dict) -> Dict:
+    raw = sim.get("raw_data") or {}
+    projected = _pick(raw, DASHBOARD_RAW)
+    if "raw_game_data" in raw:
+        projected["raw_game_data"] = _pick(raw["raw_game_data"], DASHBOARD_GAME)
+    return {"raw_data": projected, "metrics": _pick(sim.get("metrics") or {}, DASHBOARD_METRICS)}
+
+
+def _art_sim(sim: Dict) -> Dict:
+    metrics = sim.get("metrics") or {}
+    projected = _pick(metrics, ART_METRICS)
+    art = metrics.get("art_parameters")
+    if art and "extreme_events" in art:
+        projected["art_parameters"] = {"extreme_events": art["extreme_events"]}
+    return {"raw_data": _pick(sim.get("raw_data") or {}, ART_RAW), "metrics": projected}
+
+
+def project(payload: Dict, topic: str) -> Optional[Dict]:
+    """
+    Proyección de un tema sobre el payload del tick
+
+    Returns:
+        Payload parcial con "topic", o None si el tema no tiene datos (una
+        conductora que no está en el tick)
+    """
+    simulators = payload.get("simulators", {})
+    message = {"topic": topic, "timestamp": payload.get("timestamp")}
+    if topic == "dashboard":
+        message["simulators"] = {sim_id: _dashboard_sim(sim) for sim_id, sim in simulators.items()}
+        message["summary"] = payload.get("summary")
+    elif topic == "art":
+        message["simulators"] = {sim_id: _art_sim(sim) for sim_id, sim in simulators.items()}
+    elif topic == "summary":
+        message["summary"] = payload.get("summary")
+    elif topic in simulators:
+        message["simulators"] = {topic: simulators[topic]}
+    else:
+        return None
+    return message
+
+
+class TopicCache:
+    """Proyecciones serializadas de un tick (cada tema una sola vez)"""
+
+    __slots__ = ("payload", "encoded")
+
+    def __init__(self, payload: Dict):
+        self.payload = payload
+        self.encoded: Dict[str, Optional[str]] = {}
+
+    def get(self, topic: str) -> Optional[str]:
+        if topic not in self.encoded:
+            message = project(self.payload, topic)
+            self.encoded[topic] = None if message is None else json.dumps(message)
+        return self.encoded[topic]
+
+
+def test_topics():
+    """Prueba rápida: tamaño de cada proyección frente al payload completo"""
+    print("🧪 Probando temas...")
+    simulators = {
+        f"sim_{i}": {
+            "raw_data": {"sim_id": f"sim_{i}", "connected": True, "game_running": True, "is_in_race": True,
+                         "timestamp": 1.0, "SpeedKmh": 120.0, "Rpms": 7000.0, "Gear": 4, "SteeringAngle": 3.0,
+                         "Throttle": 0.8, "Brake": 0.0,
+                         "raw_game_data": {"SpeedKmh": 150.0, "Rpms": 9000.0, "Gear": 4, "SteeringAngle": 20.0,
+                                           "Throttle": 0.8, "Brake": 0.0}},
+            "metrics": {"calm_index": 70.0, "control_index": 80.0, "smoothness_index": 60.0,
+                        "art_parameters": {"position": 0.5, "color": [120, 80, 50], "thickness": 5.0,
+                                           "opacity": 0.8, "extreme_events": {"type": "normal", "intensity": 0.0}}},
+            "pilot_name": f"Piloto {i}"
+        }
+        for i in range(1, 6)
+    }
+    payload = {"timestamp": 1.0, "simulators": simulators, "summary": {"group_calm_avg": 70.0}}
+    cache = TopicCache(payload)
+    print(f"📦 Completo: {len(json.dumps(payload))} bytes")
+    for topic in STATIC_TOPICS + ("sim_3", "sim_99"):
+        message = cache.get(topic)
+        print(f"📦 {topic}: {len(message) if message else 'sin datos'}")
+    for topic in ("foo", "sim_x", "sim_", 3):
+        print(f"📦 {topic!r}: {'válido' if valid_topic(topic) else 'rechazado'}")
+
+
+if __name__ == "__main__":
+    test_topics()
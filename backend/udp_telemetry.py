@@ -0,0 +1,432 @@
+"""
+UDP Telemetry para Confianza al Volante
+Recibe la telemetría que F1 2024 y Assetto Corsa emiten por UDP, como
+alternativa push al polling HTTP de SimHub. Cada paquete binario se decodifica
+con layouts de struct precompilados y se convierte al mismo frame que produce
+SimHubConnector, de modo que el procesador no distingue la fuente.
+"""
+
+import asyncio
+import logging
+import math
+import struct
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from simhub_connector import build_sim_frame, default_sim_frame
+
+logger = logging.getLogger(__name__)
+
+# === F1 2024 (puerto 20777 por defecto) ===
+# PacketHeader: formato, año, versión mayor/menor, versión de paquete, id de
+# paquete, sessionUID, sessionTime, frameIdentifier, overallFrameIdentifier,
+# playerCarIndex, secondaryPlayerCarIndex
+F1_HEADER = struct.Struct("<HBBBBBQfIIBB")                  # 29 bytes
+# CarTelemetryData completo de un coche (60 bytes)
+F1_CAR_TELEMETRY = struct.Struct("<HfffBbHBBH4H4B4BH4f4B")
+# Solo los campos que usamos: speed, throttle, steer, brake, clutch, gear, engineRPM
+F1_CAR_TELEMETRY_HEAD = struct.Struct("<HfffBbH")
+F1_CAR_TELEMETRY_TRAILER = struct.Struct("<BBb")
+F1_PACKET_FORMAT = 2024
+F1_PACKET_CAR_TELEMETRY = 6
+F1_NUM_CARS = 22
+F1_CAR_TELEMETRY_PACKET_SIZE = (F1_HEADER.size + F1_NUM_CARS * F1_CAR_TELEMETRY.size
+                                + F1_CAR_TELEMETRY_TRAILER.size)   # 1352 bytes
+# F1 envía steer normalizado en -1..1; el volante de F1 gira unos ±270°
+F1_STEER_TO_DEGREES = 270.0
+
+# === Assetto Corsa (Remote Telemetry, puerto 9996 del servidor) ===
+# Handshaker: identifier, version, operationId
+AC_HANDSHAKER = struct.Struct("<iii")
+AC_OP_HANDSHAKE = 0
+AC_OP_SUBSCRIBE_UPDATE = 1
+AC_OP_DISMISS = 3
+AC_HANDSHAKE_RESPONSE_SIZE = 408
+# RTCarInfo (328 bytes): identifier, size, speed kmh/mph/ms, 6 flags, accG x3,
+# 4 tiempos de vuelta, gas, brake, clutch, engineRPM, steer, gear, cgHeight,
+# 14 arrays de 4 ruedas, carPositionNormalized, carSlope, carCoordinates x3
+AC_CAR_INFO = struct.Struct("<c3xi3f6?2x3f4i5fif56f2f3f")
+AC_FIELD_SPEED_KMH = 2
+AC_FIELD_GAS = 18
+AC_FIELD_BRAKE = 19
+AC_FIELD_RPM = 21
+AC_FIELD_STEER = 22
+AC_FIELD_GEAR = 23
+
+
+def decode_f1_car_telemetry(data: bytes) -> Optional[Dict]:
+    """
+    Decodifica un paquete Car Telemetry de F1 2024 (solo el coche del jugador)
+
+    Args:
+        data: Datagrama UDP recibido
+
+    Returns:
+        Datos reales del juego, o None si no es un paquete de telemetría válido
+    """
+    if len(data) < F1_CAR_TELEMETRY_PACKET_SIZE:
+        return None
+    header = F1_HEADER.unpack_from(data, 0)
+    if header[0] != F1_PACKET_FORMAT or header[5] != F1_PACKET_CAR_TELEMETRY:
+        return None
+    player_index = header[10]
+    if player_index >= F1_NUM_CARS:
+        return None
+
+    offset = F1_HEADER.size + player_index * F1_CAR_TELEMETRY.size
+    speed, throttle, steer, brake, _clutch, gear, rpm = F1_CAR_TELEMETRY_HEAD.unpack_from(data, offset)
+    return {
+        "SpeedKmh": float(speed),
+        "Rpms": float(rpm),
+        "Gear": gear,
+        "SteeringAngle": steer * F1_STEER_TO_DEGREES,
+        "Throttle": throttle,
+        "Brake": brake,
+    }
+
+
+def decode_ac_car_info(data: bytes) -> Optional[Dict]:
+    """
+    Decodifica un paquete RTCarInfo de Assetto Corsa
+
+    Args:
+        data: Datagrama UDP recibido
+
+    Returns:
+        Datos reales del juego, o None si no es un RTCarInfo
+    """
+    if len(data) != AC_CAR_INFO.size:
+        return None
+    fields = AC_CAR_INFO.unpack_from(data, 0)
+    return {
+        "SpeedKmh": fields[AC_FIELD_SPEED_KMH],
+        "Rpms": fields[AC_FIELD_RPM],
+        # AC: 0 = reversa, 1 = neutro, 2 = primera...
+        "Gear": fields[AC_FIELD_GEAR] - 1,
+        "SteeringAngle": fields[AC_FIELD_STEER],
+        "Throttle": fields[AC_FIELD_GAS],
+        "Brake": fields[AC_FIELD_BRAKE],
+    }
+
+
+DECODERS: Dict[str, Callable[[bytes], Optional[Dict]]] = {
+    "f1": decode_f1_car_telemetry,
+    "ac": decode_ac_car_info,
+}
+
+
+def parse_udp_sources(spec: str) -> Dict[str, Tuple[str, str, int]]:
+    """
+    Interpreta la configuración de fuentes UDP
+
+    Formato: "sim_1=f1:20777,sim_2=ac:192.168.1.101:9996"
+      - f1:<puerto>           escucha en ese puerto local (F1 envía al PC)
+      - ac:<host>:<puerto>    se suscribe al servidor de telemetría de AC
+
+    Returns:
+        Diccionario {sim_id: (juego, host, puerto)}
+    """
+    sources = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        sim_id, _, target = entry.partition("=")
+        parts = target.split(":")
+        game = parts[0].lower()
+        if game == "f1" and len(parts) == 2:
+            sources[sim_id.strip()] = ("f1", "0.0.0.0", int(parts[1]))
+        elif game == "ac" and len(parts) == 3:
+            sources[sim_id.strip()] = ("ac", parts[1], int(parts[2]))
+        else:
+            raise ValueError(f"Fuente UDP inválida: '{entry}'")
+    return sources
+
+
+class UdpTelemetryProtocol(asyncio.DatagramProtocol):
+    """Endpoint UDP de un simulador: decodifica cada datagrama en un frame"""
+
+    def __init__(self, source: "UdpTelemetrySource", sim_id: str, game: str,
+                 remote_addr: Optional[Tuple[str, int]] = None):
+        self.source = source
+        self.sim_id = sim_id
+        self.game = game
+        self.decode = DECODERS[game]
+        self.remote_addr = remote_addr
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        # Tiempos del loop del último paquete válido y del último handshake
+        self.last_packet: Optional[float] = None
+        self.last_handshake: Optional[float] = None
+
+    @property
+    def needs_handshake(self) -> bool:
+        return self.game == "ac" and self.remote_addr is not None
+
+    def send_handshake(self) -> None:
+        """AC no envía nada hasta recibir handshake + suscripción"""
+        self.last_handshake = asyncio.get_event_loop().time()
+        self.transport.sendto(AC_HANDSHAKER.pack(1, 1, AC_OP_HANDSHAKE), self.remote_addr)
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if self.needs_handshake:
+            self.send_handshake()
+
+    def datagram_received(self, data: bytes, addr):
+        if self.game == "ac" and len(data) == AC_HANDSHAKE_RESPONSE_SIZE:
+            self.transport.sendto(AC_HANDSHAKER.pack(1, 1, AC_OP_SUBSCRIBE_UPDATE), addr)
+            logger.info(f"🤝 {self.sim_id}: suscrito a Assetto Corsa en {addr[0]}:{addr[1]}")
+            return
+
+        raw_game_data = self.decode(data)
+        if raw_game_data is None:
+            return
+        self.last_packet = asyncio.get_event_loop().time()
+        self.source.packets_received[self.sim_id] += 1
+        self.source.latest_data[self.sim_id] = build_sim_frame(
+            self.sim_id, raw_game_data, True, True, self.last_packet
+        )
+
+    def error_received(self, exc):
+        logger.warning(f"Error UDP en {self.sim_id}: {exc}")
+
+
+class UdpTelemetrySource:
+    """
+    Fuente de telemetría UDP para múltiples simuladores.
+
+    Expone la misma interfaz de slots que el modo poller de SimHubConnector
+    (`get_latest_data`), así que el bucle principal puede usar cualquiera.
+    """
+
+    def __init__(self, timeout: float = 2.0):
+        """
+        Args:
+            timeout: Segundos sin paquetes tras los que un simulador se
+                considera desconectado
+        """
+        self.timeout = timeout
+        self.latest_data: Dict[str, Dict] = {}
+        self.packets_received: Dict[str, int] = {}
+        self._transports: Dict[str, asyncio.DatagramTransport] = {}
+
+    async def start(self, sources: Dict[str, Tuple[str, str, int]]) -> None:
+        """
+        Abre un endpoint UDP por simulador
+
+        Args:
+            sources: Diccionario {sim_id: (juego, host, puerto)} (ver parse_udp_sources)
+        """
+        loop = asyncio.get_event_loop()
+        for sim_id, (game, host, port) in sources.items():
+            if game not in DECODERS:
+                raise ValueError(f"Juego UDP no soportado para {sim_id}: {game}")
+            self.latest_data[sim_id] = default_sim_frame(sim_id)
+            self.packets_received[sim_id] = 0
+
+            if game == "f1":
+                endpoint = dict(local_addr=(host, port))
+                remote = None
+            else:
+                endpoint = dict(local_addr=("0.0.0.0", 0))
+                remote = (host, port)
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda sim_id=sim_id, game=game, remote=remote: UdpTelemetryProtocol(self, sim_id, game, remote),
+                **endpoint
+            )
+            self._transports[sim_id] = transport
+            logger.info(f"📡 {sim_id}: telemetría UDP {game.upper()} en {host}:{port}")
+
+    def get_latest_data(self) -> Dict[str, Dict]:
+        """
+        Obtiene el último frame de cada simulador
+
+        Los simuladores de Assetto Corsa sin paquetes durante más de
+        `timeout` repiten el handshake (como mucho una vez por `timeout`):
+        AC pudo no estar abierto al arrancar o haberse reiniciado, y solo
+        vuelve a enviar tras una nueva suscripción.
+
+        Returns:
+            Diccionario {sim_id: data}; los simuladores sin paquetes recientes
+            devuelven un frame desconectado
+        """
+        now = asyncio.get_event_loop().time()
+        result = {}
+        for sim_id, data in self.latest_data.items():
+            if data["connected"] and now - data["timestamp"] > self.timeout:
+                data = default_sim_frame(sim_id)
+                self.latest_data[sim_id] = data
+            result[sim_id] = data
+        for transport in self._transports.values():
+            protocol = transport.get_protocol()
+            if (protocol.needs_handshake
+                    and (protocol.last_packet is None or now - protocol.last_packet > self.timeout)
+                    and now - protocol.last_handshake > self.timeout):
+                logger.debug(f"🤝 {protocol.sim_id}: sin paquetes de Assetto Corsa, repitiendo handshake")
+                protocol.send_handshake()
+        return result
+
+    async def stop(self) -> None:
+        """Cierra todos los endpoints UDP"""
+        for transport in self._transports.values():
+            protocol = transport.get_protocol()
+            if protocol.needs_handshake:
+                # Avisar a AC para que deje de enviar
+                transport.sendto(AC_HANDSHAKER.pack(1, 1, AC_OP_DISMISS), protocol.remote_addr)
+            transport.close()
+        self._transports.clear()
+
+
+# === Emisores falsos para pruebas en loopback ===
+
+def encode_f1_car_telemetry(telemetry: Dict, frame: int = 0, player_index: int = 0) -> bytes:
+    """Construye un paquete Car Telemetry de F1 2024 con el coche del jugador"""
+    header = F1_HEADER.pack(F1_PACKET_FORMAT, 24, 1, 0, 1, F1_PACKET_CAR_TELEMETRY,
+                            0xC0FFEE, frame / 60.0, frame, frame, player_index, 255)
+    cars = []
+    for index in range(F1_NUM_CARS):
+        t = telemetry if index == player_index else {}
+        cars.append(F1_CAR_TELEMETRY.pack(
+            int(t.get("SpeedKmh", 0)), t.get("Throttle", 0.0),
+            t.get("SteeringAngle", 0.0) / F1_STEER_TO_DEGREES, t.get("Brake", 0.0),
+            0, int(t.get("Gear", 0)), int(t.get("Rpms", 0)), 0, 0, 0,
+            *(500,) * 4, *(90,) * 4, *(95,) * 4, 105, *(23.5,) * 4, *(0,) * 4
+        ))
+    return header + b"".join(cars) + F1_CAR_TELEMETRY_TRAILER.pack(255, 255, 0)
+
+
+def encode_ac_car_info(telemetry: Dict) -> bytes:
+    """Construye un paquete RTCarInfo de Assetto Corsa"""
+    speed = telemetry.get("SpeedKmh", 0.0)
+    return AC_CAR_INFO.pack(
+        b"a", AC_CAR_INFO.size, speed, speed / 1.609, speed / 3.6,
+        False, False, False, False, False, False, 0.0, 0.0, 0.0,
+        0, 0, 0, 0,
+        telemetry.get("Throttle", 0.0), telemetry.get("Brake", 0.0), 0.0,
+        telemetry.get("Rpms", 0.0), telemetry.get("SteeringAngle", 0.0),
+        int(telemetry.get("Gear", 0)) + 1, 0.3,
+        *(0.0,) * 56, 0.5, 0.0, 0.0, 0.0, 0.0
+    )
+
+
+def demo_telemetry(t: float) -> Dict:
+    """Telemetría sintética suave para los emisores falsos"""
+    speed = 180 + 60 * math.sin(t * 0.5)
+    return {
+        "SpeedKmh": speed,
+        "Rpms": 9000 + 3000 * math.sin(t * 0.7),
+        "Gear": min(8, max(1, int(speed / 40))),
+        "SteeringAngle": 90 * math.sin(t * 1.3),
+        "Throttle": 0.5 + 0.5 * math.sin(t * 0.9),
+        "Brake": max(0.0, -math.sin(t * 0.9)),
+    }
+
+
+class FakeTelemetrySender:
+    """Emisor falso de paquetes F1 2024 hacia un puerto UDP (loopback)"""
+
+    def __init__(self, port: int, host: str = "127.0.0.1", rate_hz: float = 60.0):
+        self.addr = (host, port)
+        self.rate_hz = rate_hz
+        self.frames_sent = 0
+
+    async def run(self, duration: float,
+                  telemetry_source: Callable[[float], Dict] = demo_telemetry) -> None:
+        """Envía paquetes durante `duration` segundos"""
+        loop = asyncio.get_event_loop()
+        transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol,
+                                                           remote_addr=self.addr)
+        start = time.monotonic()
+        try:
+            while (elapsed := time.monotonic() - start) < duration:
+                transport.sendto(encode_f1_car_telemetry(telemetry_source(elapsed), self.frames_sent))
+                self.frames_sent += 1
+                await asyncio.sleep(1 / self.rate_hz)
+        finally:
+            transport.close()
+
+
+class FakeAssettoCorsaServer(asyncio.DatagramProtocol):
+    """Servidor falso de Remote Telemetry de AC: handshake y envío de RTCarInfo"""
+
+    def __init__(self, rate_hz: float = 60.0,
+                 telemetry_source: Callable[[float], Dict] = demo_telemetry):
+        self.rate_hz = rate_hz
+        self.telemetry_source = telemetry_source
+        self.transport = None
+        self.frames_sent = 0
+        self._stream_task: Optional[asyncio.Task] = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        if len(data) != AC_HANDSHAKER.size:
+            return
+        _identifier, _version, operation = AC_HANDSHAKER.unpack(data)
+        if operation == AC_OP_HANDSHAKE:
+            # carName, driverName, identifier, version, trackName, trackConfig
+            self.transport.sendto(b"\x00" * AC_HANDSHAKE_RESPONSE_SIZE, addr)
+        elif operation == AC_OP_SUBSCRIBE_UPDATE and self._stream_task is None:
+            self._stream_task = asyncio.create_task(self._stream(addr))
+        elif operation == AC_OP_DISMISS and self._stream_task:
+            self._stream_task.cancel()
+
+    async def _stream(self, addr):
+        start = time.monotonic()
+        while True:
+            self.transport.sendto(encode_ac_car_info(self.telemetry_source(time.monotonic() - start)), addr)
+            self.frames_sent += 1
+            await asyncio.sleep(1 / self.rate_hz)
+
+    def close(self):
+        if self._stream_task:
+            self._stream_task.cancel()
+        if self.transport:
+            self.transport.close()
+
+
+async def test_udp_ingest():
+    """Prueba en loopback: un emisor F1 falso y un servidor AC falso"""
+    print("📡 Probando ingesta UDP en loopback...")
+    loop = asyncio.get_event_loop()
+
+    ac_transport, ac_server = await loop.create_datagram_endpoint(
+        FakeAssettoCorsaServer, local_addr=("127.0.0.1", 0))
+    ac_port = ac_transport.get_extra_info("sockname")[1]
+
+    source = UdpTelemetrySource()
+    await source.start(parse_udp_sources(f"sim_1=f1:20777,sim_2=ac:127.0.0.1:{ac_port}"))
+
+    f1_sender = FakeTelemetrySender(20777)
+    await f1_sender.run(duration=1.0)
+
+    for sim_id, data in source.get_latest_data().items():
+        status = "✅ Conectado" if data["connected"] else "❌ Desconectado"
+        print(f"  {sim_id}: {status} - paquetes: {source.packets_received[sim_id]} - "
+              f"Velocidad: {data['SpeedKmh']:.1f} km/h - Volante: {data['SteeringAngle']:.1f}°")
+
+    await source.stop()
+    ac_server.close()
+
+    # AC arranca (o se reinicia) después que el backend: el handshake se repite
+    print("📡 Probando reconexión con Assetto Corsa arrancado tarde...")
+    source = UdpTelemetrySource(timeout=0.3)
+    await source.start(parse_udp_sources(f"sim_2=ac:127.0.0.1:{ac_port}"))
+    await asyncio.sleep(0.4)
+    ac_transport, ac_server = await loop.create_datagram_endpoint(
+        FakeAssettoCorsaServer, local_addr=("127.0.0.1", ac_port))
+    for _ in range(20):
+        source.get_latest_data()
+        await asyncio.sleep(0.05)
+    data = source.get_latest_data()["sim_2"]
+    status = "✅ Reconectado" if data["connected"] else "❌ Sin reconectar"
+    print(f"  sim_2: {status} - paquetes: {source.packets_received['sim_2']}")
+
+    await source.stop()
+    await asyncio.sleep(0.05)
+    status = "✅ Enviado" if ac_server._stream_task.cancelled() else "❌ No enviado"
+    print(f"  Dismiss a Assetto Corsa: {status}")
+    ac_server.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(test_udp_ingest())
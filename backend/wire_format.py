@@ -0,0 +1,226 @@
+"""
+Formato binario del WebSocket para Confianza al Volante
+Alternativa compacta al JSON de cada tick, negociada por cliente al
+conectar (/ws?format=binary). Los canales numéricos de cada conductora van
+en registros float32 de disposición fija; las claves (raw_data, metrics,
+art_parameters, pilot_name...) no viajan en cada frame. El decodificador
+del navegador está en frontend/wire_format.js y reconstruye el mismo
+objeto que el JSON, así que artwork.js y script.js no cambian.
+
+Disposición (little-endian):
+    cabecera   "CV", versión u8, flags u8, timestamp f64,
+               conductoras u16, campos por registro u16, campos de resumen u8
+    resumen    SUMMARY_FIELDS × float32
+    ids        por conductora: longitud u8 + sim_id UTF-8; relleno a 4 bytes
+    registros  conductoras × RECORD_FIELDS × float32
+
+Un valor ausente se codifica como NaN y el decodificador omite la clave.
+"""
+
+import math
+import struct
+from typing import Dict, List
+
+from streaming_metrics import EVENT_TYPES
+
+WIRE_FORMATS = ("json", "binary")
+MAGIC = b"CV"
+VERSION = 1
+
+# Resumen de grupo (mismas claves que get_summary_stats)
+SUMMARY_FIELDS = (
+    "connected_drivers", "total_drivers", "group_calm_avg",
+    "group_control_avg", "group_calm_harmony", "collective_strength"
+)
+
+# Registro por conductora: (nombre en el esquema, ruta en el payload JSON)
+RECORD_LAYOUT = (
+    ("connected", ("raw_data", "connected")),
+    ("speed", ("raw_data", "SpeedKmh")),
+    ("rpms", ("raw_data", "Rpms")),
+    ("gear", ("raw_data", "Gear")),
+    ("steering", ("raw_data", "SteeringAngle")),
+    ("throttle", ("raw_data", "Throttle")),
+    ("brake", ("raw_data", "Brake")),
+    ("game_speed", ("raw_data", "raw_game_data", "SpeedKmh")),
+    ("game_rpms", ("raw_data", "raw_game_data", "Rpms")),
+    ("calm_index", ("metrics", "calm_index")),
+    ("control_index", ("metrics", "control_index")),
+    ("smoothness_index", ("metrics", "smoothness_index")),
+    ("art_position", ("metrics", "art_parameters", "position")),
+    ("art_hue", ("metrics", "art_parameters", "color", 0)),
+    ("art_saturation", ("metrics", "art_parameters", "color", 1)),
+    ("art_lightness", ("metrics", "art_parameters", "color", 2)),
+    ("art_thickness", ("metrics", "art_parameters", "thickness")),
+    ("art_opacity", ("metrics", "art_parameters", "opacity")),
+    ("event_type", ("metrics", "art_parameters", "extreme_events", "type")),
+    ("event_intensity", ("metrics", "art_parameters", "extreme_events", "intensity")),
+    ("event_speed", ("metrics", "art_parameters", "extreme_events", "speed")),
+    ("event_direction", ("metrics", "art_parameters", "extreme_events", "direction")),
+    ("event_impact_speed", ("metrics", "art_parameters", "extreme_events", "impact_speed")),
+    ("event_brake_force", ("metrics", "art_parameters", "extreme_events", "brake_force")),
+    ("event_severity", ("metrics", "art_parameters", "extreme_events", "severity")),
+    ("event_chaos_level", ("metrics", "art_parameters", "extreme_events", "chaos_level")),
+)
+RECORD_FIELDS = tuple(name for name, _ in RECORD_LAYOUT)
+
+# Campos de texto codificados como número (índice en la tupla)
+EVENT_CODES = ("normal",) + EVENT_TYPES
+DIRECTION_CODES = ("left", "right")
+SEVERITY_CODES = ("sharp", "violent")
+_ENUMS = {"event_type": EVENT_CODES, "event_direction": DIRECTION_CODES, "event_severity": SEVERITY_CODES}
+
+_HEADER = struct.Struct("<2sBBdHHB")
+_SUMMARY = struct.Struct(f"<{len(SUMMARY_FIELDS)}f")
+_RECORD = struct.Struct(f"<{len(RECORD_FIELDS)}f")
+_NAN = float("nan")
+
+
+def schema() -> Dict:
+    """Esquema que se envía en el saludo a los clientes binarios"""
+    return {
+        "format": "binary",
+        "version": VERSION,
+        "summary_fields": list(SUMMARY_FIELDS),
+        "record_fields": list(RECORD_FIELDS),
+        "enums": {name: list(values) for name, values in _ENUMS.items()}
+    }
+
+
+def _lookup(sim: Dict, path: tuple):
+    value = sim
+    for key in path:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, (list, tuple)) and isinstance(key, int) and key < len(value):
+            value = value[key]
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+def _number(name: str, value) -> float:
+    if value is None:
+        return _NAN
+    codes = _ENUMS.get(name)
+    if codes is not None:
+        return float(codes.index(value)) if value in codes else _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+def encode_frame(payload: Dict) -> bytes:
+    """
+    Codifica el payload de un tick (el mismo dict que se envía como JSON)
+
+    Args:
+        payload: {"timestamp", "simulators": {sim_id: {...}}, "summary"}
+
+    Returns:
+        Frame binario listo para send_bytes
+    """
+    simulators = payload.get("simulators", {})
+    summary = payload.get("summary") or {}
+    ids = [sim_id.encode("utf-8")[:255] for sim_id in simulators]
+    id_bytes = sum(1 + len(sim_id) for sim_id in ids)
+    padding = -(_HEADER.size + _SUMMARY.size + id_bytes) % 4
+
+    buffer = bytearray(_HEADER.size + _SUMMARY.size + id_bytes + padding + _RECORD.size * len(ids))
+    _HEADER.pack_into(buffer, 0, MAGIC, VERSION, 0, float(payload.get("timestamp") or 0.0),
+                      len(ids), len(RECORD_FIELDS), len(SUMMARY_FIELDS))
+    offset = _HEADER.size
+    _SUMMARY.pack_into(buffer, offset, *(_number(name, summary.get(name)) for name in SUMMARY_FIELDS))
+    offset += _SUMMARY.size
+    for sim_id in ids:
+        buffer[offset] = len(sim_id)
+        buffer[offset + 1:offset + 1 + len(sim_id)] = sim_id
+        offset += 1 + len(sim_id)
+    offset += padding
+    for sim in simulators.values():
+        _RECORD.pack_into(buffer, offset, *(_number(name, _lookup(sim, path)) for name, path in RECORD_LAYOUT))
+        offset += _RECORD.size
+    return bytes(buffer)
+
+
+def decode_frame(frame: bytes) -> Dict:
+    """
+    Decodifica un frame binario al mismo formato que el payload JSON (con
+    valores float32 y sin las claves que no forman parte del registro)
+    """
+    magic, version, _flags, timestamp, sims, fields, summary_count = _HEADER.unpack_from(frame, 0)
+    if magic != MAGIC or version != VERSION or fields != len(RECORD_FIELDS):
+        raise ValueError(f"Frame binario no compatible (versión {version}, {fields} campos)")
+    offset = _HEADER.size
+    summary_values = struct.unpack_from(f"<{summary_count}f", frame, offset)
+    offset += 4 * summary_count
+    summary = {name: value for name, value in zip(SUMMARY_FIELDS, summary_values) if not math.isnan(value)}
+
+    sim_ids: List[str] = []
+    for _ in range(sims):
+        length = frame[offset]
+        sim_ids.append(frame[offset + 1:offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+    offset += -offset % 4
+
+    simulators = {}
+    for sim_id in sim_ids:
+        record = dict(zip(RECORD_FIELDS, _RECORD.unpack_from(frame, offset)))
+        offset += _RECORD.size
+        simulators[sim_id] = _expand_record(sim_id, record)
+    return {"timestamp": timestamp, "simulators": simulators, "summary": summary}
+
+
+def _expand_record(sim_id: str, record: Dict[str, float]) -> Dict:
+    """Registro plano -> {"raw_data", "metrics", "pilot_name"}"""
+    sim: Dict = {"pilot_name": f"Piloto {sim_id.split('_')[-1]}"}
+    for name, path in RECORD_LAYOUT:
+        value = record[name]
+        if math.isnan(value):
+            continue
+        if name in _ENUMS:
+            value = _ENUMS[name][int(value)]
+        elif name == "connected":
+            value = value != 0
+        elif name == "gear":
+            value = int(value)
+        target = sim
+        for key, next_key in zip(path[:-1], path[1:]):
+            # Un índice entero indica lista (el color HSL)
+            target = target.setdefault(key, [None, None, None] if isinstance(next_key, int) else {})
+        target[path[-1]] = value
+    return sim
+
+
+def test_wire_format():
+    """Prueba rápida: ida y vuelta de un payload y tamaño frente al JSON"""
+    import json
+    import random
+
+    print("🧪 Probando formato binario...")
+    simulators = {}
+    for i in range(1, 6):
+        simulators[f"sim_{i}"] = {
+            "raw_data": {"sim_id": f"sim_{i}", "connected": True, "SpeedKmh": random.uniform(0, 200),
+                         "Rpms": 6500.0, "Gear": 4, "SteeringAngle": random.gauss(0, 20),
+                         "Throttle": 0.7, "Brake": 0.0, "timestamp": 1.0},
+            "metrics": {"calm_index": 72.5, "control_index": 81.0, "smoothness_index": 64.0,
+                        "art_parameters": {"position": 0.4, "color": [120.0, 80.0, 50.0], "thickness": 5.0,
+                                           "opacity": 0.8, "extreme_events": {"type": "spin", "intensity": 0.9,
+                                                                              "direction": "left", "speed": 90.0}}},
+            "pilot_name": f"Piloto {i}"
+        }
+    payload = {"timestamp": 12345.678, "simulators": simulators,
+               "summary": {name: 50.0 for name in SUMMARY_FIELDS}}
+    frame = encode_frame(payload)
+    decoded = decode_frame(frame)
+    event = decoded["simulators"]["sim_1"]["metrics"]["art_parameters"]["extreme_events"]
+    print(f"📦 JSON: {len(json.dumps(payload))} bytes, binario: {len(frame)} bytes")
+    print(f"📦 Evento decodificado: {event}")
+
+
+if __name__ == "__main__":
+    test_wire_format()
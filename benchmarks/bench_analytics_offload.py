@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la analítica fuera del event loop - Confianza al Volante
+Ejecuta un bucle de 20 Hz como el principal (update_data de todas las
+conductoras + foto de métricas) junto a AnalyticsStage y mide el retraso
+del event loop y el retraso de los ticks con la analítica desactivada,
+ejecutada en el propio loop (inline) y en un ProcessPoolExecutor.
+
+Uso:
+    python benchmarks/bench_analytics_offload.py --sims 100 --duration 6
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from analytics import AnalyticsStage
+from bench_pipeline import measure_loop_lag
+from data_processor import DriverPerformanceProcessor
+from demo_simulator import DemoSimulator
+
+UPDATE_INTERVAL = 0.05
+
+
+async def tick_loop(processor: DriverPerformanceProcessor, demo: DemoSimulator, tick_delays: list):
+    """Bucle de reloj fijo como main_data_loop (sin red ni broadcast)"""
+    loop = asyncio.get_event_loop()
+    next_tick = loop.time()
+    while True:
+        tick_delays.append(max(0.0, loop.time() - next_tick))
+        for sim_id, data in demo.generate_all_data().items():
+            processor.update_data(sim_id, data)
+        processor.snapshot()
+        next_tick += UPDATE_INTERVAL
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+
+async def run_mode(mode: str, sims: int, duration: float, interval: float, workers: int) -> dict:
+    processor = DriverPerformanceProcessor()
+    demo = DemoSimulator(sims)
+    stage = AnalyticsStage(processor, interval=interval, mode=mode, workers=workers)
+    await stage.start()
+
+    lag_samples, tick_delays = [], []
+    tasks = [asyncio.create_task(measure_loop_lag(lag_samples)),
+             asyncio.create_task(tick_loop(processor, demo, tick_delays))]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await stage.stop()
+
+    lag_samples.sort()
+    tick_delays.sort()
+    return {
+        "mode": mode,
+        "runs": stage.stats["runs"],
+        "analysis_ms": stage.stats["last_duration_ms"] or 0.0,
+        "lag_p50_ms": statistics.median(lag_samples) * 1000,
+        "lag_p99_ms": lag_samples[int(len(lag_samples) * 0.99)] * 1000,
+        "lag_max_ms": lag_samples[-1] * 1000,
+        "tick_p99_ms": tick_delays[int(len(tick_delays) * 0.99)] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Retraso del event loop con y sin analítica en procesos")
+    parser.add_argument("--sims", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=6.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="segundos entre lotes de analítica")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print("🔬 BENCHMARK DE ANALÍTICA FUERA DEL EVENT LOOP")
+    print("=" * 78)
+    print(f"{args.sims} conductoras, tick de {UPDATE_INTERVAL * 1000:.0f} ms, "
+          f"analítica cada {args.interval}s ({args.workers} procesos)")
+    print(f"{'modo':>8} {'lotes':>6} {'lote ms':>8} {'lag p50 ms':>11} {'lag p99 ms':>11} "
+          f"{'lag máx ms':>11} {'tick p99 ms':>12}")
+    for mode in ("off", "inline", "process"):
+        r = await run_mode(mode, args.sims, args.duration, args.interval, args.workers)
+        print(f"{r['mode']:>8} {r['runs']:>6} {r['analysis_ms']:>8.1f} {r['lag_p50_ms']:>11.2f} "
+              f"{r['lag_p99_ms']:>11.2f} {r['lag_max_ms']:>11.2f} {r['tick_p99_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark del broadcast WebSocket - Confianza al Volante
+100 clientes locales en el mismo proceso (WebSockets simulados con un
+retardo por envío): 99 rápidos y uno lento. Compara el broadcast anterior
+(json.dumps + send_text secuencial a cada cliente) con broadcast.py
+(serializar una vez + colas acotadas por cliente) y mide cuánto tarda la
+llamada del tick y cuántos frames reciben los clientes rápidos.
+
+Después compara, con payloads de tick como los de main_data_loop (frames
+de build_sim_frame + métricas del procesador), los bytes por tick y el
+coste de codificar de cada formato que sirve el WebSocket: JSON completo,
+binario (wire_format.py), delta (delta_stream.py) y tema "dashboard"
+(topics.py). La paridad de cada formato está en las pruebas.
+
+Uso:
+    python benchmarks/bench_broadcast.py --clients 100 --ticks 40
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+sys.path.append(str(Path(__file__).parent.parent))
+
+from broadcast import ConnectionManager
+from data_processor import DriverPerformanceProcessor
+from delta_stream import DeltaEncoder
+from demo_simulator import DemoSimulator
+from simhub_connector import build_sim_frame
+from topics import TopicCache
+from wire_format import encode_frame
+
+UPDATE_INTERVAL = 0.05
+FORMAT_SIM_COUNTS = (5, 50)
+FORMAT_TICKS = 200
+FAST_DELAY = 0.0  # el envío solo cede el control una vez (red local sin congestión)
+SLOW_DELAYS = (0.0, 0.05, 0.2, 1.0)
+
+
+class LocalClient:
+    """WebSocket simulado: cada envío tarda `delay` segundos"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def send_bytes(self, message: bytes):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+
+class LegacyConnectionManager:
+    """Broadcast anterior: serializa y espera a cada cliente en orden"""
+
+    def __init__(self):
+        self.active_connections = set()
+
+    async def connect(self, websocket):
+        await websocket.accept()
+        self.active_connections.add(websocket)
+
+    def disconnect(self, websocket):
+        self.active_connections.discard(websocket)
+
+    async def broadcast_data(self, data: dict):
+        message = json.dumps(data)
+        for connection in self.active_connections:
+            await connection.send_text(message)
+
+
+def build_payload(demo: DemoSimulator) -> dict:
+    return {
+        "timestamp": time.time(),
+        "simulators": {sim_id: {"raw_data": data, "metrics": {}, "pilot_name": sim_id}
+                       for sim_id, data in demo.generate_all_data().items()},
+        "summary": {}
+    }
+
+
+def record_payloads(sims: int, ticks: int) -> list:
+    """Payloads de `ticks` ticks consecutivos con la forma de main_data_loop"""
+    demo = DemoSimulator(sims)
+    processor = DriverPerformanceProcessor()
+    game_keys = ("SpeedKmh", "Rpms", "Gear", "SteeringAngle", "Throttle", "Brake")
+    now = time.time()
+    payloads = []
+    for tick in range(ticks):
+        demo.start_time = now - tick * UPDATE_INTERVAL
+        frames = {}
+        for sim_id, data in demo.generate_all_data().items():
+            timestamp = now + tick * UPDATE_INTERVAL
+            if data["connected"]:
+                frame = build_sim_frame(sim_id, {key: data[key] for key in game_keys}, True, True, timestamp)
+            else:
+                frame = {**data, "timestamp": timestamp}
+            frames[sim_id] = frame
+            processor.update_data(sim_id, frame)
+        snapshot = processor.snapshot()
+        payloads.append({
+            "timestamp": tick * UPDATE_INTERVAL,
+            "simulators": {
+                sim_id: {"raw_data": frame, "metrics": snapshot.metrics.get(sim_id, {}),
+                         "pilot_name": f"Piloto {sim_id.split('_')[-1]}"}
+                for sim_id, frame in frames.items()
+            },
+            "summary": snapshot.summary
+        })
+    return payloads
+
+
+def measure_formats(payloads: list) -> dict:
+    """Bytes y µs medios por tick de cada formato"""
+    encoder = DeltaEncoder()
+
+    def delta(payload):
+        frame = encoder.encode(payload)
+        return frame.keyframe() if frame.is_keyframe else frame.delta
+
+    formats = {
+        "json": json.dumps,
+        "binario": encode_frame,
+        "delta": delta,
+        "dashboard": lambda payload: TopicCache(payload).get("dashboard"),
+    }
+    result = {}
+    for name, encode in formats.items():
+        size = 0
+        start = time.perf_counter()
+        for payload in payloads:
+            size += len(encode(payload))
+        result[name] = (size / len(payloads), (time.perf_counter() - start) / len(payloads) * 1e6)
+    return result
+
+
+async def run(manager, clients: int, slow_delay: float, ticks: int) -> dict:
+    sockets = [LocalClient(FAST_DELAY) for _ in range(clients - 1)] + [LocalClient(slow_delay)]
+    for socket in sockets:
+        await manager.connect(socket)
+    demo = DemoSimulator(5)
+
+    loop = asyncio.get_event_loop()
+    durations = []
+    started = loop.time()
+    next_tick = started
+    for _ in range(ticks):
+        payload = build_payload(demo)
+        start = time.perf_counter()
+        await manager.broadcast_data(payload)
+        durations.append(time.perf_counter() - start)
+        next_tick += UPDATE_INTERVAL
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    elapsed = loop.time() - started
+    await asyncio.sleep(UPDATE_INTERVAL)
+
+    for socket in sockets:
+        manager.disconnect(socket)
+    fast = [socket.received for socket in sockets[:-1]]
+    return {
+        "broadcast_p50_ms": statistics.median(durations) * 1000,
+        "broadcast_max_ms": max(durations) * 1000,
+        "tick_rate": ticks / elapsed,
+        "fast_received": min(fast),
+        "slow_received": sockets[-1].received
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Broadcast secuencial frente a colas por cliente")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=40)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print("📡 BENCHMARK DE BROADCAST WEBSOCKET")
+    print("=" * 86)
+    print(f"{args.clients} clientes ({args.clients - 1} rápidos + 1 lento), {args.ticks} ticks de "
+          f"{UPDATE_INTERVAL * 1000:.0f} ms")
+    print(f"{'lento ms':>9} {'modo':>10} {'broadcast p50 ms':>17} {'máx ms':>8} {'ticks/s':>8} "
+          f"{'rápidos recibidos':>18} {'lento':>6}")
+    for slow_delay in SLOW_DELAYS:
+        for name, manager in (("secuencial", LegacyConnectionManager()), ("colas", ConnectionManager())):
+            r = await run(manager, args.clients, slow_delay, args.ticks)
+            print(f"{slow_delay * 1000:>9.0f} {name:>10} {r['broadcast_p50_ms']:>17.2f} {r['broadcast_max_ms']:>8.2f} "
+                  f"{r['tick_rate']:>8.1f} {r['fast_received']:>18} {r['slow_received']:>6}")
+
+    print()
+    print(f"📦 FORMATOS DEL WEBSOCKET ({FORMAT_TICKS} ticks)")
+    print("=" * 86)
+    print(f"{'sims':>5} {'formato':>10} {'B/tick':>9} {'KB/s':>8} {'µs/tick':>9}")
+    for sims in FORMAT_SIM_COUNTS:
+        for name, (size, encode_us) in measure_formats(record_payloads(sims, FORMAT_TICKS)).items():
+            print(f"{sims:>5} {name:>10} {size:>9.0f} {size / UPDATE_INTERVAL / 1024:>8.1f} {encode_us:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
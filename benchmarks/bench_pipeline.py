@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-to-end del pipeline - Confianza al Volante
+Ejecuta el bucle real de backend/main.py (SimHubConnector + procesador +
+broadcast) contra el emulador de SimHub y mide ticks por segundo, frames
+HTTP servidos y el retraso del event loop con la concurrencia acotada de
+SimHubConnector (MAX_CONCURRENT_FETCHES).
+
+Con --subprocess-emulators los emuladores corren en subprocesos (25 sims
+cada uno) para que su CPU no contamine el retraso del event loop medido en
+el backend a 50 o 200 simuladores.
+
+Uso:
+    python benchmarks/bench_pipeline.py --sims 5 --duration 10 --error-rate 0.02
+    python benchmarks/bench_pipeline.py --sims 200 --subprocess-emulators --max-concurrency 16
+"""
+
+import asyncio
+import logging
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+sys.path.append(str(Path(__file__).parent))
+
+from simhub_emulator import build_arg_parser, emulator_from_args
+
+EMULATOR = Path(__file__).parent / "simhub_emulator.py"
+# Simuladores por subproceso emulador
+SIMS_PER_EMULATOR = 25
+
+
+async def measure_loop_lag(samples: list, interval: float = 0.005):
+    """Mide cuánto se retrasa el event loop respecto a un sleep corto"""
+    loop = asyncio.get_event_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run_main_loop(urls: dict, duration: float, fetch_mode: str = "poller",
+                        max_concurrency: int = None) -> dict:
+    """Ejecuta main_data_loop contra `urls` durante `duration` segundos"""
+    import main
+    from simhub_connector import SimHubConnector
+
+    main.config.SIM_URLS = urls
+    main.config.FETCH_MODE = fetch_mode
+    main.app_state["running"] = True
+    main.app_state["stats"]["total_updates"] = 0
+    connector = SimHubConnector(connect_timeout=main.config.CONNECT_TIMEOUT,
+                                read_timeout=main.config.READ_TIMEOUT,
+                                pool_limit=main.config.POOL_LIMIT,
+                                pool_limit_per_host=main.config.POOL_LIMIT_PER_HOST,
+                                max_concurrency=max_concurrency or main.config.MAX_CONCURRENT_FETCHES,
+                                stale_ttl=main.config.STALE_TTL)
+    await connector.__aenter__()
+    main.connector = connector
+    if fetch_mode == "poller":
+        connector.start_polling(urls, main.config.UPDATE_INTERVAL)
+
+    lag_samples = []
+    lag_task = asyncio.create_task(measure_loop_lag(lag_samples))
+    loop_task = asyncio.create_task(main.main_data_loop())
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - started
+
+    main.app_state["running"] = False
+    await loop_task
+    lag_task.cancel()
+    requests = sum(h["requests"] for h in connector.get_pool_stats()["hosts"].values())
+    await connector.__aexit__(None, None, None)
+
+    lag_samples.sort()
+    return {
+        "sims": len(urls),
+        "ticks_per_s": main.app_state["stats"]["total_updates"] / elapsed,
+        "frames_per_s": requests / elapsed,
+        "connected": main.app_state["stats"]["connected_sims"],
+        "lag_p50_ms": statistics.median(lag_samples) * 1000,
+        "lag_p99_ms": lag_samples[int(len(lag_samples) * 0.99)] * 1000,
+        "lag_max_ms": lag_samples[-1] * 1000,
+    }
+
+
+async def run_pipeline(args, duration: float, fetch_mode: str = "poller",
+                       max_concurrency: int = None, **overrides) -> dict:
+    """Levanta el emulador en este proceso y ejecuta main_data_loop contra él"""
+    emulator = emulator_from_args(args, **overrides)
+    await emulator.start()
+    try:
+        return await run_main_loop(emulator.urls, duration, fetch_mode, max_concurrency)
+    finally:
+        await emulator.stop()
+
+
+async def start_emulators(args) -> list:
+    """Lanza los subprocesos emuladores y espera a que todos estén escuchando"""
+    processes = []
+    for first in range(0, args.sims, SIMS_PER_EMULATOR):
+        count = min(SIMS_PER_EMULATOR, args.sims - first)
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, str(EMULATOR), "--sims", str(count),
+            "--base-port", str(args.base_port + first), "--host", args.host,
+            "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+            "--error-rate", str(args.error_rate), "--dropout-rate", str(args.dropout_rate),
+            "--dropout-s", str(args.dropout_s), "--opponents", str(args.opponents),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        processes.append(process)
+
+    for process in processes:
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                raise RuntimeError("El emulador terminó antes de arrancar")
+            if "EMULADOR DE SIMHUB ACTIVO" in line.decode("utf-8", "replace"):
+                break
+    return processes
+
+
+async def run_pipeline_subprocess(args, duration: float, fetch_mode: str = "poller",
+                                  max_concurrency: int = None) -> dict:
+    """Como run_pipeline, con los emuladores en subprocesos"""
+    processes = await start_emulators(args)
+    try:
+        urls = {f"sim_{i + 1}": f"http://{args.host}:{args.base_port + i}/api/getgamedata"
+                for i in range(args.sims)}
+        return await run_main_loop(urls, duration, fetch_mode, max_concurrency)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            await process.wait()
+
+
+def print_results(results: list):
+    print(f"{'sims':>5} {'ticks/s':>8} {'frames/s':>9} {'conectados':>11} "
+          f"{'lag p50 ms':>11} {'lag p99 ms':>11} {'lag máx ms':>11}")
+    for r in results:
+        print(f"{r['sims']:>5} {r['ticks_per_s']:>8.1f} {r['frames_per_s']:>9.1f} "
+              f"{r['connected']:>11} {r['lag_p50_ms']:>11.2f} {r['lag_p99_ms']:>11.2f} "
+              f"{r['lag_max_ms']:>11.2f}")
+
+
+async def main():
+    parser = build_arg_parser("Benchmark end-to-end del pipeline contra el emulador")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--fetch-mode", choices=("poller", "gather"), default="poller")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="Peticiones en vuelo como máximo (por defecto MAX_CONCURRENT_FETCHES)")
+    parser.add_argument("--subprocess-emulators", action="store_true",
+                        help=f"Emuladores en subprocesos de {SIMS_PER_EMULATOR} sims")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    import main as backend_main
+    max_concurrency = args.max_concurrency or backend_main.config.MAX_CONCURRENT_FETCHES
+
+    print("🏁 BENCHMARK END-TO-END DEL PIPELINE")
+    print("=" * 72)
+    print(f"Emulador{'es en subprocesos' if args.subprocess_emulators else ''}: {args.sims} sims, "
+          f"latencia {args.latency_ms}±{args.jitter_ms} ms, errores {args.error_rate:.0%}, "
+          f"caídas {args.dropout_rate}/s; modo {args.fetch_mode}, máx. {max_concurrency} "
+          f"peticiones en vuelo, duración {args.duration:.0f}s")
+    run = run_pipeline_subprocess if args.subprocess_emulators else run_pipeline
+    print_results([await run(args, args.duration, args.fetch_mode, max_concurrency)])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark del procesador de métricas - Confianza al Volante
+Alimenta DriverPerformanceProcessor con el backend "python" y el "numpy"
+con los mismos frames (DemoDriver, con desconexiones y eventos extremos) y
+mide el coste por tick como en main_data_loop (update_data de todos los
+simuladores + snapshot) de 5 a 500 conductoras. La paridad entre backends
+y con el cálculo original está en las pruebas (test_numpy_engine.py,
+test_streaming_metrics.py).
+"""
+
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data_processor import DriverPerformanceProcessor
+from demo_simulator import DemoSimulator
+from numpy_engine import HAS_NUMPY
+
+SIM_COUNTS = (5, 50, 200, 500)
+TICKS = 200
+
+
+def record_ticks(sims: int, ticks: int, seed: int = 3) -> list:
+    """Frames de `ticks` ticks a 20 Hz para `sims` conductoras"""
+    random.seed(seed)
+    demo = DemoSimulator(sims)
+    recorded = []
+    for tick in range(ticks):
+        demo.start_time = time.time() - tick * 0.05
+        recorded.append(demo.generate_all_data())
+    return recorded
+
+
+def run_tick(processor: DriverPerformanceProcessor, frames: dict):
+    for sim_id, data in frames.items():
+        processor.update_data(sim_id, data)
+    return processor.snapshot()
+
+
+def time_backend(backend: str, recorded: list) -> float:
+    processor = DriverPerformanceProcessor(backend=backend)
+    for frames in recorded[:20]:
+        run_tick(processor, frames)
+    start = time.perf_counter()
+    for frames in recorded[20:]:
+        run_tick(processor, frames)
+    return (time.perf_counter() - start) / (len(recorded) - 20)
+
+
+def main():
+    logging.disable(logging.INFO)
+    print("🔢 BENCHMARK DEL PROCESADOR DE MÉTRICAS")
+    print("=" * 60)
+    if not HAS_NUMPY:
+        print("⚠️ NumPy no está instalado: solo el backend Python")
+    print(f"{'sims':>5} {'python ms/tick':>15} {'numpy ms/tick':>14} {'aceleración':>12}")
+    for sims in SIM_COUNTS:
+        recorded = record_ticks(sims, TICKS)
+        python_t = time_backend("python", recorded)
+        if not HAS_NUMPY:
+            print(f"{sims:>5} {python_t * 1000:>15.2f}")
+            continue
+        numpy_t = time_backend("numpy", recorded)
+        print(f"{sims:>5} {python_t * 1000:>15.2f} {numpy_t * 1000:>14.2f} {python_t / numpy_t:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
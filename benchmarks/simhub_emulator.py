@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Emulador de SimHub - Confianza al Volante
+Sirve /api/getgamedata en N puertos con payloads realistas (NewData/OldData)
+generados por los DemoDriver de demo_simulator.py, con latencia, jitter,
+errores HTTP y caídas configurables. Permite probar y medir el camino HTTP
+real de simhub_connector.py sin simuladores físicos.
+
+Uso:
+    python benchmarks/simhub_emulator.py --sims 5 --base-port 8890 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from aiohttp import web
+
+# Agregar la raíz del proyecto al path (demo_simulator.py)
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from demo_simulator import DemoDriver
+from simhub_payloads import build_getgamedata_payload
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(document):
+        return json.dumps(document).encode("utf-8")
+
+DRIVER_STYLES = ("expert", "calm", "normal", "aggressive", "nervous")
+# Cuánto "cuelga" una petición durante una caída (el cliente hará timeout)
+DROPOUT_HANG_S = 30.0
+
+
+class EmulatedRig:
+    """Un simulador emulado: un DemoDriver detrás de un endpoint de SimHub"""
+
+    def __init__(self, sim_id: str, style: str, start_time: float, opponents: int,
+                 latency_ms: float, jitter_ms: float, error_rate: float,
+                 dropout_rate: float, dropout_s: float):
+        self.sim_id = sim_id
+        self.driver = DemoDriver(sim_id, style)
+        self.start_time = start_time
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.dropout_rate = dropout_rate
+        self.dropout_s = dropout_s
+        self.dropout_until = 0.0
+        self.last_dropout_check = time.monotonic()
+        self.stats = {"requests": 0, "errors": 0, "dropped": 0}
+
+        # Documento base: solo se actualiza la telemetría en cada petición
+        self.document = build_getgamedata_payload(
+            self.driver.generate_telemetry(0.0), seed=int(sim_id.split("_")[1]), opponents=opponents
+        )
+
+    def _in_dropout(self, now: float) -> bool:
+        """Decide (por segundo transcurrido) si el rig entra en una caída"""
+        elapsed = now - self.last_dropout_check
+        self.last_dropout_check = now
+        if now < self.dropout_until:
+            return True
+        if self.dropout_rate > 0 and random.random() < self.dropout_rate * elapsed:
+            self.dropout_until = now + self.dropout_s
+            return True
+        return False
+
+    def render(self) -> bytes:
+        """Serializa el documento con la telemetría actual del conductor"""
+        telemetry = self.driver.generate_telemetry(time.time() - self.start_time)
+        new_data = self.document["NewData"]
+        new_data["SpeedKmh"] = telemetry["SpeedKmh"]
+        new_data["Rpms"] = telemetry["Rpms"]
+        new_data["Gear"] = str(telemetry["Gear"])
+        new_data["SteeringAngle"] = telemetry["SteeringAngle"]
+        new_data["Throttle"] = telemetry["Throttle"] * 100.0
+        new_data["Brake"] = telemetry["Brake"] * 100.0
+        return _dumps(self.document)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        if self._in_dropout(time.monotonic()):
+            self.stats["dropped"] += 1
+            await asyncio.sleep(DROPOUT_HANG_S)
+            raise web.HTTPServiceUnavailable()
+
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            raise web.HTTPInternalServerError()
+
+        return web.Response(body=self.render(), content_type="application/json")
+
+
+class SimHubEmulator:
+    """Conjunto de rigs emulados, cada uno en su propio puerto"""
+
+    def __init__(self, sims: int = 5, base_port: int = 8890, host: str = "127.0.0.1",
+                 latency_ms: float = 2.0, jitter_ms: float = 1.0, error_rate: float = 0.0,
+                 dropout_rate: float = 0.0, dropout_s: float = 3.0, opponents: int = 19):
+        """
+        Args:
+            sims: Número de simuladores emulados
+            base_port: Puerto del primero (los demás son consecutivos)
+            host: Dirección de escucha
+            latency_ms: Latencia media añadida a cada respuesta
+            jitter_ms: Variación uniforme de la latencia (±)
+            error_rate: Probabilidad de responder HTTP 500
+            dropout_rate: Caídas por segundo (el rig deja de responder)
+            dropout_s: Duración de cada caída
+            opponents: Oponentes por documento (controla el tamaño del payload)
+        """
+        self.host = host
+        self.base_port = base_port
+        start_time = time.time()
+        self.rigs: List[EmulatedRig] = [
+            EmulatedRig(f"sim_{i + 1}", DRIVER_STYLES[i % len(DRIVER_STYLES)], start_time,
+                        opponents, latency_ms, jitter_ms, error_rate, dropout_rate, dropout_s)
+            for i in range(sims)
+        ]
+        self._runners: List[web.AppRunner] = []
+
+    @property
+    def urls(self) -> Dict[str, str]:
+        """URLs {sim_id: url} listas para SimHubConnector"""
+        return {
+            rig.sim_id: f"http://{self.host}:{self.base_port + i}/api/getgamedata"
+            for i, rig in enumerate(self.rigs)
+        }
+
+    async def start(self) -> None:
+        for i, rig in enumerate(self.rigs):
+            app = web.Application()
+            app.router.add_get("/api/getgamedata", rig.handle)
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, self.host, self.base_port + i).start()
+            self._runners.append(runner)
+
+    async def stop(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {rig.sim_id: dict(rig.stats) for rig in self.rigs}
+
+
+def build_arg_parser(description: str = "Emulador de SimHub multi-puerto") -> argparse.ArgumentParser:
+    """Parser con las opciones del emulador (reutilizable por los benchmarks)"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sims", type=int, default=5)
+    parser.add_argument("--base-port", type=int, default=8890)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--dropout-rate", type=float, default=0.0)
+    parser.add_argument("--dropout-s", type=float, default=3.0)
+    parser.add_argument("--opponents", type=int, default=19)
+    return parser
+
+
+def emulator_from_args(args: argparse.Namespace, **overrides) -> SimHubEmulator:
+    """Crea un emulador a partir de las opciones de línea de comandos"""
+    options = dict(sims=args.sims, base_port=args.base_port, host=args.host,
+                   latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                   error_rate=args.error_rate, dropout_rate=args.dropout_rate,
+                   dropout_s=args.dropout_s, opponents=args.opponents)
+    options.update(overrides)
+    return SimHubEmulator(**options)
+
+
+async def main():
+    args = build_arg_parser().parse_args()
+    emulator = emulator_from_args(args)
+    await emulator.start()
+
+    print("🛰️ EMULADOR DE SIMHUB ACTIVO")
+    print("=" * 60)
+    print("Variables de entorno para backend/main.py:")
+    for i, url in enumerate(emulator.urls.values(), start=1):
+        print(f"  SIM_{i}_URL={url}")
+    print(f"  o bien: SIM_COUNT={len(emulator.rigs)} SIM_BASE_PORT={emulator.base_port} "
+          f"SIM_URL_TEMPLATE=http://{emulator.host}:{{port}}/api/getgamedata")
+    print("⏹️  Presiona Ctrl+C para detener")
+
+    try:
+        while True:
+            await asyncio.sleep(10)
+            totals = {key: sum(s[key] for s in emulator.get_stats().values())
+                      for key in ("requests", "errors", "dropped")}
+            print(f"📊 peticiones: {totals['requests']}, errores: {totals['errors']}, "
+                  f"caídas: {totals['dropped']}")
+    finally:
+        await emulator.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Emulador detenido")
@@ -0,0 +1,159 @@
+"""
+Payloads de SimHub para benchmarks - Confianza al Volante
+Genera documentos con la forma de /api/getgamedata (GameRunning, NewData,
+OldData...) a partir de un frame de telemetría, con el mismo volumen de
+propiedades que devuelve SimHub con un juego activo.
+"""
+
+import json
+import random
+from typing import Dict, List
+
+# Propiedades de NewData que no usa el conector pero que SimHub siempre envía
+_TYRE_CORNERS = ("FrontLeft", "FrontRight", "RearLeft", "RearRight")
+_PER_TYRE_PROPERTIES = (
+    "TyreTemperature", "TyreTemperatureInner", "TyreTemperatureMiddle",
+    "TyreTemperatureOuter", "TyrePressure", "TyreWear", "TyreDirtyLevel",
+    "BrakeTemperature", "SuspensionTravel", "SuspensionVelocity",
+    "WheelSlip", "WheelRotationSpeed", "TyreCoreTemperature",
+)
+_SCALAR_PROPERTIES = (
+    "AccelerationHeave", "AccelerationSurge", "AccelerationSway",
+    "OrientationPitch", "OrientationRoll", "OrientationPitchAcceleration",
+    "OrientationRollAcceleration", "OrientationYawAcceleration",
+    "GlobalAccelerationG", "LocalAccelerationX", "LocalAccelerationY",
+    "LocalAccelerationZ", "MaxRpm", "IdleRpm", "MaxSpeedKmh", "Clutch",
+    "Handbrake", "Fuel", "FuelPercent", "MaxFuel", "EstimatedFuelRemaingLaps",
+    "WaterTemperature", "OilTemperature", "OilPressure", "EngineTorque",
+    "TurboPercent", "Turbo", "MaxTurbo", "ERSStored", "ERSPercent", "ERSMax",
+    "DRSAvailable", "DRSEnabled", "ABSActive", "ABSLevel", "TCActive",
+    "TCLevel", "BrakeBias", "PitLimiterOn", "IsInPit", "IsInPitLane",
+    "CompletedLaps", "CurrentLap", "TotalLaps", "Position", "PlayerCount",
+    "TrackPositionPercent", "TrackLength", "SessionTimeLeft", "RemainingLaps",
+    "AirTemperature", "RoadTemperature", "CarDamage1", "CarDamage2",
+    "CarDamage3", "CarDamage4", "CarDamage5", "CarDamageAvg", "CarDamageMax",
+    "SpotterCarLeft", "SpotterCarRight", "PushToPassActive", "Flag_Yellow",
+    "Flag_Blue", "Flag_Green", "Flag_White", "Flag_Black", "Flag_Checkered",
+)
+_STRING_PROPERTIES = {
+    "CarModel": "Mercedes-AMG F1 W15",
+    "CarClass": "F1",
+    "CarId": "mercedes_w15",
+    "TrackName": "Monaco",
+    "TrackCode": "monaco",
+    "TrackConfig": "Grand Prix",
+    "SessionTypeName": "Race",
+    "PlayerName": "Piloto",
+    "TyreCompoundName": "Soft",
+    "CurrentLapTime": "00:01:12.4530000",
+    "LastLapTime": "00:01:14.1020000",
+    "BestLapTime": "00:01:13.8870000",
+}
+
+
+def _opponent(rng: random.Random, index: int) -> Dict:
+    """Entrada de la lista de oponentes de SimHub"""
+    return {
+        "Name": f"Driver {index}",
+        "Id": f"driver_{index}",
+        "CarName": "F1 2024",
+        "CarClass": "F1",
+        "Position": index + 1,
+        "IsPlayer": index == 0,
+        "IsConnected": True,
+        "IsCarInPit": False,
+        "IsCarInPitLane": False,
+        "CurrentLap": rng.randint(1, 78),
+        "CurrentLapTime": "00:00:41.2200000",
+        "LastLapTime": "00:01:14.3350000",
+        "BestLapTime": "00:01:13.9990000",
+        "GaptoPlayer": round(rng.uniform(-30, 30), 3),
+        "GaptoLeader": round(rng.uniform(0, 60), 3),
+        "TrackPositionPercent": round(rng.random(), 5),
+        "Speed": round(rng.uniform(80, 290), 2),
+        "Coordinates": [round(rng.uniform(-500, 500), 3) for _ in range(3)],
+        "FrontTyreCompound": "Soft",
+        "RearTyreCompound": "Soft",
+    }
+
+
+def build_game_data(telemetry: Dict, rng: random.Random, opponents: int) -> Dict:
+    """Construye el bloque NewData/OldData a partir de un frame de telemetría"""
+    game_data: Dict = {
+        "SpeedKmh": telemetry.get("SpeedKmh", 0.0),
+        "Rpms": telemetry.get("Rpms", 0.0),
+        "Gear": str(telemetry.get("Gear", 0)),
+        "Throttle": telemetry.get("Throttle", 0.0) * 100.0,
+        "Brake": telemetry.get("Brake", 0.0) * 100.0,
+        "SteeringAngle": telemetry.get("SteeringAngle", 0.0),
+        "OrientationYaw": round(rng.uniform(-180, 180), 4),
+        "YawChangeVelocity": round(rng.uniform(-2, 2), 4),
+    }
+    for prop in _SCALAR_PROPERTIES:
+        game_data[prop] = round(rng.uniform(0, 100), 6)
+    for prop in _PER_TYRE_PROPERTIES:
+        for corner in _TYRE_CORNERS:
+            game_data[f"{prop}{corner}"] = round(rng.uniform(0, 120), 6)
+    game_data.update(_STRING_PROPERTIES)
+    game_data["CarCoordinates"] = [round(rng.uniform(-500, 500), 4) for _ in range(3)]
+    game_data["Opponents"] = [_opponent(rng, i) for i in range(opponents)]
+    game_data["OpponentsAheadOnTrack"] = game_data["Opponents"][:3]
+    game_data["OpponentsBehindOnTrack"] = game_data["Opponents"][3:6]
+    return game_data
+
+
+def build_getgamedata_payload(telemetry: Dict, seed: int = 0, opponents: int = 19,
+                              connected: bool = True) -> Dict:
+    """
+    Construye un documento con la forma de /api/getgamedata
+
+    Args:
+        telemetry: Frame con SpeedKmh, Rpms, Gear, SteeringAngle, Throttle (0-1), Brake (0-1)
+        seed: Semilla para los valores de relleno
+        opponents: Número de oponentes en la lista (F1 = 19)
+        connected: Si False, devuelve el documento sin juego activo
+
+    Returns:
+        Documento listo para serializar
+    """
+    rng = random.Random(seed)
+    if not connected:
+        return {"GameRunning": False, "GameName": None, "IsGameInRace": False,
+                "GamePaused": False, "NewData": None, "OldData": None}
+
+    new_data = build_game_data(telemetry, rng, opponents)
+    old_data = build_game_data(telemetry, rng, opponents)
+    return {
+        "GameRunning": True,
+        "GameName": "F12024",
+        "IsGameInRace": True,
+        "GamePaused": False,
+        "GameInMenu": False,
+        "GameReplay": False,
+        "NewData": new_data,
+        "OldData": old_data,
+    }
+
+
+def recorded_payloads(count: int = 50) -> List[bytes]:
+    """
+    Serie de payloads serializados con telemetría variada, para benchmarks
+
+    Args:
+        count: Número de payloads a generar
+
+    Returns:
+        Lista de cuerpos HTTP (bytes) como los que devolvería SimHub
+    """
+    payloads = []
+    for i in range(count):
+        telemetry = {
+            "SpeedKmh": 120 + (i % 17) * 9.5,
+            "Rpms": 9000 + (i % 11) * 400,
+            "Gear": 1 + i % 8,
+            "SteeringAngle": ((i % 21) - 10) * 9.0,
+            "Throttle": (i % 10) / 10,
+            "Brake": ((i + 5) % 10) / 10 if i % 4 == 0 else 0.0,
+        }
+        payloads.append(json.dumps(build_getgamedata_payload(telemetry, seed=i)).encode("utf-8"))
+    return payloads
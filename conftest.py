@@ -0,0 +1,57 @@
+"""
+Utilidades compartidas por las pruebas - Confianza al Volante
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+UPDATE_INTERVAL = 0.05
+GAME_KEYS = ("SpeedKmh", "Rpms", "Gear", "SteeringAngle", "Throttle", "Brake")
+
+
+def record_payloads(sims: int, ticks: int, seed: int = 5) -> list:
+    """Payloads de `ticks` ticks consecutivos con la forma de main_data_loop"""
+    from data_processor import DriverPerformanceProcessor
+    from demo_simulator import DemoSimulator
+    from simhub_connector import build_sim_frame
+
+    random.seed(seed)
+    demo = DemoSimulator(sims)
+    processor = DriverPerformanceProcessor()
+    now = time.time()
+    payloads = []
+    for tick in range(ticks):
+        demo.start_time = now - tick * UPDATE_INTERVAL
+        frames = {}
+        for sim_id, data in demo.generate_all_data().items():
+            timestamp = now + tick * UPDATE_INTERVAL
+            if data["connected"]:
+                frame = build_sim_frame(sim_id, {key: data[key] for key in GAME_KEYS}, True, True, timestamp)
+            else:
+                frame = {**data, "timestamp": timestamp}
+            frames[sim_id] = frame
+            processor.update_data(sim_id, frame)
+        snapshot = processor.snapshot()
+        payloads.append({
+            "timestamp": tick * UPDATE_INTERVAL,
+            "simulators": {
+                sim_id: {"raw_data": frame, "metrics": snapshot.metrics.get(sim_id, {}),
+                         "pilot_name": f"Piloto {sim_id.split('_')[-1]}"}
+                for sim_id, frame in frames.items()
+            },
+            "summary": snapshot.summary
+        })
+    return payloads
+
+
+@pytest.fixture(scope="session")
+def tick_payloads() -> list:
+    """120 ticks de 5 conductoras (con desconexiones y eventos extremos)"""
+    return record_payloads(5, 120)
@@ -129,16 +129,16 @@ class DemoDriver:
         }
 
 class DemoSimulator:
-    """Simulador completo de 5 conductores"""
+    """Simulador completo de N conductores (5 por defecto)"""
     
-    def __init__(self):
-        # Crear 5 conductores con estilos diferentes
+    # Estilos en orden: experto, calmado, normal, agresivo, nervioso
+    STYLES = ("expert", "calm", "normal", "aggressive", "nervous")
+    
+    def __init__(self, num_drivers: int = 5):
+        # Crear los conductores repartiendo los estilos de forma cíclica
         self.drivers = {
-            "sim_1": DemoDriver("sim_1", "expert"),     # Conductor experto
-            "sim_2": DemoDriver("sim_2", "calm"),       # Conductor calmado
-            "sim_3": DemoDriver("sim_3", "normal"),     # Conductor normal
-            "sim_4": DemoDriver("sim_4", "aggressive"), # Conductor agresivo
-            "sim_5": DemoDriver("sim_5", "nervous")     # Conductor nervioso
+            f"sim_{i + 1}": DemoDriver(f"sim_{i + 1}", self.STYLES[i % len(self.STYLES)])
+            for i in range(num_drivers)
         }
         
         self.start_time = time.time()
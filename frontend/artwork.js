@@ -92,6 +92,9 @@ class ArtworkEngine {
             sim_5: { minX: 0.25, maxX: 0.75, minY: 0.25, maxY: 0.75 }   // Zona central expandida
         };
         
+        // Conductoras anunciadas por el backend (se actualiza al conectar)
+        this.expectedDrivers = Object.keys(this.driverColors);
+        
         this.init();
     }
     
@@ -308,8 +311,8 @@ class ArtworkEngine {
             // Agregar nuestro handler sin interferir con otros
             const artworkHandler = (event) => {
                 try {
-                    const data = JSON.parse(event.data);
-                    this.handleMessage(data);
+                    const data = WireFormat.parse(event.data, this.websocket);
+                    if (data) this.handleMessage(data);
                 } catch (error) {
                     console.error('❌ Error parseando mensaje en arte:', error);
                 }
@@ -326,27 +329,31 @@ class ArtworkEngine {
                 this.websocket.onmessage = artworkHandler;
             }
             
+            WireFormat.subscribe(this.websocket, ['art']);
             return;
         }
         
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const wsUrl = `${protocol}//${window.location.host}/ws`;
+        const wsUrl = `${protocol}//${window.location.host}/ws${WireFormat.querySuffix(window.location.search)}`;
         
         console.log(`🔌 Conectando WebSocket Arte: ${wsUrl}`);
         
         this.websocket = new WebSocket(wsUrl);
+        this.websocket.binaryType = 'arraybuffer';
         window.globalWebSocket = this.websocket; // Guardar globalmente
         
         this.websocket.onopen = () => {
             console.log('✅ WebSocket Arte conectado');
             this.connected = true;
             this.updateConnectionStatus(true);
+            // Solo lo que pinta la obra (sin raw_game_data ni resumen)
+            WireFormat.subscribe(this.websocket, ['art']);
         };
         
         this.websocket.onmessage = (event) => {
             try {
-                const data = JSON.parse(event.data);
-                this.handleMessage(data);
+                const data = WireFormat.parse(event.data, this.websocket);
+                if (data) this.handleMessage(data);
             } catch (error) {
                 console.error('❌ Error parseando mensaje:', error);
             }
@@ -374,6 +381,8 @@ class ArtworkEngine {
     }
     
     handleMessage(data) {
+        if (!WireFormat.isForTopic(data, 'art')) return;
+        
         // Mensaje inicial
         if (data.type === 'connection_established') {
             console.log('🎉 Conexión establecida:', data.message);
@@ -381,6 +390,11 @@ class ArtworkEngine {
             if (data.demo_mode) {
                 document.getElementById('demo-indicator').style.display = 'block';
             }
+            
+            if (data.config?.simulators) {
+                this.expectedDrivers = data.config.simulators;
+                this.expectedDrivers.forEach(simId => this.ensureDriver(simId));
+            }
             return;
         }
         
@@ -390,10 +404,36 @@ class ArtworkEngine {
         }
     }
     
+    /**
+     * Asignar color, posición y zona a una conductora que no está entre
+     * las 5 originales: tono por ángulo áureo y celda propia en una
+     * cuadrícula que crece con el número de conductoras
+     */
+    ensureDriver(simId) {
+        if (this.driverColors[simId]) return;
+        
+        const n = parseInt(simId.split('_').pop(), 10) || Object.keys(this.driverColors).length + 1;
+        const hue = Math.round((n * 137.508) % 360);
+        this.driverColors[simId] = { name: `Tono ${hue}°`, base: hue };
+        
+        const columns = Math.ceil(Math.sqrt(Math.max(n, this.expectedDrivers.length)));
+        const cell = 1 / columns;
+        const col = (n - 1) % columns;
+        const row = Math.floor((n - 1) / columns) % columns;
+        const position = { x: (col + 0.5) * cell, y: (row + 0.5) * cell };
+        
+        this.driverPositions[simId] = position;
+        this.currentPositions[simId] = { x: position.x, y: position.y };
+        this.targetZones[simId] = {
+            minX: col * cell, maxX: (col + 1) * cell,
+            minY: row * cell, maxY: (row + 1) * cell
+        };
+    }
+    
     updateArtwork(data) {
         // DEBUG COMPLETO: Verificar estado de todas las conductoras
         // console.log('🎨 updateArtwork llamado:', Object.keys(data.simulators || {})); // DEBUG desactivado para rendimiento
-        const expectedDrivers = ['sim_1', 'sim_2', 'sim_3', 'sim_4', 'sim_5'];
+        const expectedDrivers = this.expectedDrivers;
         const receivedDrivers = Object.keys(data.simulators);
         const missingDrivers = expectedDrivers.filter(id => !receivedDrivers.includes(id));
         
@@ -411,6 +451,8 @@ class ArtworkEngine {
         
         // TIMING HUMANO - Procesar cada conductora con velocidad humana realista
         for (const [simId, simData] of Object.entries(data.simulators)) {
+            this.ensureDriver(simId);
+            
             // DEBUG: Estado de conexión detallado
             const connected = simData.raw_data?.connected;
             const speed = simData.raw_data?.SpeedKmh || 0;
@@ -1072,15 +1114,9 @@ class ArtworkEngine {
         const calmness = metrics.calm_index || 50;
         const control = metrics.control_index || 50;
         
-        const baseHues = {
-            'sim_1': 200, // Azul - Esquina superior izquierda
-            'sim_2': 120, // Verde - Esquina superior derecha  
-            'sim_3': 50,  // Amarillo - Esquina inferior izquierda
-            'sim_4': 10,  // Rojo - Esquina inferior derecha
-            'sim_5': 280  // Violeta - Centro
-        };
-        
-        let hue = baseHues[simId] || 0;
+        // Tono base de la conductora (sim_1 azul, sim_2 verde, sim_3 amarillo,
+        // sim_4 rojo, sim_5 violeta; las demás por ángulo áureo)
+        let hue = this.driverColors[simId]?.base || 0;
         
         // Color cambia SOLO con VELOCIDAD (sin aleatoriedad)
         hue += (speed / 200) * 60; // 0-60° de shift por velocidad
@@ -1655,15 +1691,7 @@ class ArtworkEngine {
             const colorDot = artistItem.querySelector('.artist-color');
             if (colorDot) {
                 // Calcular el color actual incluyendo rebotes
-                const baseHues = {
-                    'sim_1': 200, // Azul
-                    'sim_2': 120, // Verde
-                    'sim_3': 50,  // Amarillo
-                    'sim_4': 10,  // Rojo
-                    'sim_5': 280  // Violeta
-                };
-                
-                let currentHue = baseHues[simId] || 0;
+                let currentHue = this.driverColors[simId]?.base || 0;
                 
                 // Añadir offset de rebotes si existe
                 if (this.bounceColorOffsets && this.bounceColorOffsets[simId]) {
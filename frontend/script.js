@@ -15,7 +15,8 @@ class ConfianzaAlVolante {
     constructor() {
         // Configuración
         this.config = {
-            websocketUrl: `ws://${window.location.host}/ws`,
+            // ?format=binary o ?mode=delta en la URL de la página eligen el formato
+            websocketUrl: `ws://${window.location.host}/ws${WireFormat.querySuffix(window.location.search)}`,
             reconnectDelay: 3000,
             maxReconnectAttempts: 10
         };
@@ -74,21 +75,57 @@ class ConfianzaAlVolante {
         this.elements.collectiveStrength = document.getElementById('collective-strength');
         this.elements.connectedCount = document.getElementById('connected-count');
         
-        // Referencias por simulador
-        for (let i = 1; i <= 5; i++) {
-            const simId = `sim_${i}`;
-            this.elements[simId] = {
-                container: document.getElementById(`sim-${i}`),
-                calmValue: document.getElementById(`calm-value-${i}`),
-                controlValue: document.getElementById(`control-value-${i}`),
-                speedReal: document.getElementById(`speed-real-${i}`),
-                speedNorm: document.getElementById(`speed-norm-${i}`),
-                rpmsReal: document.getElementById(`rpms-real-${i}`),
-                rpmsNorm: document.getElementById(`rpms-norm-${i}`),
-                throttleBrake: document.getElementById(`throttle-brake-${i}`),
-                connectionDot: document.querySelector(`#sim-${i} .connection-dot`)
-            };
+        this.elements.totalCount = document.getElementById('total-count');
+        
+        // Referencias por simulador (las tarjetas que ya existen en el HTML)
+        for (let i = 1; document.getElementById(`sim-${i}`); i++) {
+            this.registerSimulator(i);
+        }
+    }
+    
+    /**
+     * Guardar las referencias del DOM de un simulador
+     */
+    registerSimulator(i) {
+        this.elements[`sim_${i}`] = {
+            container: document.getElementById(`sim-${i}`),
+            calmValue: document.getElementById(`calm-value-${i}`),
+            controlValue: document.getElementById(`control-value-${i}`),
+            speedReal: document.getElementById(`speed-real-${i}`),
+            speedNorm: document.getElementById(`speed-norm-${i}`),
+            rpmsReal: document.getElementById(`rpms-real-${i}`),
+            rpmsNorm: document.getElementById(`rpms-norm-${i}`),
+            throttleBrake: document.getElementById(`throttle-brake-${i}`),
+            connectionDot: document.querySelector(`#sim-${i} .connection-dot`)
+        };
+    }
+    
+    /**
+     * Crear la tarjeta de un simulador que no está en el HTML
+     * (clonando la del piloto 1) y devolver sus referencias
+     */
+    ensureSimulator(simId) {
+        if (this.elements[simId]) return this.elements[simId];
+        
+        const i = parseInt(simId.split('_').pop(), 10);
+        const template = document.getElementById('sim-1');
+        if (!template || !Number.isInteger(i)) return null;
+        
+        const card = template.cloneNode(true);
+        card.id = `sim-${i}`;
+        card.classList.remove('connected');
+        card.querySelectorAll('[id$="-1"]').forEach(element => {
+            element.id = element.id.replace(/-1$/, `-${i}`);
+        });
+        const pilotName = card.querySelector('.pilot-name');
+        if (pilotName) {
+            pilotName.textContent = `Piloto ${i}`;
         }
+        template.parentNode.appendChild(card);
+        
+        this.registerSimulator(i);
+        this.createGauges(i);
+        return this.elements[simId];
     }
     
     
@@ -120,33 +157,42 @@ class ConfianzaAlVolante {
             ]
         };
         
+        this.gaugeConfig = gaugeConfig;
+        
         // Crear gauges para cada simulador
-        for (let i = 1; i <= 5; i++) {
-            const simId = `sim_${i}`;
+        for (let i = 1; document.getElementById(`sim-${i}`); i++) {
+            this.createGauges(i);
+        }
+    }
+    
+    /**
+     * Crear los gauges de calma y control de un simulador
+     */
+    createGauges(i) {
+        const simId = `sim_${i}`;
+        
+        // Gauge de Calma
+        const calmCanvas = document.getElementById(`calm-gauge-${i}`);
+        if (calmCanvas) {
+            const calmGauge = new Gauge(calmCanvas).setOptions(this.gaugeConfig);
+            calmGauge.maxValue = 100;
+            calmGauge.setMinValue(0);
+            calmGauge.animationSpeed = 32;
+            calmGauge.set(50);
             
-            // Gauge de Calma
-            const calmCanvas = document.getElementById(`calm-gauge-${i}`);
-            if (calmCanvas) {
-                const calmGauge = new Gauge(calmCanvas).setOptions(gaugeConfig);
-                calmGauge.maxValue = 100;
-                calmGauge.setMinValue(0);
-                calmGauge.animationSpeed = 32;
-                calmGauge.set(50);
-                
-                this.state.gauges[`${simId}_calm`] = calmGauge;
-            }
+            this.state.gauges[`${simId}_calm`] = calmGauge;
+        }
+        
+        // Gauge de Control
+        const controlCanvas = document.getElementById(`control-gauge-${i}`);
+        if (controlCanvas) {
+            const controlGauge = new Gauge(controlCanvas).setOptions(this.gaugeConfig);
+            controlGauge.maxValue = 100;
+            controlGauge.setMinValue(0);
+            controlGauge.animationSpeed = 32;
+            controlGauge.set(50);
             
-            // Gauge de Control
-            const controlCanvas = document.getElementById(`control-gauge-${i}`);
-            if (controlCanvas) {
-                const controlGauge = new Gauge(controlCanvas).setOptions(gaugeConfig);
-                controlGauge.maxValue = 100;
-                controlGauge.setMinValue(0);
-                controlGauge.animationSpeed = 32;
-                controlGauge.set(50);
-                
-                this.state.gauges[`${simId}_control`] = controlGauge;
-            }
+            this.state.gauges[`${simId}_control`] = controlGauge;
         }
     }
     
@@ -160,6 +206,7 @@ class ConfianzaAlVolante {
             this.websocket = window.globalWebSocket;
             this.state.connected = true;
             this.updateConnectionStatus(true);
+            WireFormat.subscribe(this.websocket, ['dashboard']);
             return;
         }
         
@@ -167,6 +214,7 @@ class ConfianzaAlVolante {
             console.log(`🔌 Conectando a WebSocket: ${this.config.websocketUrl}`);
             
             this.websocket = new WebSocket(this.config.websocketUrl);
+            this.websocket.binaryType = 'arraybuffer';
             window.globalWebSocket = this.websocket; // Guardar globalmente
             
             this.websocket.onopen = (event) => {
@@ -174,12 +222,14 @@ class ConfianzaAlVolante {
                 this.state.connected = true;
                 this.state.reconnectAttempts = 0;
                 this.updateConnectionStatus(true);
+                // Solo lo que pinta el dashboard (medidores y resumen)
+                WireFormat.subscribe(this.websocket, ['dashboard']);
             };
             
             this.websocket.onmessage = (event) => {
                 try {
-                    const data = JSON.parse(event.data);
-                    this.handleWebSocketMessage(data);
+                    const data = WireFormat.parse(event.data, this.websocket);
+                    if (data) this.handleWebSocketMessage(data);
                 } catch (error) {
                     console.error('❌ Error parseando mensaje WebSocket:', error);
                 }
@@ -237,6 +287,8 @@ class ConfianzaAlVolante {
      * Manejar mensajes del WebSocket
      */
     handleWebSocketMessage(data) {
+        if (!WireFormat.isForTopic(data, 'dashboard')) return;
+        
         // Actualizar estado
         this.state.lastUpdate = Date.now();
         
@@ -297,13 +349,17 @@ class ConfianzaAlVolante {
         if (this.elements.connectedCount) {
             this.elements.connectedCount.textContent = summary.connected_drivers || 0;
         }
+        
+        if (this.elements.totalCount && summary.total_drivers) {
+            this.elements.totalCount.textContent = summary.total_drivers;
+        }
     }
     
     /**
      * Actualizar un simulador individual
      */
     updateSimulator(simId, simData) {
-        const elements = this.elements[simId];
+        const elements = this.ensureSimulator(simId);
         if (!elements) return;
         
         const rawData = simData.raw_data || {};
@@ -0,0 +1,341 @@
+/**
+ * Confianza al Volante - Decodificador del formato binario del WebSocket
+ *
+ * Pareja de backend/wire_format.py. Con /ws?format=binary cada tick llega
+ * como un ArrayBuffer con registros float32 por conductora; aquí se
+ * reconstruye el mismo objeto que el JSON ({timestamp, simulators, summary})
+ * para que script.js y artwork.js no tengan que cambiar.
+ *
+ * Con /ws?mode=delta (backend/delta_stream.py) llegan keyframes y parches
+ * con número de secuencia; parse() mantiene el estado, aplica los parches y
+ * pide un resync al servidor si detecta un hueco.
+ *
+ * Uso:
+ *   websocket.binaryType = 'arraybuffer';
+ *   const data = WireFormat.parse(event.data, websocket);  // null = esperando keyframe
+ */
+
+(function (root) {
+    const MAGIC = 'CV';
+    const VERSION = 1;
+    const HEADER_SIZE = 17;
+
+    // Esquema por defecto (el servidor lo reenvía en el saludo)
+    const DEFAULT_SCHEMA = {
+        version: VERSION,
+        summary_fields: [
+            'connected_drivers', 'total_drivers', 'group_calm_avg',
+            'group_control_avg', 'group_calm_harmony', 'collective_strength'
+        ],
+        record_fields: [
+            'connected', 'speed', 'rpms', 'gear', 'steering', 'throttle', 'brake',
+            'game_speed', 'game_rpms', 'calm_index', 'control_index', 'smoothness_index',
+            'art_position', 'art_hue', 'art_saturation', 'art_lightness', 'art_thickness',
+            'art_opacity', 'event_type', 'event_intensity', 'event_speed', 'event_direction',
+            'event_impact_speed', 'event_brake_force', 'event_severity', 'event_chaos_level'
+        ],
+        enums: {
+            event_type: ['normal', 'spin', 'crash', 'emergency_brake', 'correction', 'erratic'],
+            event_direction: ['left', 'right'],
+            event_severity: ['sharp', 'violent']
+        }
+    };
+
+    // Ruta de cada campo del registro en el objeto JSON equivalente
+    const FIELD_PATHS = {
+        connected: ['raw_data', 'connected'],
+        speed: ['raw_data', 'SpeedKmh'],
+        rpms: ['raw_data', 'Rpms'],
+        gear: ['raw_data', 'Gear'],
+        steering: ['raw_data', 'SteeringAngle'],
+        throttle: ['raw_data', 'Throttle'],
+        brake: ['raw_data', 'Brake'],
+        game_speed: ['raw_data', 'raw_game_data', 'SpeedKmh'],
+        game_rpms: ['raw_data', 'raw_game_data', 'Rpms'],
+        calm_index: ['metrics', 'calm_index'],
+        control_index: ['metrics', 'control_index'],
+        smoothness_index: ['metrics', 'smoothness_index'],
+        art_position: ['metrics', 'art_parameters', 'position'],
+        art_hue: ['metrics', 'art_parameters', 'color', 0],
+        art_saturation: ['metrics', 'art_parameters', 'color', 1],
+        art_lightness: ['metrics', 'art_parameters', 'color', 2],
+        art_thickness: ['metrics', 'art_parameters', 'thickness'],
+        art_opacity: ['metrics', 'art_parameters', 'opacity'],
+        event_type: ['metrics', 'art_parameters', 'extreme_events', 'type'],
+        event_intensity: ['metrics', 'art_parameters', 'extreme_events', 'intensity'],
+        event_speed: ['metrics', 'art_parameters', 'extreme_events', 'speed'],
+        event_direction: ['metrics', 'art_parameters', 'extreme_events', 'direction'],
+        event_impact_speed: ['metrics', 'art_parameters', 'extreme_events', 'impact_speed'],
+        event_brake_force: ['metrics', 'art_parameters', 'extreme_events', 'brake_force'],
+        event_severity: ['metrics', 'art_parameters', 'extreme_events', 'severity'],
+        event_chaos_level: ['metrics', 'art_parameters', 'extreme_events', 'chaos_level']
+    };
+
+    const textDecoder = new TextDecoder('utf-8');
+
+    // Los sim_id suelen ser ASCII cortos: más rápido que TextDecoder
+    function decodeId(bytes, start, length) {
+        let ascii = true;
+        for (let i = start; i < start + length; i++) {
+            if (bytes[i] > 127) { ascii = false; break; }
+        }
+        const slice = bytes.subarray(start, start + length);
+        return ascii ? String.fromCharCode.apply(null, slice) : textDecoder.decode(slice);
+    }
+
+    // NaN (valor ausente) -> undefined, igual que una clave que no llega en el JSON
+    function num(value) {
+        return Number.isNaN(value) ? undefined : value;
+    }
+
+    function enumValue(values, code) {
+        return Number.isNaN(code) ? undefined : values[code];
+    }
+
+    // JSON Merge Patch (RFC 7386) sin modificar el estado anterior
+    function applyPatch(target, patch) {
+        const result = (target && typeof target === 'object' && !Array.isArray(target)) ? { ...target } : {};
+        for (const key in patch) {
+            const value = patch[key];
+            if (value === null) {
+                delete result[key];
+            } else if (typeof value === 'object' && !Array.isArray(value)) {
+                result[key] = applyPatch(result[key], value);
+            } else {
+                result[key] = value;
+            }
+        }
+        return result;
+    }
+
+    function isDefaultLayout(schema) {
+        return schema.record_fields.join() === DEFAULT_SCHEMA.record_fields.join();
+    }
+
+    const WireFormat = {
+        applyPatch,
+        schema: DEFAULT_SCHEMA,
+
+        // Modo delta: último estado reconstruido y su secuencia
+        stream: null,
+        resyncPending: false,
+
+        /**
+         * Parámetros para la URL del WebSocket según la página
+         * (ej. /artwork?format=binary o /?mode=delta); cadena vacía = JSON completo
+         */
+        querySuffix(search) {
+            const page = new URLSearchParams(search || '');
+            if (page.get('format') === 'binary') return '?format=binary';
+            if (page.get('mode') === 'delta') return '?mode=delta';
+            return '';
+        },
+
+        /**
+         * Decodifica un mensaje del WebSocket: texto JSON (saludo, ticks
+         * completos, keyframes o deltas) o ArrayBuffer (ticks binarios).
+         * Devuelve null si un delta no se puede aplicar (se pide un resync)
+         */
+        parse(data, websocket = null) {
+            if (typeof data !== 'string') {
+                return this.decodeFrame(data);
+            }
+            const message = JSON.parse(data);
+            if (message.wire_format) {
+                this.schema = message.wire_format;
+            }
+            if (message.type === 'keyframe') {
+                this.stream = { seq: message.seq, state: message.data };
+                this.resyncPending = false;
+                return message.data;
+            }
+            if (message.type === 'delta') {
+                return this.applyDelta(message, websocket);
+            }
+            return message;
+        },
+
+        /**
+         * Aplica un delta al estado si es el siguiente de la secuencia
+         */
+        applyDelta(message, websocket) {
+            const stream = this.stream;
+            // Mismo mensaje visto por otro manejador del mismo socket
+            if (stream && message.seq === stream.seq) {
+                return stream.state;
+            }
+            if (!stream || message.seq !== stream.seq + 1) {
+                this.stream = null;
+                this.requestResync(websocket);
+                return null;
+            }
+            stream.state = applyPatch(stream.state, message.patch);
+            stream.seq = message.seq;
+            return stream.state;
+        },
+
+        /**
+         * Pide un keyframe al servidor (una vez hasta recibirlo)
+         */
+        requestResync(websocket) {
+            if (this.resyncPending || !websocket || websocket.readyState !== 1) return;
+            console.warn('⚠️ Hueco en el flujo delta: pidiendo keyframe');
+            websocket.send(JSON.stringify({ type: 'resync' }));
+            this.resyncPending = true;
+        },
+
+        /**
+         * Suscribe el socket a temas (ej. ['dashboard'] o ['art']): el servidor
+         * envía solo esas proyecciones. Sin efecto en binario o delta
+         */
+        subscribe(websocket, topics) {
+            if (!websocket || websocket.readyState !== 1) return;
+            websocket.send(JSON.stringify({ type: 'subscribe', topics }));
+        },
+
+        /**
+         * ¿Es este mensaje para la vista? Los payloads completos no llevan tema
+         * y valen para todas; en un socket compartido cada vista ignora el resto
+         */
+        isForTopic(data, topic) {
+            return !data.topic || data.topic === topic;
+        },
+
+        /**
+         * Frame binario -> {timestamp, simulators, summary}
+         */
+        decodeFrame(data) {
+            // Float32Array necesita un ArrayBuffer propio alineado a 4 bytes
+            const buffer = ArrayBuffer.isView(data)
+                ? data.buffer.slice(data.byteOffset, data.byteOffset + data.byteLength)
+                : data;
+            const view = new DataView(buffer);
+            const magic = String.fromCharCode(view.getUint8(0), view.getUint8(1));
+            const version = view.getUint8(2);
+            const timestamp = view.getFloat64(4, true);
+            const sims = view.getUint16(12, true);
+            const fieldCount = view.getUint16(14, true);
+            const summaryCount = view.getUint8(16);
+
+            const schema = this.schema;
+            if (magic !== MAGIC || version !== schema.version || fieldCount !== schema.record_fields.length) {
+                throw new Error(`Frame binario no compatible (versión ${version}, ${fieldCount} campos)`);
+            }
+
+            // Resumen de grupo
+            let offset = HEADER_SIZE;
+            const summary = {};
+            for (let i = 0; i < summaryCount; i++) {
+                const value = view.getFloat32(offset, true);
+                offset += 4;
+                if (!Number.isNaN(value) && i < schema.summary_fields.length) {
+                    summary[schema.summary_fields[i]] = value;
+                }
+            }
+
+            // Tabla de sim_ids
+            const bytes = new Uint8Array(buffer);
+            const simIds = [];
+            for (let i = 0; i < sims; i++) {
+                const length = bytes[offset];
+                simIds.push(decodeId(bytes, offset + 1, length));
+                offset += 1 + length;
+            }
+            offset += (4 - (offset % 4)) % 4;
+
+            // Registros float32 (una sola vista sobre el bloque)
+            const records = new Float32Array(buffer, offset, sims * fieldCount);
+            const expand = isDefaultLayout(schema) ? this.expandDefault : this.expandRecord;
+            const simulators = {};
+            for (let i = 0; i < sims; i++) {
+                simulators[simIds[i]] = expand.call(this, simIds[i], records, i * fieldCount);
+            }
+            return { timestamp, simulators, summary };
+        },
+
+        /**
+         * Registro plano -> {raw_data, metrics, pilot_name} con la disposición
+         * por defecto: objetos literales (mucho más rápido que expandRecord)
+         */
+        expandDefault(simId, r, b) {
+            const enums = this.schema.enums;
+            const event = {
+                type: enumValue(enums.event_type, r[b + 18]),
+                intensity: num(r[b + 19])
+            };
+            if (!Number.isNaN(r[b + 20])) event.speed = r[b + 20];
+            if (!Number.isNaN(r[b + 21])) event.direction = enums.event_direction[r[b + 21]];
+            if (!Number.isNaN(r[b + 22])) event.impact_speed = r[b + 22];
+            if (!Number.isNaN(r[b + 23])) event.brake_force = r[b + 23];
+            if (!Number.isNaN(r[b + 24])) event.severity = enums.event_severity[r[b + 24]];
+            if (!Number.isNaN(r[b + 25])) event.chaos_level = r[b + 25];
+            return {
+                raw_data: {
+                    connected: r[b] !== 0,
+                    SpeedKmh: num(r[b + 1]),
+                    Rpms: num(r[b + 2]),
+                    Gear: Number.isNaN(r[b + 3]) ? undefined : Math.round(r[b + 3]),
+                    SteeringAngle: num(r[b + 4]),
+                    Throttle: num(r[b + 5]),
+                    Brake: num(r[b + 6]),
+                    raw_game_data: { SpeedKmh: num(r[b + 7]), Rpms: num(r[b + 8]) }
+                },
+                metrics: {
+                    calm_index: num(r[b + 9]),
+                    control_index: num(r[b + 10]),
+                    smoothness_index: num(r[b + 11]),
+                    art_parameters: {
+                        position: num(r[b + 12]),
+                        color: [num(r[b + 13]), num(r[b + 14]), num(r[b + 15])],
+                        thickness: num(r[b + 16]),
+                        opacity: num(r[b + 17]),
+                        extreme_events: event
+                    }
+                },
+                pilot_name: `Piloto ${simId.split('_').pop()}`
+            };
+        },
+
+        /**
+         * Registro plano -> {raw_data, metrics, pilot_name} para cualquier
+         * esquema (campos desconocidos se ignoran)
+         */
+        expandRecord(simId, records, base) {
+            const schema = this.schema;
+            const sim = { pilot_name: `Piloto ${simId.split('_').pop()}` };
+            const fields = schema.record_fields;
+            for (let f = 0; f < fields.length; f++) {
+                let value = records[base + f];
+                const name = fields[f];
+                const path = FIELD_PATHS[name];
+                if (Number.isNaN(value) || !path) continue;
+
+                if (schema.enums[name]) {
+                    value = schema.enums[name][value];
+                } else if (name === 'connected') {
+                    value = value !== 0;
+                } else if (name === 'gear') {
+                    value = Math.round(value);
+                }
+
+                let target = sim;
+                for (let k = 0; k < path.length - 1; k++) {
+                    const key = path[k];
+                    if (target[key] === undefined) {
+                        // Un índice numérico indica lista (el color HSL)
+                        target[key] = typeof path[k + 1] === 'number' ? [null, null, null] : {};
+                    }
+                    target = target[key];
+                }
+                target[path[path.length - 1]] = value;
+            }
+            return sim;
+        }
+    };
+
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = WireFormat;
+    } else {
+        root.WireFormat = WireFormat;
+    }
+})(typeof window !== 'undefined' ? window : this);
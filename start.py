@@ -120,6 +120,7 @@ SIM_2_URL={config['sim_urls']['sim_2']}
 SIM_3_URL={config['sim_urls']['sim_3']}
 SIM_4_URL={config['sim_urls']['sim_4']}
 SIM_5_URL={config['sim_urls']['sim_5']}
+# Más simuladores: SIM_COUNT=N con SIM_n_URL o SIM_URL_TEMPLATE (ej. http://10.0.0.{{n}}:8888/api/getgamedata)
 
 # Configuración del servidor
 SERVER_PORT={config['port']}
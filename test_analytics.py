@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la etapa de analítica - Confianza al Volante
+"""
+
+import asyncio
+import math
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from analytics import AnalyticsStage
+from data_processor import DriverPerformanceProcessor
+from spectral import spectral_smoothness
+
+
+def test_steering_smoothness_uses_processor_spectrum():
+    """La suavidad del informe usa la frecuencia y el corte del procesador"""
+    processor = DriverPerformanceProcessor(sample_rate=10.0, jitter_cutoff_hz=1.5)
+    for t in range(50):
+        processor.update_data("sim_1", {"connected": True, "timestamp": t * 0.1, "SpeedKmh": 100.0,
+                                        "SteeringAngle": 30 * math.sin(t * 0.9), "Throttle": 0.5, "Brake": 0.0})
+    stage = AnalyticsStage(processor, mode="inline")
+    result = asyncio.run(stage.run_once())
+
+    steering = processor.recent_windows(("SteeringAngle",))["sim_1"]["SteeringAngle"]
+    expected = spectral_smoothness(steering, sample_rate=10.0, cutoff_hz=1.5)
+    assert result["drivers"]["sim_1"]["steering_smoothness"] == expected
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Pruebas del broadcast WebSocket - Confianza al Volante
+Un cliente lento no frena el tick ni hace perder frames a los rápidos
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from broadcast import ConnectionManager
+
+TICKS = 20
+UPDATE_INTERVAL = 0.02
+
+
+class LocalClient:
+    """WebSocket simulado: cada envío tarda `delay` segundos"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def send_bytes(self, message: bytes):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+
+def test_fast_clients_get_every_frame_despite_a_slow_one():
+    async def scenario():
+        manager = ConnectionManager()
+        sockets = [LocalClient(0.0) for _ in range(9)] + [LocalClient(1.0)]
+        for socket in sockets:
+            await manager.connect(socket)
+        slowest = 0.0
+        for tick in range(TICKS):
+            start = time.perf_counter()
+            await manager.broadcast_data({"tick": tick, "simulators": {}, "summary": {}})
+            slowest = max(slowest, time.perf_counter() - start)
+            await asyncio.sleep(UPDATE_INTERVAL)
+        await asyncio.sleep(UPDATE_INTERVAL)
+        for socket in sockets:
+            manager.disconnect(socket)
+        return sockets, slowest
+
+    sockets, slowest = asyncio.run(scenario())
+    assert all(socket.received == TICKS for socket in sockets[:-1])
+    assert sockets[-1].received < TICKS
+    assert slowest < UPDATE_INTERVAL
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Pruebas del conector de SimHub - Confianza al Volante
+Resolución de alias de campos, extracción de telemetría y decodificación
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+sys.path.append(str(Path(__file__).parent / "benchmarks"))
+
+from simhub_connector import FIELD_CHANNELS, extract_telemetry, resolve_field_map
+from simhub_decoder import decode_game_data
+from simhub_payloads import build_getgamedata_payload, recorded_payloads
+
+
+def test_resolve_skips_null_alias():
+    """Un alias presente pero null no se elige: se usa el siguiente con datos"""
+    game_data = {"SteeringAngle": None, "YawChangeVelocity": 12.5, "SpeedKmh": 100.0}
+    field_map = dict(zip(FIELD_CHANNELS, resolve_field_map(game_data)))
+    assert field_map["SteeringAngle"] == "YawChangeVelocity"
+    assert extract_telemetry(game_data, resolve_field_map(game_data))["SteeringAngle"] == 12.5
+
+
+def test_extract_falls_back_when_cached_alias_turns_null():
+    """Mapa cacheado con SteeringAngle y un frame posterior donde llega null"""
+    field_map = resolve_field_map({"SteeringAngle": 5.0, "YawChangeVelocity": 1.0, "SpeedKmh": 100.0})
+    telemetry = extract_telemetry({"SteeringAngle": None, "YawChangeVelocity": 7.0, "SpeedKmh": 100.0}, field_map)
+    assert telemetry["SteeringAngle"] == 7.0
+    assert telemetry["SpeedKmh"] == 100.0
+
+
+def test_extract_missing_channels_are_zero():
+    telemetry = extract_telemetry({"SpeedKmh": None}, resolve_field_map({"SpeedKmh": None}))
+    assert telemetry == {"SpeedKmh": 0.0, "Rpms": 0.0, "Gear": 0, "SteeringAngle": 0.0,
+                         "Throttle": 0.0, "Brake": 0.0}
+
+
+def test_decode_matches_full_json():
+    """La proyección de decode_game_data conserva los valores de NewData"""
+    for raw in recorded_payloads(20) + [json.dumps(build_getgamedata_payload({}, connected=False)).encode()]:
+        full = json.loads(raw)
+        fast = decode_game_data(raw)
+        assert fast["GameRunning"] == full["GameRunning"]
+        for field, value in (fast["NewData"] or {}).items():
+            assert full["NewData"][field] == value, field
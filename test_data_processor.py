@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pruebas del procesador de métricas - Confianza al Volante
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from data_processor import DriverPerformanceProcessor
+from numpy_engine import HAS_NUMPY
+
+BACKENDS = ["python", pytest.param("numpy", marks=pytest.mark.skipif(not HAS_NUMPY, reason="NumPy no está instalado"))]
+
+
+def frame(**overrides) -> dict:
+    return {"connected": True, "timestamp": 1.0, "SpeedKmh": 100.0, "SteeringAngle": 0.0,
+            "Throttle": 0.5, "Brake": 0.0, "Rpms": 5000, **overrides}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_events_in_the_same_tick_are_all_counted(backend):
+    """Frenada de emergencia y trompo entre dos fotos: se pinta el trompo y se cuentan los dos"""
+    processor = DriverPerformanceProcessor(backend=backend)
+    for _ in range(15):
+        processor.update_data("event_sim", frame())
+    processor.snapshot()
+    processor.update_data("event_sim", frame(Brake=0.95))
+    processor.update_data("event_sim", frame(SteeringAngle=120.0))
+
+    reported = processor.snapshot().metrics["event_sim"]["art_parameters"]["extreme_events"]
+    assert reported["type"] == "spin"
+    assert processor.get_session_stats("event_sim")["event_sim"]["events"] == {"emergency_brake": 1, "spin": 1}
+
+
+def test_disconnected_frames_stay_out_of_the_session():
+    """Un equipo desconectado no suma frames ceros a la sesión"""
+    processor = DriverPerformanceProcessor()
+    for i in range(20):
+        processor.update_data("test_sim", frame(timestamp=100 + i * 0.05, SteeringAngle=float(i)))
+    before = processor.get_session_stats("test_sim")["test_sim"]
+    for i in range(20):
+        zeros = {"connected": False, "SpeedKmh": 0.0, "SteeringAngle": 0.0, "Throttle": 0.0}
+        processor.update_data("test_sim", frame(**zeros, timestamp=102 + i))
+        processor.update_data("offline_sim", frame(**zeros, timestamp=i))
+
+    after = processor.get_session_stats()
+    assert after["test_sim"]["frames"] == before["frames"] == 20
+    assert after["test_sim"]["histograms"] == before["histograms"]
+    assert after["test_sim"]["duration_s"] == before["duration_s"]
+    assert "offline_sim" not in after
+
+
+def test_snapshot_shared_until_new_data():
+    """Los lectores de un mismo tick reciben la misma foto, sin recalcular"""
+    processor = DriverPerformanceProcessor()
+    for i in range(12):
+        processor.update_data("sim_1", frame(timestamp=i * 0.05))
+    first = processor.snapshot()
+    assert processor.snapshot() is first
+    assert processor.get_all_metrics() is first.metrics
+
+    processor.update_data("sim_1", frame(timestamp=1.0, SteeringAngle=5.0))
+    assert processor.snapshot() is not first
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Pruebas del flujo delta del WebSocket - Confianza al Volante
+"""
+
+import asyncio
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from broadcast import ClientChannel, ConnectionManager
+from delta_stream import DEFAULT_KEYFRAME_EVERY, DeltaEncoder, apply_patch, drop_nulls
+
+WIRE_FORMAT_JS = Path(__file__).parent / "frontend" / "wire_format.js"
+
+NODE_SCRIPT = r"""
+const fs = require('fs');
+const WireFormat = require(process.argv[2]);
+const messages = fs.readFileSync(process.argv[3], 'utf-8').split('\n').filter(Boolean);
+const socket = { readyState: 1, sent: [], send(text) { this.sent.push(JSON.parse(text)); } };
+
+// Se pierde el tercer delta: el siguiente debe devolver null y pedir resync
+let gapResult;
+messages.forEach((text, i) => {
+    if (i === 3) return;
+    const data = WireFormat.parse(text, socket);
+    if (i === 4) gapResult = data;
+});
+console.log(JSON.stringify({ gap: gapResult, sent: socket.sent, state: WireFormat.stream.state }));
+"""
+
+
+def replay(payloads, keyframe_every=4):
+    """Reconstruye cada tick como el cliente (keyframe o parche) y lo devuelve"""
+    encoder = DeltaEncoder(keyframe_every=keyframe_every)
+    state = None
+    for payload in payloads:
+        frame = encoder.encode(payload)
+        message = json.loads(frame.keyframe() if frame.is_keyframe else frame.delta)
+        state = message["data"] if message["type"] == "keyframe" else apply_patch(state, message["patch"])
+        yield payload, state
+
+
+def test_round_trip_with_none_values():
+    """Los None del payload llegan como claves ausentes, también al aparecer y desaparecer"""
+    payloads = [
+        {"timestamp": 0.0, "analytics": None, "simulators": {"sim_1": {"pilot_name": None, "Gear": 3}}},
+        {"timestamp": 0.05, "analytics": {"runs": 1, "last_ms": None}, "simulators": {"sim_1": {"pilot_name": "Ana", "Gear": 3}}},
+        {"timestamp": 0.1, "analytics": {"runs": 2, "last_ms": 4.0}, "simulators": {"sim_1": {"pilot_name": None, "Gear": None}}},
+        {"timestamp": 0.15, "analytics": None, "simulators": {"sim_1": {"pilot_name": "Ana", "Gear": 4, "color": [1, None]}}},
+        {"timestamp": 0.2, "simulators": {"sim_1": {"pilot_name": "Ana", "Gear": 4}}},
+        {"timestamp": 0.25, "analytics": None, "simulators": {"sim_1": None}},
+    ]
+    for payload, state in replay(payloads):
+        assert state == drop_nulls(payload)
+
+
+def test_patches_rebuild_recorded_ticks(tick_payloads):
+    for payload, state in replay(tick_payloads, DEFAULT_KEYFRAME_EVERY):
+        assert state == json.loads(json.dumps(drop_nulls(payload)))
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="requiere Node.js")
+def test_js_client_rebuilds_and_requests_resync(tick_payloads, tmp_path):
+    """wire_format.js reconstruye el flujo y pide resync al detectar un hueco"""
+    encoder = DeltaEncoder()
+    messages = []
+    for payload in tick_payloads[:DEFAULT_KEYFRAME_EVERY + 1]:
+        frame = encoder.encode(payload)
+        messages.append(frame.keyframe() if frame.is_keyframe else frame.delta)
+    (tmp_path / "messages.jsonl").write_text("\n".join(messages), encoding="utf-8")
+    (tmp_path / "check.js").write_text(NODE_SCRIPT, encoding="utf-8")
+    result = subprocess.run(["node", str(tmp_path / "check.js"), str(WIRE_FORMAT_JS),
+                             str(tmp_path / "messages.jsonl")], capture_output=True, text=True, check=True)
+
+    client = json.loads(result.stdout)
+    assert client["gap"] is None
+    assert [message["type"] for message in client["sent"]] == ["resync"]
+    assert client["state"] == json.loads(json.dumps(drop_nulls(tick_payloads[DEFAULT_KEYFRAME_EVERY])))
+
+
+def test_full_queue_keeps_control_messages():
+    """Con la cola llena el keyframe sustituye los deltas encolados, no los acks"""
+    manager = ConnectionManager(queue_size=2)
+    websocket = object()
+    client = manager.clients[websocket] = ClientChannel(websocket, 2, "json", "delta")
+
+    asyncio.run(manager.broadcast_data({"tick": 0}))
+    manager.subscribe(websocket, ["dashboard"])
+    assert client.full()
+    asyncio.run(manager.broadcast_data({"tick": 1}))
+
+    messages = [json.loads(message) for message in client.queue]
+    assert [message["type"] for message in messages] == ["subscribed", "keyframe"]
+    assert messages[1]["data"] == {"tick": 1}
+    assert client.dropped == 1
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pruebas del motor de métricas NumPy - Confianza al Volante
+Paridad con el backend Python (varios frames por tick) y anillo espejado
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from data_processor import DriverPerformanceProcessor
+from demo_simulator import DemoSimulator
+from numpy_engine import HAS_NUMPY
+
+pytestmark = pytest.mark.skipif(not HAS_NUMPY, reason="NumPy no está instalado")
+
+# Los frames del backend Python pasan por float32 (TelemetryRingBuffer)
+TOLERANCE = 1e-3
+
+
+def record_frames(sims: int, frames: int, seed: int = 3) -> list:
+    """Frames a 20 Hz para `sims` conductoras (con desconexiones y eventos)"""
+    random.seed(seed)
+    demo = DemoSimulator(sims)
+    recorded = []
+    for frame in range(frames):
+        demo.start_time = time.time() - frame * 0.05
+        recorded.append(demo.generate_all_data())
+    return recorded
+
+
+def assert_close(expected, actual, path: str = "") -> None:
+    """Compara métricas recursivamente (floats con tolerancia, resto exacto)"""
+    if isinstance(expected, dict):
+        assert expected.keys() == actual.keys(), f"{path}: claves {expected.keys()} != {actual.keys()}"
+        for key in expected:
+            assert_close(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, (list, tuple)):
+        assert len(expected) == len(actual), path
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            assert_close(a, b, f"{path}[{i}]")
+    elif isinstance(expected, (int, float)) and not isinstance(expected, bool):
+        assert abs(expected - actual) <= TOLERANCE * max(1.0, abs(expected)), f"{path}: {expected} != {actual}"
+    else:
+        assert expected == actual, f"{path}: {expected} != {actual}"
+
+
+@pytest.mark.parametrize("frames_per_tick", [1, 3])
+def test_parity_with_python_backend(frames_per_tick):
+    """Mismas métricas, resumen y eventos de sesión con uno o varios frames por tick"""
+    python = DriverPerformanceProcessor(backend="python")
+    vectorized = DriverPerformanceProcessor(backend="numpy")
+    recorded = record_frames(20, 300)
+    events = 0
+    for start in range(0, len(recorded), frames_per_tick):
+        for frames in recorded[start:start + frames_per_tick]:
+            for sim_id, data in frames.items():
+                python.update_data(sim_id, data)
+                vectorized.update_data(sim_id, data)
+        expected = python.get_all_metrics()
+        assert_close(expected, vectorized.get_all_metrics())
+        assert_close(python.get_summary_stats(), vectorized.get_summary_stats())
+        events += sum(1 for m in expected.values() if m["art_parameters"]["extreme_events"]["type"] != "normal")
+    assert events > 0
+    expected_session = {sim_id: stats["events"] for sim_id, stats in python.get_session_stats().items()}
+    actual_session = {sim_id: stats["events"] for sim_id, stats in vectorized.get_session_stats().items()}
+    assert expected_session == actual_session
+
+
+def test_ring_wraps_between_computes():
+    """Más frames que la ventana entre dos compute(): queda la última vuelta del anillo
+
+    Sin eventos extremos: las muestras que el anillo ya pisó no se evalúan
+    """
+    python = DriverPerformanceProcessor(history_size=12, backend="python")
+    vectorized = DriverPerformanceProcessor(history_size=12, backend="numpy")
+    frames = [{"connected": True, "timestamp": i * 0.05, "SpeedKmh": 80.0 + i, "SteeringAngle": (-1) ** i * (i % 10),
+               "Throttle": (i % 7) / 7, "Brake": (i % 5) / 5, "Rpms": 4000 + 10 * i} for i in range(40)]
+    for batch in (frames[:5], frames[5:35], frames[35:]):
+        for frame in batch:
+            python.update_data("sim_1", frame)
+            vectorized.update_data("sim_1", frame)
+        assert_close(python.get_all_metrics(), vectorized.get_all_metrics())
+
+    window = vectorized.engine.windows(("SpeedKmh", "SteeringAngle"))["sim_1"]
+    assert window["SpeedKmh"] == [80.0 + i for i in range(28, 40)]
+    assert window["SteeringAngle"] == [float((-1) ** i * (i % 10)) for i in range(28, 40)]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las ventanas multi-resolución - Confianza al Volante
+"""
+
+import math
+import random
+import statistics
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from data_processor import DriverPerformanceProcessor
+from rolling_windows import TIERS, MultiResolutionWindows, WindowStats
+
+HZ = 20
+
+
+def frame(timestamp: float, steering: float, connected: bool = True) -> dict:
+    return {"connected": connected, "timestamp": timestamp, "SpeedKmh": 100.0,
+            "SteeringAngle": steering, "Throttle": 0.5, "Brake": 0.0}
+
+
+def session_stream(seconds: int, seed: int = 17) -> list:
+    rng = random.Random(seed)
+    steering, throttle, brake = 0.0, 0.5, 0.0
+    frames = []
+    for step in range(seconds * HZ):
+        steering += rng.gauss(0, 4) - steering * 0.05
+        if rng.random() < 0.05:
+            throttle, brake = (0.0, rng.uniform(0.3, 1.0)) if brake == 0.0 else (rng.uniform(0.3, 1.0), 0.0)
+        frames.append((1000.0 + step / HZ, steering, throttle, brake))
+    return frames
+
+
+def direct_metrics(frames: list) -> dict:
+    """Calma y control por nivel recorriendo todos los frames guardados"""
+    now_second = int(frames[-1][0])
+    bounds = {
+        "1s": lambda t: int(t) == now_second - 1,
+        "10s": lambda t: int(t) > now_second - 10,
+        "60s": lambda t: int(t) // 10 > now_second // 10 - 6,
+        "session": lambda t: True,
+    }
+    result = {}
+    for tier in TIERS:
+        stats = WindowStats()
+        derivatives, jerky, samples = [], 0, 0
+        previous = None
+        for frame in frames:
+            timestamp, steering, throttle, brake = frame
+            if bounds[tier](timestamp):
+                samples += 1
+                jerky += throttle > 0.1 and brake > 0.1
+                if previous is not None:
+                    derivatives.append(abs(steering - previous[1]))
+                    jerky += abs(throttle - previous[2]) > 0.3 or abs(brake - previous[3]) > 0.3
+            previous = frame
+        stats.samples, stats.jerky = samples, jerky
+        stats.d_count = len(derivatives)
+        stats.d_mean = statistics.fmean(derivatives)
+        stats.d_m2 = math.fsum((d - stats.d_mean) ** 2 for d in derivatives)
+        result[tier] = stats.to_dict()
+    return result
+
+
+def test_tiers_match_direct_calculation():
+    """Cada nivel coincide con recalcular sobre todos los frames de la sesión"""
+    frames = session_stream(11 * 60)
+    windows = MultiResolutionWindows()
+    checkpoints = {HZ * 7 - 1, HZ * 65 - 1, HZ * 601 - 1, len(frames) - 1}
+    for i, frame in enumerate(frames):
+        windows.push(*frame)
+        if i in checkpoints:
+            expected = direct_metrics(frames[:i + 1])
+            actual = windows.metrics()
+            for tier in TIERS:
+                assert expected[tier]["samples"] == actual[tier]["samples"], tier
+                for key in ("calm_index", "control_index"):
+                    assert math.isclose(expected[tier][key], actual[tier][key], abs_tol=1e-9), (tier, key)
+
+
+def test_gap_breaks_steering_continuity():
+    """El salto de volante a través de una desconexión no cuenta como derivada"""
+    processor = DriverPerformanceProcessor(backend="python")
+    for i in range(20):
+        processor.update_data("sim_1", frame(100 + i * 0.05, 0.0))
+    processor.update_data("sim_1", frame(101.0, 0.0, connected=False))
+    processor.update_data("sim_1", {**frame(101.05, 0.0), "stale_ms": 50})
+    for i in range(20):
+        processor.update_data("sim_1", frame(101.1 + i * 0.05, 90.0))
+
+    session = processor.windows["sim_1"].metrics()["session"]
+    assert session["samples"] == 40
+    assert session["calm_index"] == 100.0
+
+
+def test_last_complete_second_tier():
+    windows = MultiResolutionWindows()
+    assert windows.metrics()["1s"]["samples"] == 0
+    for i in range(30):
+        windows.push(10 + i * 0.05, 5.0 * (i % 2), 0.5, 0.0)
+
+    tiers = windows.metrics()
+    # 10.00-10.95 es el segundo completo; 11.00-11.45 sigue abierto
+    assert tiers["1s"]["samples"] == 20
+    assert tiers["10s"]["samples"] == 30
+
+    # Sin datos en el segundo anterior (hueco de varios segundos): neutral
+    windows.push(15.0, 0.0, 0.5, 0.0)
+    assert windows.metrics()["1s"] == {"calm_index": 50.0, "control_index": 50.0, "samples": 0}
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las estadísticas de sesión - Confianza al Volante
+Memoria constante y precisión de los cuantiles P²
+"""
+
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from session_stats import QUANTILES, SessionStats
+
+RATE_HZ = 20
+
+
+def make_frame(rng: random.Random, step: int) -> dict:
+    return {"SpeedKmh": max(0.0, rng.gauss(140, 40)), "SteeringAngle": rng.gauss(0, 35),
+            "Throttle": rng.random(), "Brake": 0.0, "timestamp": step / RATE_HZ}
+
+
+def make_metrics(rng: random.Random, step: int) -> dict:
+    return {
+        "calm_index": min(100.0, max(0.0, rng.gauss(65, 15))),
+        "control_index": min(100.0, max(0.0, rng.betavariate(5, 2) * 100)),
+        "art_parameters": {"extreme_events": {"type": "spin" if step % 997 == 0 else "normal"}}
+    }
+
+
+def retained_bytes(frames: int) -> int:
+    rng = random.Random(7)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    stats = SessionStats()
+    for step in range(frames):
+        stats.add_frame(make_frame(rng, step))
+        stats.add_metrics(make_metrics(rng, step))
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del stats
+    return retained
+
+
+def test_memory_does_not_grow_with_the_session():
+    """1 minuto y 10 minutos a 20 Hz ocupan lo mismo (guardar los frames serían MB)"""
+    retained_bytes(RATE_HZ)  # Cachés de la primera ejecución
+    assert abs(retained_bytes(10 * 60 * RATE_HZ) - retained_bytes(60 * RATE_HZ)) < 2048
+
+
+def test_p2_quantiles_close_to_exact():
+    rng = random.Random(11)
+    stats = SessionStats()
+    calm, control = [], []
+    for step in range(10 * 60 * RATE_HZ):
+        metrics = make_metrics(rng, step)
+        calm.append(metrics["calm_index"])
+        control.append(metrics["control_index"])
+        stats.add_metrics(metrics)
+
+    summary = stats.to_dict()
+    for name, values in (("calm", calm), ("control", control)):
+        values.sort()
+        for p in QUANTILES:
+            exact = values[int(p * (len(values) - 1))]
+            assert abs(summary[name][f"p{int(p * 100)}"] - exact) < 1.0, (name, p)
+    assert summary["events"] == {"spin": len(range(0, 10 * 60 * RATE_HZ, 997))}
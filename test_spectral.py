@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la suavidad espectral del volante - Confianza al Volante
+"""
+
+import math
+import random
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from spectral import DEFAULT_SAMPLE_RATE, spectral_smoothness, spectral_smoothness_batch
+from streaming_metrics import RollingCalm
+
+WINDOW = 50
+
+
+def test_batch_matches_direct_dft():
+    rng = random.Random(23)
+    windows = [[rng.gauss(0, 10) for _ in range(WINDOW)] for _ in range(20)]
+    direct = [spectral_smoothness(window) for window in windows]
+    batch = spectral_smoothness_batch(windows)
+    assert all(math.isclose(a, b, abs_tol=1e-6) for a, b in zip(direct, batch))
+
+
+def test_tremor_scores_below_wide_slalom():
+    """El índice de calma prefiere el temblor de poca amplitud; la suavidad espectral no"""
+    rate = DEFAULT_SAMPLE_RATE
+    slalom = [70 * math.sin(2 * math.pi * 0.6 * t / rate) for t in range(WINDOW)]
+    tremor = [10 * math.sin(2 * math.pi * 0.2 * t / rate) + 3.2 * math.sin(2 * math.pi * 7 * t / rate)
+              for t in range(WINDOW)]
+
+    calm = []
+    for window in (slalom, tremor):
+        engine = RollingCalm(WINDOW)
+        for angle in window:
+            engine.push(angle)
+        calm.append(engine.calm_index())
+    smooth = spectral_smoothness_batch([slalom, tremor])
+
+    assert calm[1] > calm[0]
+    assert smooth[0] > smooth[1]
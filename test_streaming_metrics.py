@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las métricas en streaming - Confianza al Volante
+Paridad de RollingCalm, RollingControl, ExtremeEventDetector y GroupSummary
+con el cálculo original sobre el historial completo
+"""
+
+import math
+import random
+import statistics
+import sys
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from streaming_metrics import ExtremeEventDetector, GroupSummary, RollingCalm, RollingControl
+
+NORMAL = {"type": "normal", "intensity": 0.0}
+
+
+def legacy_calm_index(window: list) -> float:
+    """calculate_calm_index original sobre la ventana de ángulos"""
+    derivatives = [abs(window[i] - window[i - 1]) for i in range(1, len(window))]
+    if len(derivatives) < 2:
+        return 50.0
+    return min(100.0, max(0.0, 100 - (statistics.stdev(derivatives) / 15.0 * 100)))
+
+
+def legacy_control_index(window: list) -> float:
+    """calculate_control_index original sobre la ventana de (acelerador, freno)"""
+    jerky = 0
+    for i, (throttle, brake) in enumerate(window):
+        if throttle > 0.1 and brake > 0.1:
+            jerky += 1
+        if i > 0:
+            prev_throttle, prev_brake = window[i - 1]
+            if abs(throttle - prev_throttle) > 0.3 or abs(brake - prev_brake) > 0.3:
+                jerky += 1
+    return min(100.0, max(0.0, 100 - (jerky / len(window) * 100)))
+
+
+def legacy_detect(history: list) -> dict:
+    """detect_extreme_events original (sin filtro)"""
+    if len(history) < 3:
+        return NORMAL
+    current, previous = history[-1], history[-2]
+    current_steering, current_speed, current_brake = current
+    prev_steering, prev_speed, _ = previous
+    steering_change = abs(current_steering - prev_steering)
+    if abs(current_steering) > 90 and current_speed > 50 and steering_change > 30:
+        return {"type": "spin", "intensity": min(1.0, (abs(current_steering) / 180) + (steering_change / 90)),
+                "direction": "left" if current_steering < 0 else "right", "speed": current_speed}
+    speed_drop = prev_speed - current_speed
+    if prev_speed > 80 and speed_drop > 60 and current_brake > 0.8:
+        return {"type": "crash", "intensity": min(1.0, speed_drop / 120),
+                "impact_speed": prev_speed, "brake_force": current_brake}
+    if current_brake > 0.9 and current_speed > 40:
+        return {"type": "emergency_brake", "intensity": current_brake * (current_speed / 100),
+                "speed": current_speed}
+    steering_3ago = history[-3][0]
+    total_steering_change = abs(current_steering - steering_3ago)
+    if (((prev_steering * current_steering < 0) or (steering_3ago * prev_steering < 0)) and
+            total_steering_change > 60 and current_speed > 30):
+        return {"type": "correction", "intensity": min(1.0, total_steering_change / 120),
+                "severity": "violent" if total_steering_change > 90 else "sharp"}
+    if len(history) >= 5:
+        steering_std = statistics.stdev(frame[0] for frame in history[-5:])
+        if steering_std > 25 and current_speed > 20:
+            return {"type": "erratic", "intensity": min(1.0, steering_std / 50), "chaos_level": steering_std}
+    return NORMAL
+
+
+def reference_filter(events: list, debounce: int, cooldown: int) -> list:
+    """Filtro debounce/cooldown escrito de la forma más directa posible"""
+    filtered = []
+    previous, streak, last_report = None, 0, {}
+    for frame, event in enumerate(events, 1):
+        if event["type"] == "normal":
+            previous, streak = None, 0
+            filtered.append(event)
+            continue
+        streak = streak + 1 if event["type"] == previous else 1
+        previous = event["type"]
+        if streak == debounce and frame >= last_report.get(event["type"], -cooldown) + cooldown:
+            last_report[event["type"]] = frame
+            filtered.append(event)
+        else:
+            filtered.append(NORMAL)
+    return filtered
+
+
+def telemetry_stream(count: int, seed: int = 5) -> list:
+    """(volante, velocidad, freno) con trompos, frenadas, choques y volante errático"""
+    rng = random.Random(seed)
+    speed, steering = 100.0, 0.0
+    frames = []
+    burst, burst_left = None, 0
+    for _ in range(count):
+        if not burst_left and rng.random() < 0.01:
+            burst, burst_left = rng.choice(("spin", "brake", "crash", "erratic")), rng.randint(5, 15)
+        brake = 0.0
+        if burst_left:
+            burst_left -= 1
+            if burst == "spin":
+                steering = rng.choice((-1, 1)) * rng.uniform(100, 180)
+            elif burst == "brake":
+                brake = rng.uniform(0.92, 1.0)
+                speed = max(45.0, speed - 3)
+            elif burst == "crash":
+                brake, speed = 0.9, (speed - 70 if speed > 85 else 120.0)
+            else:
+                steering = rng.uniform(-60, 60)
+        else:
+            steering += rng.gauss(0, 3) - steering * 0.1
+            speed = min(200.0, max(30.0, speed + rng.gauss(0, 2)))
+        frames.append((steering, speed, brake))
+    return frames
+
+
+@pytest.mark.parametrize("history_size", [50, 500])
+def test_rolling_calm_matches_stdev(history_size):
+    rng = random.Random(7)
+    engine = RollingCalm(history_size)
+    window = deque(maxlen=history_size)
+    angle = 0.0
+    for _ in range(history_size * 3):
+        angle = max(-45.0, min(45.0, angle + rng.gauss(0, 1.5) + (rng.choice((-12, 12)) if rng.random() < 0.02 else 0)))
+        engine.push(angle)
+        window.append(angle)
+        if len(window) >= 10:
+            assert math.isclose(engine.calm_index(), legacy_calm_index(list(window)), abs_tol=1e-6)
+
+
+@pytest.mark.parametrize("history_size", [50, 250])
+def test_rolling_control_matches_full_scan(history_size):
+    rng = random.Random(11)
+    engine = RollingControl(history_size)
+    window = deque(maxlen=history_size)
+    throttle, brake = 0.5, 0.0
+    for _ in range(history_size * 3):
+        if rng.random() < 0.05:
+            throttle, brake = (0.0, rng.uniform(0.4, 1.0)) if brake == 0.0 else (rng.uniform(0.3, 1.0), 0.0)
+        throttle = min(1.0, max(0.0, throttle + rng.gauss(0, 0.05)))
+        pedals = (throttle, max(brake, rng.uniform(0.1, 0.3) if rng.random() < 0.03 else 0.0))
+        engine.push(*pedals)
+        window.append(pedals)
+        if len(window) >= 10:
+            assert engine.control_index() == legacy_control_index(list(window))
+
+
+@pytest.mark.parametrize("debounce,cooldown", [(1, 10), (3, 0)])
+def test_event_detector_matches_original_and_filter(debounce, cooldown):
+    frames = telemetry_stream(10_000)
+    detector = ExtremeEventDetector(debounce, cooldown)
+    history = deque(maxlen=50)
+    raw, streaming = [], []
+    for frame in frames:
+        history.append(frame)
+        raw.append(legacy_detect(list(history)))
+        detector.push(*frame)
+        streaming.append(detector.detect())
+
+    expected = reference_filter(raw, debounce, cooldown)
+    assert sum(1 for event in expected if event["type"] != "normal") > 0
+    for want, got in zip(expected, streaming):
+        assert want.keys() == got.keys()
+        for key, value in want.items():
+            assert math.isclose(value, got[key], rel_tol=1e-9) if isinstance(value, float) else value == got[key]
+
+
+def test_group_summary_matches_statistics():
+    rng = random.Random(13)
+    group = GroupSummary()
+    members = {}
+    for _ in range(3000):
+        update = (f"sim_{rng.randrange(20) + 1}", rng.random() < 0.9, rng.uniform(0, 100), rng.uniform(0, 100))
+        group.update(*update)
+        members[update[0]] = update[1:]
+
+        calm = [c for connected, c, _ in members.values() if connected]
+        control = [c for connected, _, c in members.values() if connected]
+        calm_avg = statistics.mean(calm) if calm else 50
+        control_avg = statistics.mean(control) if control else 50
+        expected = {
+            "connected_drivers": len(calm),
+            "total_drivers": len(members),
+            "group_calm_avg": calm_avg,
+            "group_control_avg": control_avg,
+            "group_calm_harmony": 100 - statistics.stdev(calm) if len(calm) > 1 else 50,
+            "collective_strength": (calm_avg + control_avg) / 2
+        }
+        actual = group.summary()
+        for key, value in expected.items():
+            assert math.isclose(value, actual[key], rel_tol=1e-9, abs_tol=1e-9), key
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Pruebas del buffer circular de telemetría - Confianza al Volante
+"""
+
+import sys
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from telemetry_buffer import TelemetryRingBuffer
+
+
+def test_window_matches_deque():
+    buffer = TelemetryRingBuffer(5)
+    reference = deque(maxlen=5)
+    for step in range(12):
+        buffer.append({"SteeringAngle": float(step), "SpeedKmh": step * 10.0, "connected": True})
+        reference.append(float(step))
+        assert list(buffer.window("SteeringAngle")) == list(reference)
+        assert list(buffer.window("SteeringAngle", 3)) == list(reference)[-3:]
+        assert buffer.value("SteeringAngle") == reference[-1]
+        assert len(buffer) == len(reference)
+
+
+def test_value_by_age_and_missing_channels():
+    buffer = TelemetryRingBuffer(3)
+    buffer.append({"SpeedKmh": 50.0, "Gear": None, "connected": True})
+    buffer.append({"SpeedKmh": 60.0, "connected": False})
+    assert buffer.value("SpeedKmh", 1) == 50.0
+    assert buffer.value("Gear") == 0.0
+    assert not buffer.connected
+    with pytest.raises(IndexError):
+        buffer.value("SpeedKmh", 2)
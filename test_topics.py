@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las suscripciones por tema del WebSocket - Confianza al Volante
+Cada proyección conserva exactamente los valores del payload completo en
+los campos que lee su vista
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from topics import (ART_METRICS, ART_RAW, DASHBOARD_GAME, DASHBOARD_METRICS, DASHBOARD_RAW, STATIC_TOPICS,
+                    project, valid_topic)
+
+
+@pytest.mark.parametrize("topic", ["foo", "sim_x", "sim_", 3])
+def test_unknown_topics_rejected(topic):
+    assert not valid_topic(topic)
+
+
+def test_known_topics_accepted():
+    assert all(valid_topic(topic) for topic in STATIC_TOPICS + ("sim_3",))
+
+
+def test_projections_keep_view_fields(tick_payloads):
+    for payload in tick_payloads:
+        dashboard, art = project(payload, "dashboard"), project(payload, "art")
+        assert dashboard["summary"] == payload["summary"]
+        assert "summary" not in art
+        for sim_id, sim in payload["simulators"].items():
+            raw, metrics = sim["raw_data"], sim["metrics"]
+            projected = dashboard["simulators"][sim_id]
+            for key in DASHBOARD_RAW:
+                assert projected["raw_data"].get(key) == raw.get(key), (sim_id, key)
+            for key in DASHBOARD_GAME:
+                assert (projected["raw_data"].get("raw_game_data", {}).get(key)
+                        == raw.get("raw_game_data", {}).get(key)), (sim_id, key)
+            for key in DASHBOARD_METRICS:
+                assert projected["metrics"].get(key) == metrics.get(key), (sim_id, key)
+            projected = art["simulators"][sim_id]
+            assert "raw_game_data" not in projected["raw_data"]
+            for key in ART_RAW:
+                assert projected["raw_data"].get(key) == raw.get(key), (sim_id, key)
+            for key in ART_METRICS:
+                assert projected["metrics"].get(key) == metrics.get(key), (sim_id, key)
+            events = metrics.get("art_parameters", {}).get("extreme_events")
+            assert projected["metrics"].get("art_parameters", {}).get("extreme_events") == events
+            assert project(payload, sim_id)["simulators"][sim_id] is sim
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la ingesta UDP directa - Confianza al Volante
+Paquetes F1/AC y handshake con Assetto Corsa en loopback
+"""
+
+import asyncio
+import socket
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from udp_telemetry import (FakeAssettoCorsaServer, UdpTelemetrySource, decode_ac_car_info,
+                           decode_f1_car_telemetry, encode_ac_car_info, encode_f1_car_telemetry,
+                           parse_udp_sources)
+
+TELEMETRY = {"SpeedKmh": 187.0, "Rpms": 10500.0, "Gear": 6, "SteeringAngle": 12.5, "Throttle": 0.75, "Brake": 0.0}
+
+
+def free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_packets_round_trip():
+    for encode, decode in ((encode_f1_car_telemetry, decode_f1_car_telemetry),
+                           (encode_ac_car_info, decode_ac_car_info)):
+        decoded = decode(encode(TELEMETRY))
+        for key, value in TELEMETRY.items():
+            assert abs(decoded[key] - value) < 1e-3, (encode.__name__, key)
+
+
+def test_late_assetto_corsa_reconnects_and_receives_dismiss():
+    """AC arranca después que el backend: el handshake se repite; stop() envía el dismiss"""
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        port = free_udp_port()
+        source = UdpTelemetrySource(timeout=0.3)
+        await source.start(parse_udp_sources(f"sim_2=ac:127.0.0.1:{port}"))
+        await asyncio.sleep(0.4)
+        transport, server = await loop.create_datagram_endpoint(
+            FakeAssettoCorsaServer, local_addr=("127.0.0.1", port))
+        try:
+            for _ in range(20):
+                source.get_latest_data()
+                await asyncio.sleep(0.05)
+            connected = source.get_latest_data()["sim_2"]["connected"]
+            await source.stop()
+            await asyncio.sleep(0.05)
+            return connected, server._stream_task.cancelled()
+        finally:
+            server.close()
+
+    connected, dismissed = asyncio.run(scenario())
+    assert connected, "sim_2 no se reconectó a Assetto Corsa"
+    assert dismissed, "stop() no envió el dismiss a Assetto Corsa"
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pruebas del formato binario del WebSocket - Confianza al Volante
+El decodificador de Python y el de frontend/wire_format.js reconstruyen
+lo mismo que el JSON (a precisión float32)
+"""
+
+import json
+import math
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio backend al path
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from wire_format import RECORD_LAYOUT, _lookup, decode_frame, encode_frame
+
+WIRE_FORMAT_JS = Path(__file__).parent / "frontend" / "wire_format.js"
+
+NODE_SCRIPT = r"""
+const fs = require('fs');
+const WireFormat = require(process.argv[2]);
+const dir = process.argv[3];
+const file = fs.readFileSync(`${dir}/frame.bin`);
+const binary = file.buffer.slice(file.byteOffset, file.byteOffset + file.byteLength);
+// JSON.stringify quita las claves undefined (campos ausentes)
+console.log(JSON.stringify(WireFormat.decodeFrame(binary)));
+"""
+
+
+def assert_same(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        assert math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    elif isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for key in a:
+            assert_same(a[key], b[key])
+    else:
+        assert a == b
+
+
+def test_decode_matches_json(tick_payloads):
+    for payload in tick_payloads[::10]:
+        decoded = decode_frame(encode_frame(payload))
+        for sim_id, sim in payload["simulators"].items():
+            for name, path in RECORD_LAYOUT:
+                expected, actual = _lookup(sim, path), _lookup(decoded["simulators"][sim_id], path)
+                if isinstance(expected, (int, float)) and not isinstance(expected, bool):
+                    assert math.isclose(expected, actual, rel_tol=1e-6, abs_tol=1e-4), (sim_id, name)
+                else:
+                    assert expected == actual, (sim_id, name)
+            assert sim["pilot_name"] == decoded["simulators"][sim_id]["pilot_name"]
+        for key, value in payload["summary"].items():
+            assert math.isclose(value, decoded["summary"][key], rel_tol=1e-6, abs_tol=1e-4), key
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="requiere Node.js")
+def test_js_decoder_matches_python(tick_payloads, tmp_path):
+    frame = encode_frame(tick_payloads[-1])
+    (tmp_path / "frame.bin").write_bytes(frame)
+    (tmp_path / "decode.js").write_text(NODE_SCRIPT, encoding="utf-8")
+    result = subprocess.run(["node", str(tmp_path / "decode.js"), str(WIRE_FORMAT_JS), str(tmp_path)],
+                            capture_output=True, text=True, check=True)
+    assert_same(json.loads(result.stdout), json.loads(json.dumps(decode_frame(frame))))